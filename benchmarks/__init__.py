@@ -0,0 +1 @@
+"""Performance benchmarks of qham; run them with ``python -m benchmarks.run``."""
@@ -0,0 +1,114 @@
+import gc
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+
+
+class Case:
+    """
+    One point of a benchmark's scaling ladder.
+
+    Attributes:
+        benchmark (str): The name of the benchmark, e.g. ``'hubbard.create_hamiltonian'``.
+        params (dict): The point of the ladder, e.g. ``{'num_sites': 4}``.
+        setup (callable): Builds the arguments of ``run`` outside the measurement; returns a tuple.
+        run (callable): The measured call.
+        work (int): The number of work units per call, e.g. Hilbert-space states or spin updates.
+        unit (str): The name of the work unit, for the throughput.
+    """
+    def __init__(self, benchmark, params, setup, run, work, unit):
+        self.benchmark = benchmark
+        self.params = params
+        self.setup = setup
+        self.run = run
+        self.work = work
+        self.unit = unit
+
+    @property
+    def key(self):
+        """A stable identifier of the case, used to match results against a baseline."""
+        return self.benchmark + '[' + ','.join(f"{name}={value}" for name, value in sorted(self.params.items())) + ']'
+
+
+def measure(case, repeat=5, warmup=1, seed=0):
+    """
+    Measures one case.
+
+    Every call gets fresh arguments from ``case.setup`` and the NumPy and torch generators are reseeded before
+    each one, so every call does the same work. The wall time is the median of ``repeat`` calls. The peak memory is
+    the largest ``tracemalloc`` peak of a separate traced call, which counts Python and NumPy allocations but not
+    torch's own allocator.
+
+    Args:
+        case (Case): The case.
+        repeat (int): The number of timed calls. Defaults to 5.
+        warmup (int): The number of untimed calls before them, e.g. to fill caches. Defaults to 1.
+        seed (int): The seed of the generators. Defaults to 0.
+
+    Returns:
+        dict: The ``'key'``, ``'benchmark'``, ``'params'``, the ``'time'`` statistics in seconds (``'median'``,
+        ``'min'``, ``'max'``), the ``'peak_memory'`` in bytes and the ``'throughput'`` in ``'unit'`` per second.
+    """
+    import torch
+
+    def call(traced=False):
+        np.random.seed(seed)
+        torch.manual_seed(seed)
+        arguments = case.setup()
+        gc.collect()
+        if traced:
+            tracemalloc.start()
+            case.run(*arguments)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return peak
+        start = time.perf_counter()
+        case.run(*arguments)
+        return time.perf_counter() - start
+
+    for _ in range(warmup):
+        call()
+    times = [call() for _ in range(repeat)]
+    median = statistics.median(times)
+    return {
+        'key': case.key,
+        'benchmark': case.benchmark,
+        'params': case.params,
+        'time': {'median': median, 'min': min(times), 'max': max(times)},
+        'peak_memory': call(traced=True),
+        'throughput': case.work / median if median > 0 else float('inf'),
+        'unit': case.unit,
+    }
+
+
+def compare(results, baseline, time_threshold=0.25, memory_threshold=0.10):
+    """
+    Compares results with a baseline.
+
+    Args:
+        results (list): The measurements of ``measure``.
+        baseline (list): Earlier measurements; cases missing from either side are skipped.
+        time_threshold (float): The tolerated relative increase of the median time. Defaults to 0.25.
+        memory_threshold (float): The tolerated relative increase of the peak memory. Defaults to 0.10.
+
+    Returns:
+        list: One dictionary per matched case with its ``'key'``, the ``'time_ratio'`` and ``'memory_ratio'`` to the
+        baseline and whether it is a ``'regression'``.
+    """
+    reference = {result['key']: result for result in baseline}
+    comparisons = []
+    for result in results:
+        if result['key'] not in reference:
+            continue
+        old = reference[result['key']]
+        time_ratio = result['time']['median'] / max(old['time']['median'], 1e-12)
+        memory_ratio = result['peak_memory'] / max(old['peak_memory'], 1)
+        comparisons.append({
+            'key': result['key'],
+            'time_ratio': time_ratio,
+            'memory_ratio': memory_ratio,
+            'regression': time_ratio > 1 + time_threshold or memory_ratio > 1 + memory_threshold,
+        })
+    return comparisons
@@ -0,0 +1,88 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from benchmarks.core import compare, measure
+from benchmarks.suites import SUITES, collect
+
+
+def environment():
+    """Describes the interpreter, the libraries and the commit the results were taken with."""
+    import numpy
+    import qiskit
+    import scipy
+    import torch
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'numpy': numpy.__version__,
+        'scipy': scipy.__version__,
+        'torch': torch.__version__,
+        'torch_threads': torch.get_num_threads(),
+        'qiskit': qiskit.__version__,
+    }
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks, writes the results as JSON and compares them with a baseline.
+
+    Args:
+        argv (list, optional): The command line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns:
+        int: The exit status, 1 if a case regressed against the baseline and 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run',
+                                     description="Times the qham benchmark suites and gates them against a baseline.")
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help="a suite to run, may be repeated (default: all)")
+    parser.add_argument('-k', '--filter', help="run only the cases whose key contains this substring")
+    parser.add_argument('--quick', action='store_true', help="use the short prefix of every scaling ladder")
+    parser.add_argument('--repeat', type=int, default=5, help="timed calls per case (default: 5)")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="compare against the results in this JSON file")
+    parser.add_argument('--time-threshold', type=float, default=0.25,
+                        help="tolerated relative increase of the median time (default: 0.25)")
+    parser.add_argument('--memory-threshold', type=float, default=0.10,
+                        help="tolerated relative increase of the peak memory (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for case in collect(args.suite, quick=args.quick, pattern=args.filter):
+        result = measure(case, repeat=args.repeat)
+        results.append(result)
+        print(f"{result['key']:<70} {result['time']['median'] * 1e3:10.3f} ms {result['peak_memory'] / 2**20:9.2f} MiB "
+              f"{result['throughput']:12.4g} {result['unit']}/s", flush=True)
+
+    report = {'environment': environment(), 'results': results}
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as file:
+        baseline = json.load(file)['results']
+    comparisons = compare(results, baseline, args.time_threshold, args.memory_threshold)
+    regressions = [comparison for comparison in comparisons if comparison['regression']]
+    for comparison in regressions:
+        print(f"REGRESSION {comparison['key']}: time x{comparison['time_ratio']:.2f}, "
+              f"memory x{comparison['memory_ratio']:.2f}")
+    print(f"{len(comparisons)} cases compared with {args.baseline}, {len(regressions)} regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+from benchmarks.core import Case
+
+# Every ladder has a quick prefix for smoke runs and a full length for gating upgrades
+LADDERS = {
+    'hubbard_sites': ([2, 3, 4], [2, 3, 4, 5, 6]),
+    'sparse_hubbard_sites': ([4, 6], [4, 5, 6, 7, 8]),
+    'heisenberg_spins': ([4, 6, 8], [4, 6, 8, 10, 12]),
+    'lanczos_spins': ([8, 10], [8, 10, 12, 14, 16]),
+    'oscillator_states': ([10**3, 10**4], [10**3, 10**4, 10**5]),
+    'lattice_size': ([16, 32], [16, 32, 64, 128, 256]),
+    'random_lattice_size': ([4], [4, 8, 16]),
+    'qubits': ([4, 16], [4, 16, 64, 256]),
+    'trotter_steps': ([1, 4], [1, 4, 16]),
+    'lattice_side': ([3, 4], [3, 4, 6, 8, 12]),
+}
+
+
+def ladder(name, quick):
+    return LADDERS[name][0 if quick else 1]
+
+
+def exact_diagonalization(quick):
+    from qham.FHM.fhm import HubbardModel
+    from qham.HBM.hmb import HeisenbergModel
+    from qham.QHO.qho import QuantumHarmonicOscillator
+
+    for num_sites in ladder('hubbard_sites', quick):
+        yield Case('hubbard.create_hamiltonian', {'num_sites': num_sites},
+                   lambda num_sites=num_sites: (HubbardModel(num_sites, 1.0, 2.0),),
+                   lambda model: model.create_hamiltonian(), 4**num_sites, 'states')
+    for num_sites in ladder('sparse_hubbard_sites', quick):
+        yield Case('hubbard.create_sparse_hamiltonian', {'num_sites': num_sites},
+                   lambda num_sites=num_sites: (HubbardModel(num_sites, 1.0, 2.0),),
+                   lambda model: model.create_sparse_hamiltonian(), 4**num_sites, 'states')
+    for N in ladder('heisenberg_spins', quick):
+        yield Case('heisenberg.build_hamiltonian', {'N': N}, lambda N=N: (HeisenbergModel(N, 1.0),),
+                   lambda model: model.build_hamiltonian(), 2**N, 'states')
+    for N in ladder('lanczos_spins', quick):
+        yield Case('heisenberg.lowest_eigenpairs', {'N': N}, lambda N=N: (HeisenbergModel(N, 1.0),),
+                   lambda model: model.lowest_eigenpairs(k=1), 2**N, 'states')
+    for n in ladder('oscillator_states', quick):
+        yield Case('oscillator.find_eigenstates', {'n': n},
+                   lambda n=n: (QuantumHarmonicOscillator(n, 1.0, quartic=0.1),),
+                   lambda qho: qho.find_eigenstates(k=5), n, 'states')
+
+
+def monte_carlo(quick):
+    from qham.TFIM.tfim import TFIMSimulation
+
+    for size in ladder('lattice_size', quick):
+        for update in ('checkerboard', 'wolff'):
+            yield Case(f'tfim.tfim_step.{update}', {'size': size},
+                       lambda size=size, update=update: (TFIMSimulation(size, 0.44, 0.05, update=update),),
+                       lambda sim: sim.tfim_step(), size * size, 'spin updates')
+    for size in ladder('random_lattice_size', quick):
+        yield Case('tfim.tfim_step.random', {'size': size},
+                   lambda size=size: (TFIMSimulation(size, 0.44, 0.05),),
+                   lambda sim: sim.tfim_step(), size * size, 'spin updates')
+
+
+def circuits(quick):
+    from qham.HBM.hmbq import create_heisenberg_circuit
+    from qham.HBM.hmbslq import SquareLattice, create_heisenberg_lattice_circuit
+    from qham.HBM.schedule import create_layered_heisenberg_circuit
+    from qham.TFIM.tfimq import bind_tfim_circuit, create_tfim_circuit
+
+    for n_qubits in ladder('qubits', quick):
+        for steps in ladder('trotter_steps', quick):
+            params = {'n_qubits': n_qubits, 'trotter_steps': steps}
+            yield Case('tfim.create_tfim_circuit', params, lambda: (),
+                       lambda n_qubits=n_qubits, steps=steps: create_tfim_circuit(n_qubits, 0.1, 0.2,
+                                                                                  trotter_steps=steps),
+                       4 * n_qubits * steps, 'gates')
+            # The warmup call builds the cached template, so only the binding is timed
+            yield Case('tfim.bind_tfim_circuit', params, lambda: (),
+                       lambda n_qubits=n_qubits, steps=steps: bind_tfim_circuit(n_qubits, 0.1, 0.2,
+                                                                                trotter_steps=steps),
+                       2 * n_qubits * steps, 'gates')
+            yield Case('heisenberg.create_heisenberg_circuit', params, lambda: (),
+                       lambda n_qubits=n_qubits, steps=steps: create_heisenberg_circuit(n_qubits, steps),
+                       3 * n_qubits * steps, 'gates')
+
+    def square_lattice_circuit(side, builder):
+        from qiskit.circuit import Parameter
+
+        return lambda: (SquareLattice(side, side), Parameter('t')), builder
+
+    for side in ladder('lattice_side', quick):
+        yield Case('heisenberg.create_heisenberg_lattice_circuit', {'side': side},
+                   *square_lattice_circuit(side, create_heisenberg_lattice_circuit), 12 * side * (side - 1), 'gates')
+        yield Case('heisenberg.create_layered_heisenberg_circuit', {'side': side},
+                   *square_lattice_circuit(side, create_layered_heisenberg_circuit), 6 * side * (side - 1), 'gates')
+
+
+SUITES = {
+    'ed': exact_diagonalization,
+    'mc': monte_carlo,
+    'circuits': circuits,
+}
+
+
+def collect(suites=None, quick=False, pattern=None):
+    """
+    Lists the cases of the benchmark suites.
+
+    Args:
+        suites (list, optional): The names of the suites in ``SUITES``. Defaults to all of them.
+        quick (bool): If True, uses only the short prefix of every scaling ladder. Defaults to False.
+        pattern (str, optional): Keeps only the cases whose key contains this substring.
+
+    Returns:
+        list: The cases.
+    """
+    cases = [case for name in (suites or SUITES) for case in SUITES[name](quick)]
+    return [case for case in cases if pattern is None or pattern in case.key]
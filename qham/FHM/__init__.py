@@ -1,3 +1,7 @@
-__all__ = ['HubbardModel']
+from qham._lazy import lazy_exports
 
-from qham.FHM.fhm import HubbardModel
\ No newline at end of file
+_EXPORTS = {'HubbardModel': 'qham.FHM.fhm'}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
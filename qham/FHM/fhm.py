@@ -1,6 +1,12 @@
 import numpy as np
 from scipy.linalg import eigh
-import matplotlib.pyplot as plt
+import scipy.sparse as sp
+from scipy.sparse.linalg import aslinearoperator
+from qham.basis import binomial_table, combination_states, rank_states
+from qham.instrumentation import eigen_metrics, instrumented, matrix_metrics
+from qham.memory import check_memory, select_representation, sparse_bytes
+from qham.solvers import lowest_eigenpairs, sweep_eigenpairs
+from qham.templates import OperatorTemplate
 
 class HubbardModel:
     """
@@ -10,64 +16,273 @@ class HubbardModel:
         num_sites (int): The number of lattice sites in the model.
         t (float): The hopping parameter representing the probability amplitude for a particle to move to an adjacent site.
         U (float): The on-site interaction energy representing the energy penalty for double occupancy.
-        H (numpy.ndarray): The Hamiltonian matrix of the system.
+        sparse (bool): Whether the Hamiltonian is stored as a ``scipy.sparse`` CSR matrix instead of a dense array.
+        H (numpy.ndarray or scipy.sparse.csr_matrix): The Hamiltonian matrix of the system, built on first access.
     """    
+    REPRESENTATIONS = ('dense', 'sparse')
 
-    def __init__(self, num_sites, t, U):
+    def __init__(self, num_sites, t, U, sparse=False, n_up=None, n_down=None):
         """
         Initializes the HubbardModel with the given number of sites, hopping parameter, and on-site interaction energy.
 
+        Passing ``n_up`` and ``n_down`` restricts the model to the symmetry sector with that many spin-up and
+        spin-down particles. Both hopping and interaction conserve these numbers, so the block is exact.
+
         Args:
             num_sites (int): The number of lattice sites.
             t (float): The hopping parameter for the model.
             U (float): The on-site interaction energy.
+            sparse (bool): If True, stores the Hamiltonian as a sparse CSR matrix. Defaults to False.
+            n_up (int, optional): The number of spin-up particles of the sector. Defaults to None (full Fock space).
+            n_down (int, optional): The number of spin-down particles of the sector. Defaults to None (full Fock space).
         """        
+        if (n_up is None) != (n_down is None):
+            raise ValueError("n_up and n_down must be given together")
+        for n in (n_up, n_down):
+            if n is not None and not 0 <= n <= num_sites:
+                raise ValueError(f"particle numbers must lie between 0 and num_sites={num_sites}, got {n}")
         self.num_sites = num_sites
         self.t = t
         self.U = U
-        self.H = self.create_hamiltonian()
+        self.sparse = sparse
+        self.n_up = n_up
+        self.n_down = n_down
+        self._binomials = binomial_table(num_sites)
+        if n_up is None:
+            self.dimension = 4**num_sites
+        else:
+            self.dimension = int(self._binomials[num_sites, n_up] * self._binomials[num_sites, n_down])
+        self._H = None
+        self._templates = None
+
+    @property
+    def H(self):
+        """The Hamiltonian matrix, dense or sparse depending on ``sparse``, built on first access."""
+        if self._H is None:
+            self._H = self.create_sparse_hamiltonian() if self.sparse else self.create_hamiltonian()
+        return self._H
+
+    @H.setter
+    def H(self, value):
+        self._H = value
+
+    def nnz(self):
+        """
+        Bounds the stored entries of the sparse Hamiltonian without building it.
+
+        Every hop between neighboring modes of one spin connects the states in which exactly one of the two modes is
+        occupied, which is counted exactly; the diagonal is counted as full, although states without double
+        occupancy store no diagonal entry.
+
+        Returns:
+            int: An upper bound of the number of stored entries.
+        """
+        N = self.num_sites
+        if N < 2:
+            return self.dimension
+        if self.n_up is None:
+            return self.dimension * N
+        binomials = self._binomials
+
+        def hopping(n, n_other):
+            return 0 if not 0 < n < N else 2 * int(binomials[N - 2, n - 1] * binomials[N, n_other])
+
+        return self.dimension + (N - 1) * (hopping(self.n_up, self.n_down) + hopping(self.n_down, self.n_up))
+
+    def estimate_memory(self, representation='dense'):
+        """
+        Estimates the memory of the Hamiltonian without building it.
+
+        Args:
+            representation (str): ``'dense'`` for the float64 matrix of ``create_hamiltonian`` together with the
+                cached ``operator_templates`` and the CSR matrix it is converted from, or ``'sparse'`` for the CSR
+                matrix of ``create_sparse_hamiltonian``. Defaults to ``'dense'``.
+
+        Returns:
+            int: The number of bytes.
+        """
+        if representation == 'dense':
+            # The templates store the shared pattern once with one data vector per term, hopping and interaction
+            templates = sparse_bytes(self.dimension, self.nnz(), itemsize=16)
+            return self.dimension**2 * 8 + templates + self.estimate_memory('sparse')
+        if representation == 'sparse':
+            return sparse_bytes(self.dimension, self.nnz())
+        raise ValueError(f"unknown representation {representation!r}, expected one of {self.REPRESENTATIONS}")
+
+    def operator(self, representation='auto'):
+        """
+        Builds the Hamiltonian in the leanest form needed to fit into the memory budget.
+
+        Args:
+            representation (str): ``'dense'``, ``'sparse'`` or ``'auto'`` for dense if it fits into the budget and
+                sparse otherwise. Defaults to ``'auto'``.
+
+        Returns:
+            numpy.ndarray or scipy.sparse.csr_matrix: The Hamiltonian.
+
+        Raises:
+            MemoryBudgetError: If no allowed representation fits into the budget.
+        """
+        if select_representation(self, representation) == 'dense':
+            return self.create_hamiltonian() if self.sparse else self.H
+        return self.H if self.sparse else self.create_sparse_hamiltonian()
+
+    def sectors(self):
+        """
+        Lists the particle-number sectors of the model.
+
+        Returns:
+            list: ``(n_up, n_down, dimension)`` tuples for every sector of the full Fock space.
+        """
+        counts = self._binomials[self.num_sites]
+        return [(n_up, n_down, int(counts[n_up] * counts[n_down]))
+                for n_up in range(self.num_sites + 1) for n_down in range(self.num_sites + 1)]
+
+    def basis_states(self):
+        """
+        Enumerates the Fock states spanned by the model.
+
+        Returns:
+            numpy.ndarray: The Fock-space index of each basis state, ordered like the rows of ``H``.
+        """
+        if self.n_up is None:
+            return np.arange(self.dimension, dtype=np.int64)
+        up = combination_states(self.num_sites, self.n_up)
+        down = combination_states(self.num_sites, self.n_down)
+        return self._interleave(np.repeat(up, down.size), np.tile(down, up.size))
+
+    def state_index(self, states):
+        """
+        Maps Fock-space indices to rows of ``H`` using the combinatorial rank of the spin-up and spin-down occupations.
+
+        Args:
+            states (numpy.ndarray): Fock-space indices of states inside the model's sector.
+
+        Returns:
+            numpy.ndarray: The corresponding row indices.
+        """
+        if self.n_up is None:
+            return states
+        up, down = self._split(states)
+        down_count = self._binomials[self.num_sites, self.n_down]
+        return (rank_states(up, self.num_sites, self._binomials) * down_count
+                + rank_states(down, self.num_sites, self._binomials))
+
+    def _interleave(self, up, down):
+        # Site i of the per-spin masks lives in bit i; in the Fock index it occupies bits 2N-1-2i (up) and 2N-2-2i (down)
+        states = np.zeros(up.shape, dtype=np.int64)
+        for i in range(self.num_sites):
+            up_bit = 2*self.num_sites - 1 - 2*i
+            states |= ((up >> i) & 1) << up_bit
+            states |= ((down >> i) & 1) << (up_bit - 1)
+        return states
+
+    def _split(self, states):
+        up = np.zeros(states.shape, dtype=np.int64)
+        down = np.zeros(states.shape, dtype=np.int64)
+        for i in range(self.num_sites):
+            up_bit = 2*self.num_sites - 1 - 2*i
+            up |= ((states >> up_bit) & 1) << i
+            down |= ((states >> (up_bit - 1)) & 1) << i
+        return up, down
     
+    @instrumented(matrix_metrics)
     def create_hamiltonian(self):
         """
         Constructs the Hamiltonian matrix for the Hubbard model.
 
+        The dense matrix is only practical for small systems; see ``create_sparse_hamiltonian`` for larger ones.
+
         Returns:
             numpy.ndarray: The Hamiltonian matrix representing the Hubbard model.
         """        
-        dim = 4**self.num_sites   # Dimension of the Hilbert space
-        H = np.zeros((dim, dim))  # Initialize Hamiltonian matrix
-        
-        # Convert basis index to occupation numbers        
-        def idx_to_occ(idx):
-            return tuple((idx >> bit) & 1 for bit in reversed(range(self.num_sites * 2)))
-        
-        # Convert occupation numbers to basis index        
-        def occ_to_idx(occ):
-            idx = 0
-            for n in occ:
-                idx = (idx << 1) | n
-            return idx
-        
+        check_memory(self.estimate_memory('dense'), "the dense Hubbard Hamiltonian")
+        return self.create_sparse_hamiltonian().toarray()
+
+    @instrumented(matrix_metrics)
+    def create_sparse_hamiltonian(self):
+        """
+        Constructs the Hamiltonian of the Hubbard model as a sparse CSR matrix.
+
+        The matrix is assembled as ``-t * hopping + U * interaction`` from the cached ``operator_templates``.
+
+        Returns:
+            scipy.sparse.csr_matrix: The Hamiltonian matrix representing the Hubbard model.
+        """        
+        return self.operator_templates().assemble(hopping=-self.t, interaction=self.U)
+
+    def operator_templates(self):
+        """
+        Builds the structural operators of the Hamiltonian once and caches them on the model.
+
+        Fock states are the integers ``0 .. 4**num_sites - 1``, where the occupation of site ``i`` with
+        spin ``s`` (0 for up, 1 for down) is stored in bit ``2*num_sites - 1 - (2*i + s)``. The hopping and
+        interaction terms are generated for all basis states at once with bitmask arithmetic on index arrays.
+        In a particle-number sector only the states returned by ``basis_states`` are kept.
+
+        Returns:
+            OperatorTemplate: The ``hopping`` and ``interaction`` (double occupancy) operators, so that
+            ``H = -t * hopping + U * interaction``.
+        """
+        if self._templates is not None:
+            return self._templates
+        check_memory(self.estimate_memory('sparse'), "the sparse Hubbard Hamiltonian")
+        num_modes = 2 * self.num_sites
+        dim = self.dimension   # Dimension of the Hilbert space
+        states = self.basis_states()
+        rows_of_states = np.arange(dim, dtype=np.int64)
+        rows, cols = [], []
+
         # Construct the kinetic (hopping) term        
         for i in range(self.num_sites - 1):
-            for idx in range(dim):
-                occ = idx_to_occ(idx)
-                for spin in [0, 1]:  # 0 for up, 1 for down
-                    if occ[2*i+spin] > occ[2*(i+1)+spin]:
-                        new_occ = list(occ)
-                        new_occ[2*i+spin], new_occ[2*(i+1)+spin] = new_occ[2*(i+1)+spin], new_occ[2*i+spin]
-                        new_idx = occ_to_idx(new_occ)
-                        H[idx, new_idx] -= self.t
-                        H[new_idx, idx] -= self.t
+            for spin in [0, 1]:  # 0 for up, 1 for down
+                src_bit = num_modes - 1 - (2*i + spin)
+                dst_bit = num_modes - 1 - (2*(i+1) + spin)
+                # Hop from occupied mode (i, spin) to empty mode (i+1, spin)
+                mask = ((states >> src_bit) & 1 == 1) & ((states >> dst_bit) & 1 == 0)
+                src = rows_of_states[mask]
+                dst = self.state_index(states[mask] ^ ((1 << src_bit) | (1 << dst_bit)))
+                rows.extend([src, dst])
+                cols.extend([dst, src])
+        rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        cols = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        hopping = sp.coo_matrix((np.ones(rows.size), (rows, cols)), shape=(dim, dim))
 
         # Construct the interaction term        
-        for idx in range(dim):
-            occ = idx_to_occ(idx)
-            for i in range(self.num_sites):
-                H[idx, idx] += self.U * occ[2*i] * occ[2*i+1]
-        
-        return H
+        double_occupancy = np.zeros(dim, dtype=np.int64)
+        for i in range(self.num_sites):
+            up_bit = num_modes - 1 - 2*i
+            down_bit = up_bit - 1
+            double_occupancy += (states >> up_bit) & (states >> down_bit) & 1
+        interaction = sp.diags(double_occupancy.astype(np.float64))
+
+        self._templates = OperatorTemplate({'hopping': hopping, 'interaction': interaction})
+        return self._templates
+
+    def sweep(self, t, U, k=1, dense=None, tol=0):
+        """
+        Computes the lowest energy levels on a grid of hopping and interaction parameters.
+
+        The structural operators are built once; every grid point only rescales and sums them before the
+        diagonalizations are run as a batch.
+
+        Args:
+            t (array_like): The hopping parameters of the grid.
+            U (array_like): The on-site interaction energies of the grid.
+            k (int): The number of energy levels per point. Defaults to 1.
+            dense (bool, optional): Forces batched dense (True) or iterative (False) diagonalization. Defaults to dense
+                for dimensions up to 2048.
+            tol (float): The relative accuracy of the iterative solver. Defaults to 0.
+
+        Returns:
+            numpy.ndarray: An array of shape ``(len(t), len(U), k)`` with the energy levels of every grid point.
+        """
+        t, U = np.atleast_1d(t), np.atleast_1d(U)
+        coefficients = [{'hopping': -t_value, 'interaction': U_value} for t_value in t for U_value in U]
+        energies = sweep_eigenpairs(self.operator_templates(), coefficients, k=k, dense=dense, tol=tol)
+        return energies.reshape(t.size, U.size, k)
     
+    @instrumented(eigen_metrics)
     def diagonalize(self):
         """
         Diagonalizes the Hamiltonian to find the energy levels of the system.
@@ -75,7 +290,33 @@ class HubbardModel:
         Returns:
             tuple: A tuple containing an array of energy levels and a matrix of eigenvectors.
         """        
-        return eigh(self.H)
+        H = self.H.toarray() if sp.issparse(self.H) else self.H
+        return eigh(H)
+
+    def as_linear_operator(self):
+        """
+        Wraps the Hamiltonian as a ``LinearOperator`` backed by the sparse matrix, without forming the dense one.
+
+        Returns:
+            scipy.sparse.linalg.LinearOperator: The Hamiltonian as a linear operator.
+        """
+        H = self._H if self._H is not None and sp.issparse(self._H) else self.create_sparse_hamiltonian()
+        return aslinearoperator(H)
+
+    def lowest_eigenpairs(self, k=1, tol=0, maxiter=None, v0=None):
+        """
+        Computes the lowest eigenpairs with an iterative Lanczos solver instead of a full diagonalization.
+
+        Args:
+            k (int): The number of eigenpairs to compute. Defaults to 1.
+            tol (float): The relative accuracy of the eigenvalues; 0 means machine precision. Defaults to 0.
+            maxiter (int, optional): The maximum number of solver iterations.
+            v0 (numpy.ndarray, optional): The starting vector of the iteration.
+
+        Returns:
+            tuple: An array of the ``k`` lowest energy levels and a matrix of the corresponding eigenvectors.
+        """
+        return lowest_eigenpairs(self.as_linear_operator(), k=k, tol=tol, maxiter=maxiter, v0=v0)
     
     def plot_energy_levels(self, energies):
         """
@@ -84,6 +325,8 @@ class HubbardModel:
         Args:
             energies (numpy.ndarray): An array containing the energy levels to be plotted.
         """        
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(8, 6))
         for i, energy in enumerate(energies):
             plt.hlines(energy, 0, 1, colors='blue', linestyles='solid')
@@ -1,9 +1,12 @@
-__all__ = ['HeisenbergModel',
-            'create_heisenberg_circuit', 
-            'SquareLattice', 
-            'SquareLatticeMatrix',]
+from qham._lazy import lazy_exports
 
-from qham.HBM.hmb import HeisenbergModel
-from qham.HBM.hmbq import create_heisenberg_circuit
-from qham.HBM.hmbslq import SquareLattice
-from qham.HBM.hmbsmlq import SquareLatticeMatrix
\ No newline at end of file
+_EXPORTS = {
+    'HeisenbergModel': 'qham.HBM.hmb',
+    'create_heisenberg_circuit': 'qham.HBM.hmbq',
+    'SquareLattice': 'qham.HBM.hmbslq',
+    'SquareLatticeMatrix': 'qham.HBM.hmbsmlq',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -1,5 +1,11 @@
+import numpy as np
 import torch
-import matplotlib.pyplot as plt
+from qham.HBM.matvec import HeisenbergMatvec
+from qham.HBM.symmetry import MomentumSzBlocks
+from qham.instrumentation import eigen_metrics, instrumented, matrix_metrics
+from qham.memory import check_memory, select_representation, sparse_bytes
+from qham.solvers import linear_operator, lowest_eigenpairs, sweep_eigenpairs
+from qham.templates import OperatorTemplate
 
 class HeisenbergModel:
     """
@@ -12,8 +18,10 @@ class HeisenbergModel:
         Sy (torch.Tensor): The Pauli Y matrix for spin interactions.
         Sz (torch.Tensor): The Pauli Z matrix for spin interactions.
         I (torch.Tensor): The identity matrix representing no spin interaction.
-        H (torch.Tensor): The Hamiltonian matrix of the system.
+        H (torch.Tensor): The Hamiltonian matrix of the system, built on first access.
     """    
+    REPRESENTATIONS = ('dense', 'sparse', 'matrix-free')
+
     def __init__(self, N, J):
         """
         Initializes the HeisenbergModel with a given number of spins and interaction strength.
@@ -28,30 +36,132 @@ class HeisenbergModel:
         self.Sy = torch.tensor([[0, -1j], [1j, 0]], dtype=torch.complex64)
         self.Sz = torch.tensor([[1, 0], [0, -1]], dtype=torch.complex64)
         self.I = torch.eye(2, dtype=torch.complex64)
-        self.H = self.build_hamiltonian()
+        self._H = None
+        self._engine = None
+        self._templates = None
+
+    @property
+    def H(self):
+        """The dense Hamiltonian matrix, built on first access."""
+        if self._H is None:
+            self._H = self.build_hamiltonian()
+        return self._H
+
+    @H.setter
+    def H(self, value):
+        self._H = value
+
+    def estimate_memory(self, representation='dense'):
+        """
+        Estimates the memory of the Hamiltonian without building it.
+
+        Args:
+            representation (str): ``'dense'`` for the complex64 matrix ``H`` together with the CSR matrix it is
+                converted from, ``'sparse'`` for the CSR matrix of
+                ``build_sparse_hamiltonian`` (every bond flips half of the states) or ``'matrix-free'`` for the tables
+                of ``matvec_engine`` and the vectors of one product. Defaults to ``'dense'``.
+
+        Returns:
+            int: The number of bytes.
+        """
+        dim = 2**self.N
+        if representation == 'dense':
+            return dim**2 * 8 + self.estimate_memory('sparse')
+        if representation == 'sparse':
+            return sparse_bytes(dim, dim + self.N * dim // 2)
+        if representation == 'matrix-free':
+            return 7 * dim * 8
+        raise ValueError(f"unknown representation {representation!r}, expected one of {self.REPRESENTATIONS}")
+
+    def operator(self, representation='auto'):
+        """
+        Builds the Hamiltonian in the leanest form needed to fit into the memory budget.
+
+        Args:
+            representation (str): ``'dense'``, ``'sparse'``, ``'matrix-free'`` or ``'auto'`` for the first of these
+                that fits into the budget. Defaults to ``'auto'``.
+
+        Returns:
+            torch.Tensor or scipy.sparse.csr_matrix or scipy.sparse.linalg.LinearOperator: The Hamiltonian.
+
+        Raises:
+            MemoryBudgetError: If no allowed representation fits into the budget.
+        """
+        representation = select_representation(self, representation)
+        if representation == 'dense':
+            return self.H
+        if representation == 'sparse':
+            return self.build_sparse_hamiltonian()
+        return self.as_linear_operator()
 
+    @instrumented(matrix_metrics)
     def build_hamiltonian(self):
         """
-        Constructs the Hamiltonian matrix for the Heisenberg model using the tensor product of Pauli matrices.
+        Constructs the Hamiltonian matrix for the Heisenberg model.
+
+        The matrix is assembled from the sparse output of ``matvec_engine`` rather than from Kronecker products of
+        the Pauli matrices. The sparse matrix is cast to complex64 before it is densified, so no float64 copy of the
+        dense matrix is made.
 
         Returns:
             torch.Tensor: The Hamiltonian matrix as a PyTorch tensor.
         """        
-        H = torch.zeros((2**self.N, 2**self.N), dtype=torch.complex64)
-        for i in range(self.N):
-            next_i = (i + 1) % self.N
-            for op1, op2 in [(self.Sx, self.Sx), (self.Sy, self.Sy), (self.Sz, self.Sz)]:
-                term = torch.eye(1, dtype=torch.complex64)
-                for j in range(self.N):
-                    if j == i:
-                        term = torch.kron(term, op1)
-                    elif j == next_i:
-                        term = torch.kron(term, op2)
-                    else:
-                        term = torch.kron(term, self.I)
-                H -= self.J * term
-        return H
+        check_memory(self.estimate_memory('dense'), "the dense Heisenberg Hamiltonian")
+        return torch.from_numpy(self.build_sparse_hamiltonian().astype(np.complex64).toarray())
+
+    @instrumented(matrix_metrics)
+    def build_sparse_hamiltonian(self):
+        """
+        Constructs the Hamiltonian as a real sparse matrix in the S^z basis.
+
+        Returns:
+            scipy.sparse.csr_matrix: The float64 Hamiltonian matrix.
+        """
+        check_memory(self.estimate_memory('sparse'), "the sparse Heisenberg Hamiltonian")
+        return self.matvec_engine().to_sparse()
+
+    def matvec_engine(self):
+        """
+        Returns the bitwise matrix-free engine that applies the Hamiltonian to states, created on first use.
+
+        Returns:
+            HeisenbergMatvec: The engine for the chain's ``N`` and ``J``.
+        """
+        if self._engine is None:
+            check_memory(self.estimate_memory('matrix-free'), "the matrix-free Heisenberg engine")
+            self._engine = HeisenbergMatvec(self.N, self.J)
+        return self._engine
+
+    def operator_templates(self):
+        """
+        Builds the structural operator of the Hamiltonian once and caches it on the model.
+
+        Returns:
+            OperatorTemplate: The ``exchange`` operator, the Hamiltonian for ``J = 1``, so that ``H = J * exchange``.
+        """
+        if self._templates is None:
+            check_memory(self.estimate_memory('sparse'), "the sparse Heisenberg Hamiltonian")
+            self._templates = OperatorTemplate({'exchange': HeisenbergMatvec(self.N, 1.0).to_sparse()})
+        return self._templates
 
+    def sweep(self, J, k=1, dense=None, tol=0):
+        """
+        Computes the lowest energy levels for a list of exchange interaction strengths.
+
+        Args:
+            J (array_like): The exchange interaction strengths.
+            k (int): The number of energy levels per point. Defaults to 1.
+            dense (bool, optional): Forces batched dense (True) or iterative (False) diagonalization. Defaults to dense
+                for dimensions up to 2048.
+            tol (float): The relative accuracy of the iterative solver. Defaults to 0.
+
+        Returns:
+            torch.Tensor: A tensor of shape ``(len(J), k)`` with the energy levels for every ``J``.
+        """
+        coefficients = [{'exchange': value} for value in np.atleast_1d(J)]
+        return torch.from_numpy(sweep_eigenpairs(self.operator_templates(), coefficients, k=k, dense=dense, tol=tol))
+
+    @instrumented(eigen_metrics)
     def solve_eigenvalues(self):
         """
         Diagonalizes the Hamiltonian to find the eigenvalues and eigenvectors.
@@ -62,6 +172,57 @@ class HeisenbergModel:
         eigenvalues, eigenvectors = torch.linalg.eigh(self.H)
         return eigenvalues, eigenvectors
 
+    def symmetry_blocks(self):
+        """
+        Returns the total-S^z and momentum block decomposition of the periodic chain.
+
+        Returns:
+            MomentumSzBlocks: The block decomposition for the chain's ``N`` and ``J``.
+        """
+        return MomentumSzBlocks(self.N, self.J)
+
+    def solve_symmetry_resolved(self, sz=None, k=None):
+        """
+        Diagonalizes the Hamiltonian block by block in total S^z and lattice momentum.
+
+        Each block is built from a table of translation representatives, so it is roughly ``N * sqrt(N)`` times
+        smaller than the full matrix.
+
+        Args:
+            sz (float, optional): Restricts the result to one total S^z. Defaults to all sectors.
+            k (int, optional): Restricts the result to one momentum ``2 * pi * k / N``. Defaults to all momenta.
+
+        Returns:
+            dict: Maps each ``(sz, k)`` label to a tensor of the block's eigenvalues.
+        """
+        spectra = self.symmetry_blocks().eigenvalues(sz=sz, k=k)
+        return {label: torch.from_numpy(values) for label, values in spectra.items()}
+
+    def as_linear_operator(self):
+        """
+        Wraps the Hamiltonian as a real, matrix-free ``LinearOperator`` backed by ``matvec_engine``.
+
+        Returns:
+            scipy.sparse.linalg.LinearOperator: The Hamiltonian as a linear operator.
+        """
+        return linear_operator(self.matvec_engine().apply, 2**self.N)
+
+    def lowest_eigenpairs(self, k=1, tol=0, maxiter=None, v0=None):
+        """
+        Computes the lowest eigenpairs with an iterative Lanczos solver, never forming the dense Hamiltonian.
+
+        Args:
+            k (int): The number of eigenpairs to compute. Defaults to 1.
+            tol (float): The relative accuracy of the eigenvalues; 0 means machine precision. Defaults to 0.
+            maxiter (int, optional): The maximum number of solver iterations.
+            v0 (numpy.ndarray, optional): The starting vector of the iteration.
+
+        Returns:
+            tuple: A tensor of the ``k`` lowest eigenvalues and a tensor of the corresponding eigenvectors.
+        """
+        eigenvalues, eigenvectors = lowest_eigenpairs(self.as_linear_operator(), k=k, tol=tol, maxiter=maxiter, v0=v0)
+        return torch.from_numpy(eigenvalues), torch.from_numpy(eigenvectors)
+
     def plot_energy_levels(self, eigenvalues):
         """
         Plots the energy levels of the Heisenberg model as a scatter plot.
@@ -69,6 +230,8 @@ class HeisenbergModel:
         Args:
             eigenvalues (torch.Tensor): A tensor containing the energy levels to plot.
         """        
+        import matplotlib.pyplot as plt
+
         plt.figure(figsize=(10, 6))
         plt.plot(eigenvalues.numpy(), 'o')
         plt.title('Energy levels of the 1D Heisenberg model')
@@ -1,5 +1,6 @@
-from qiskit.circuit import QuantumCircuit, Parameter
+from qham.instrumentation import circuit_metrics, instrumented
 
+@instrumented(circuit_metrics)
 def create_heisenberg_circuit(N, trotter_steps=1):
     """
     Create a quantum circuit simulating the Heisenberg model with optional periodic boundary conditions.
@@ -17,6 +18,8 @@ def create_heisenberg_circuit(N, trotter_steps=1):
     The constructed circuit will include RXX, RYY, and RZZ gates between adjacent qubits to simulate the Heisenberg interaction. 
     If periodic boundary conditions are required, additional gates are added between the first and last qubits to simulate a closed chain.
     """
+    from qiskit.circuit import QuantumCircuit, Parameter
+
     # Initialize the quantum circuit for N qubits    
     qc = QuantumCircuit(N)
     # Define the time evolution parameter 't'
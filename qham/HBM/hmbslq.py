@@ -1,26 +1,39 @@
 import numpy as np
-from qiskit.circuit import QuantumCircuit, Parameter
+from qham.HBM.lattice import Lattice
+from qham.instrumentation import circuit_metrics, instrumented
 
 class SquareLattice:
     """
     Represents a square lattice in two dimensions and provides functionality to generate an adjacency list for the lattice.
 
+    The bonds are stored by a ``Lattice`` core; the adjacency list is a view built from its neighbor table on first use.
+
     Attributes:
         rows (int): The number of rows in the lattice.
         cols (int): The number of columns in the lattice.
+        lattice (Lattice): The bond-array core of the lattice.
         adjacency_list (dict): A dictionary where each key is a site index, and the value is a list of neighboring site indices.
     """    
-    def __init__(self, rows, cols):
+    def __init__(self, rows, cols, periodic=False):
         """
         Initializes the SquareLattice with the specified number of rows and columns.
 
         Args:
             rows (int): The number of rows in the lattice.
             cols (int): The number of columns in the lattice.
+            periodic (bool): If True, applies periodic boundary conditions. Defaults to False.
         """
         self.rows = rows
         self.cols = cols
-        self.adjacency_list = self._create_adjacency_list()
+        self.lattice = Lattice.square(rows, cols, periodic)
+        self._adjacency_list = None
+
+    @property
+    def adjacency_list(self):
+        """The neighbors of every site, ordered up, down, left, right."""
+        if self._adjacency_list is None:
+            self._adjacency_list = self._create_adjacency_list()
+        return self._adjacency_list
 
     def _create_adjacency_list(self):
         """
@@ -29,20 +42,9 @@ class SquareLattice:
         Returns:
             dict: The adjacency list represented as a dictionary.
         """        
-        adjacency_list = {}
-        for row in range(self.rows):
-            for col in range(self.cols):
-                neighbors = []
-                if row > 0:
-                    neighbors.append(((row - 1) * self.cols) + col)  # Up
-                if row < self.rows - 1:
-                    neighbors.append(((row + 1) * self.cols) + col)  # Down
-                if col > 0:
-                    neighbors.append((row * self.cols) + (col - 1))  # Left
-                if col < self.cols - 1:
-                    neighbors.append((row * self.cols) + (col + 1))  # Right
-                adjacency_list[row * self.cols + col] = neighbors
-        return adjacency_list
+        offsets = self.lattice.neighbor_offsets
+        neighbors = self.lattice.neighbor_indices.tolist()
+        return {site: neighbors[offsets[site]:offsets[site + 1]] for site in range(self.lattice.num_sites)}
 
     def get_neighbors(self, site):
         """
@@ -54,8 +56,9 @@ class SquareLattice:
         Returns:
             list: A list of neighboring site indices.
         """        
-        return self.adjacency_list[site]
+        return self.lattice.neighbors(site).tolist()
 
+@instrumented(circuit_metrics)
 def create_heisenberg_lattice_circuit(lattice, t):
     """
     Constructs a quantum circuit representing the Heisenberg model on a square lattice.
@@ -68,13 +71,14 @@ def create_heisenberg_lattice_circuit(lattice, t):
         QuantumCircuit: The constructed quantum circuit with Heisenberg interactions between neighbors.
     """    
     N = lattice.rows * lattice.cols
+    from qiskit.circuit import QuantumCircuit
+
     qc = QuantumCircuit(N)
-    # Apply the Heisenberg interaction using the adjacency list    
-    for site, neighbors in lattice.adjacency_list.items():
-        for neighbor in neighbors:
-            qc.rxx(2 * t, site, neighbor)
-            qc.ryy(2 * t, site, neighbor)
-            qc.rzz(2 * t, site, neighbor)
+    # Apply the Heisenberg interaction along every neighbor pair, in adjacency-list order
+    for site, neighbor in zip(*(edges.tolist() for edges in lattice.lattice.directed_edges())):
+        qc.rxx(2 * t, site, neighbor)
+        qc.ryy(2 * t, site, neighbor)
+        qc.rzz(2 * t, site, neighbor)
     return qc
 
 # Example usage
@@ -1,30 +1,42 @@
 import numpy as np
-from qiskit.circuit import QuantumCircuit, Parameter
+from qham.HBM.lattice import Lattice
+from qham.instrumentation import circuit_metrics, instrumented
 
 class SquareLatticeMatrix:
     """
     Represents a square lattice using a matrix to define adjacency relationships between sites.
 
     The adjacency matrix is a binary matrix where each element (i, j) indicates whether
-    sites i and j are neighbors (1 if they are neighbors, 0 otherwise).
+    sites i and j are neighbors (1 if they are neighbors, 0 otherwise). The bonds are stored by a
+    ``Lattice`` core, so the dense matrix is only built when ``adjacency_matrix`` is accessed.
 
     Attributes:
         rows (int): Number of rows in the lattice.
         cols (int): Number of columns in the lattice.
+        lattice (Lattice): The bond-array core of the lattice.
         adjacency_matrix (np.ndarray): Matrix representing adjacency between sites.
     """    
 
-    def __init__(self, rows, cols):
+    def __init__(self, rows, cols, periodic=False):
         """
         Initializes the square lattice with the given number of rows and columns.
 
         Args:
             rows (int): The number of rows in the lattice.
             cols (int): The number of columns in the lattice.
+            periodic (bool): If True, applies periodic boundary conditions. Defaults to False.
         """        
         self.rows = rows
         self.cols = cols
-        self.adjacency_matrix = self._create_adjacency_matrix()
+        self.lattice = Lattice.square(rows, cols, periodic)
+        self._adjacency_matrix = None
+
+    @property
+    def adjacency_matrix(self):
+        """The dense ``N x N`` adjacency matrix."""
+        if self._adjacency_matrix is None:
+            self._adjacency_matrix = self._create_adjacency_matrix()
+        return self._adjacency_matrix
 
     def _create_adjacency_matrix(self):
         """
@@ -33,20 +45,7 @@ class SquareLatticeMatrix:
         Returns:
             np.ndarray: A binary matrix indicating adjacent sites.
         """        
-        size = self.rows * self.cols
-        adjacency_matrix = np.zeros((size, size), dtype=int)
-        for row in range(self.rows):
-            for col in range(self.cols):
-                index = row * self.cols + col
-                if row > 0:
-                    adjacency_matrix[index, ((row - 1) * self.cols) + col] = 1
-                if row < self.rows - 1:
-                    adjacency_matrix[index, ((row + 1) * self.cols) + col] = 1
-                if col > 0:
-                    adjacency_matrix[index, (row * self.cols) + (col - 1)] = 1
-                if col < self.cols - 1:
-                    adjacency_matrix[index, (row * self.cols) + (col + 1)] = 1
-        return adjacency_matrix
+        return self.lattice.adjacency_matrix(sparse=False)
 
     def are_neighbors(self, site1, site2):
         """
@@ -59,8 +58,9 @@ class SquareLatticeMatrix:
         Returns:
             bool: True if the sites are neighbors, False otherwise.
         """        
-        return self.adjacency_matrix[site1, site2] == 1
+        return self.lattice.are_neighbors(site1, site2)
 
+@instrumented(circuit_metrics)
 def create_heisenberg_square_lattice_matrix_circuit(lattice_matrix, t):
     """
     Creates a quantum circuit for the Heisenberg model on a square lattice.
@@ -73,14 +73,14 @@ def create_heisenberg_square_lattice_matrix_circuit(lattice_matrix, t):
         QuantumCircuit: The quantum circuit modeling the Heisenberg interactions.
     """    
     N = lattice_matrix.rows * lattice_matrix.cols
+    from qiskit.circuit import QuantumCircuit
+
     qc = QuantumCircuit(N)
-    # Iterate over all pairs of sites and apply interaction gates if they are neighbors    
-    for i in range(N):
-        for j in range(i + 1, N):
-            if lattice_matrix.are_neighbors(i, j):
-                qc.rxx(2 * t, i, j)
-                qc.ryy(2 * t, i, j)
-                qc.rzz(2 * t, i, j)
+    # Apply the interaction gates once per bond; bonds are sorted like the pairs (i, j > i) of a full scan
+    for i, j in lattice_matrix.lattice.bonds.tolist():
+        qc.rxx(2 * t, i, j)
+        qc.ryy(2 * t, i, j)
+        qc.rzz(2 * t, i, j)
     return qc
 
 # Example usage
@@ -0,0 +1,132 @@
+import numpy as np
+import scipy.sparse as sp
+
+class Lattice:
+    """
+    Stores the bonds of a lattice as a compact integer array together with a CSR neighbor table.
+
+    Every undirected bond appears once in ``bonds`` with the smaller site first, sorted lexicographically. The
+    neighbors of site ``i`` are ``neighbor_indices[neighbor_offsets[i]:neighbor_offsets[i + 1]]``, in the order the
+    bonds were generated; for ``square`` lattices that is up, down, left, right. Memory is ``O(n_bonds)``, so lattices
+    with millions of sites fit where a dense ``N x N`` adjacency matrix would not.
+
+    Attributes:
+        num_sites (int): The number of sites.
+        bonds (numpy.ndarray): The ``(n_bonds, 2)`` int32 array of bonded site pairs.
+        neighbor_offsets (numpy.ndarray): The ``num_sites + 1`` CSR offsets into ``neighbor_indices``.
+        neighbor_indices (numpy.ndarray): The int32 neighbors of all sites, grouped by site.
+        shape (tuple or None): The ``(rows, cols)`` of a ``square`` lattice, None for a general graph.
+        periodic (bool): Whether the bonds of a ``square`` lattice wrap around.
+    """
+    def __init__(self, num_sites, sites, neighbors):
+        """
+        Builds the lattice from directed neighbor pairs.
+
+        Args:
+            num_sites (int): The number of sites.
+            sites (numpy.ndarray): The source site of every directed pair; each bond must appear in both directions.
+            neighbors (numpy.ndarray): The neighbor of every directed pair, in the order it should be listed.
+        """
+        sites = np.asarray(sites, dtype=np.int64)
+        neighbors = np.asarray(neighbors, dtype=np.int64)
+        order = np.argsort(sites, kind='stable')
+        self.num_sites = num_sites
+        self.neighbor_indices = neighbors[order].astype(np.int32)
+        self.neighbor_offsets = np.concatenate([[0], np.cumsum(np.bincount(sites, minlength=num_sites))])
+        forward = sites < neighbors
+        bonds = np.stack([sites[forward], neighbors[forward]], axis=1)
+        self.bonds = bonds[np.lexsort((bonds[:, 1], bonds[:, 0]))].astype(np.int32)
+        self.shape = None
+        self.periodic = False
+
+    @classmethod
+    def square(cls, rows, cols, periodic=False):
+        """
+        Creates a square lattice with sites numbered row by row, ``site = row * cols + col``.
+
+        Args:
+            rows (int): The number of rows.
+            cols (int): The number of columns.
+            periodic (bool): If True, wraps the bonds around every dimension longer than 2; shorter dimensions
+                already connect all their sites. Defaults to False.
+
+        Returns:
+            Lattice: The lattice.
+        """
+        site = np.arange(rows * cols).reshape(rows, cols)
+        row, col = np.divmod(site, cols)
+        wrap_rows = periodic and rows > 2
+        wrap_cols = periodic and cols > 2
+        directions = [
+            ((row - 1) % rows, col, (row > 0) | wrap_rows),              # Up
+            ((row + 1) % rows, col, (row < rows - 1) | wrap_rows),       # Down
+            (row, (col - 1) % cols, (col > 0) | wrap_cols),              # Left
+            (row, (col + 1) % cols, (col < cols - 1) | wrap_cols),       # Right
+        ]
+        sites = np.stack([site] * 4, axis=-1)
+        neighbors = np.stack([r * cols + c for r, c, _ in directions], axis=-1)
+        valid = np.stack([np.broadcast_to(v, site.shape) for _, _, v in directions], axis=-1)
+        lattice = cls(rows * cols, sites[valid], neighbors[valid])
+        lattice.shape = (rows, cols)
+        lattice.periodic = periodic
+        return lattice
+
+    @property
+    def num_bonds(self):
+        """The number of undirected bonds."""
+        return len(self.bonds)
+
+    def neighbors(self, site):
+        """
+        Returns the neighbors of a site.
+
+        Args:
+            site (int): The site index.
+
+        Returns:
+            numpy.ndarray: The neighboring site indices, a view into ``neighbor_indices``.
+        """
+        return self.neighbor_indices[self.neighbor_offsets[site]:self.neighbor_offsets[site + 1]]
+
+    def degrees(self):
+        """Returns the number of neighbors of every site."""
+        return np.diff(self.neighbor_offsets)
+
+    def are_neighbors(self, site1, site2):
+        """
+        Determines if two sites share a bond.
+
+        Args:
+            site1 (int): The index of the first site.
+            site2 (int): The index of the second site.
+
+        Returns:
+            bool: True if the sites are neighbors, False otherwise.
+        """
+        return bool(np.any(self.neighbors(site1) == site2))
+
+    def directed_edges(self):
+        """
+        Lists every bond in both directions, grouped by source site in neighbor order.
+
+        Returns:
+            tuple: The source sites and the neighbor sites, as int32 arrays.
+        """
+        sites = np.repeat(np.arange(self.num_sites, dtype=np.int32), self.degrees())
+        return sites, self.neighbor_indices
+
+    def adjacency_matrix(self, sparse=True):
+        """
+        Builds the symmetric adjacency matrix.
+
+        Args:
+            sparse (bool): If True, returns a CSR matrix sharing the neighbor table's layout, otherwise a dense
+                ``N x N`` array. Defaults to True.
+
+        Returns:
+            scipy.sparse.csr_matrix or numpy.ndarray: The integer adjacency matrix.
+        """
+        data = np.ones(len(self.neighbor_indices), dtype=int)
+        matrix = sp.csr_matrix((data, self.neighbor_indices, self.neighbor_offsets),
+                               shape=(self.num_sites, self.num_sites))
+        return matrix if sparse else matrix.toarray()
@@ -0,0 +1,117 @@
+import numpy as np
+import scipy.sparse as sp
+import torch
+
+class HeisenbergMatvec:
+    """
+    Applies the Heisenberg Hamiltonian ``H = -J * sum_<i,j> (X_i X_j + Y_i Y_j + Z_i Z_j)`` directly in the S^z basis.
+
+    Basis state ``b`` stores the spin of site ``i`` in bit ``N - 1 - i`` (0 for up, 1 for down), matching the
+    Kronecker ordering of ``HeisenbergModel.build_hamiltonian``. On a bond the ZZ term is ``+1`` for parallel and ``-1``
+    for antiparallel spins, read off the parity of the two bits, while ``XX + YY`` maps an antiparallel pair to the
+    flipped pair with amplitude 2, reached by XOR-ing the bond's two-bit mask. The operator is real, so all arithmetic
+    is done in float64 and no ``2**N x 2**N`` matrix is ever formed.
+
+    Attributes:
+        N (int): The number of spins.
+        J (float): The exchange interaction strength.
+        bonds (list): The ``(i, j)`` site pairs that interact; the periodic chain by default.
+        dim (int): The dimension ``2**N`` of the Hilbert space.
+        diagonal (numpy.ndarray): The diagonal (ZZ) part of the Hamiltonian.
+    """
+    def __init__(self, N, J, bonds=None):
+        """
+        Initializes the engine and precomputes the diagonal of the Hamiltonian.
+
+        Args:
+            N (int): The number of spins.
+            J (float): The exchange interaction strength.
+            bonds (list, optional): The interacting ``(i, j)`` site pairs. Defaults to the periodic chain ``(i, (i + 1) % N)``.
+        """
+        self.N = N
+        self.J = J
+        self.bonds = [(i, (i + 1) % N) for i in range(N)] if bonds is None else [tuple(bond) for bond in bonds]
+        self.dim = 2**N
+        self.states = np.arange(self.dim, dtype=np.int64)
+        self.diagonal = np.zeros(self.dim, dtype=np.float64)
+        for i, j in self.bonds:
+            self.diagonal += 1 - 2 * self._antiparallel(self.states, i, j)
+        self.diagonal *= -J
+        self._torch_cache = {}
+
+    def _bits(self, i):
+        return self.N - 1 - i
+
+    def _antiparallel(self, states, i, j):
+        """Returns 1 where the spins of sites ``i`` and ``j`` differ, the parity of the bond's two bits."""
+        return ((states >> self._bits(i)) ^ (states >> self._bits(j))) & 1
+
+    def _flip_mask(self, i, j):
+        return (1 << self._bits(i)) ^ (1 << self._bits(j))
+
+    def apply(self, psi, out=None):
+        """
+        Computes ``H @ psi`` for a state or a batch of states.
+
+        Args:
+            psi (numpy.ndarray or torch.Tensor): A state of shape ``(2**N,)`` or a batch of states of shape ``(2**N, B)``.
+            out (numpy.ndarray or torch.Tensor, optional): A preallocated array of the same shape and type as ``psi``
+                that receives the result in place. Must not alias ``psi``.
+
+        Returns:
+            numpy.ndarray or torch.Tensor: ``H @ psi``, of the same type as ``psi``.
+        """
+        if isinstance(psi, torch.Tensor):
+            return self._apply_torch(psi, out)
+        return self._apply_numpy(np.asarray(psi), out)
+
+    __call__ = apply
+
+    def _apply_numpy(self, psi, out):
+        diagonal = self.diagonal.reshape((-1,) + (1,) * (psi.ndim - 1))
+        if out is None:
+            out = np.empty(psi.shape, dtype=np.result_type(psi.dtype, np.float64))
+        np.multiply(diagonal, psi, out=out)
+        for i, j in self.bonds:
+            amplitude = (-2.0 * self.J) * self._antiparallel(self.states, i, j)
+            out += amplitude.reshape(diagonal.shape) * psi[self.states ^ self._flip_mask(i, j)]
+        return out
+
+    def _torch_tensors(self, device):
+        if device not in self._torch_cache:
+            states = torch.from_numpy(self.states).to(device)
+            diagonal = torch.from_numpy(self.diagonal).to(device)
+            self._torch_cache[device] = (states, diagonal)
+        return self._torch_cache[device]
+
+    def _apply_torch(self, psi, out):
+        states, diagonal = self._torch_tensors(psi.device)
+        diagonal = diagonal.reshape((-1,) + (1,) * (psi.dim() - 1)).to(psi.dtype)
+        if out is None:
+            out = torch.empty_like(psi)
+        torch.mul(diagonal, psi, out=out)
+        for i, j in self.bonds:
+            amplitude = (-2.0 * self.J) * self._antiparallel(states, i, j).to(psi.dtype)
+            out += amplitude.reshape(diagonal.shape) * psi.index_select(0, states ^ self._flip_mask(i, j))
+        return out
+
+    def to_sparse(self):
+        """
+        Emits the Hamiltonian as a sparse matrix.
+
+        Returns:
+            scipy.sparse.csr_matrix: The float64 Hamiltonian matrix.
+        """
+        rows, cols, data = [self.states], [self.states], [self.diagonal]
+        for i, j in self.bonds:
+            src = self.states[self._antiparallel(self.states, i, j) == 1]
+            rows.append(src)
+            cols.append(src ^ self._flip_mask(i, j))
+            data.append(np.full(src.size, -2.0 * self.J))
+        H = sp.coo_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(self.dim, self.dim),
+        )
+        H = H.tocsr()
+        H.eliminate_zeros()
+        return H
@@ -0,0 +1,127 @@
+import numpy as np
+from qham.HBM.lattice import Lattice
+from qham.instrumentation import circuit_metrics, instrumented
+
+def _as_lattice(lattice):
+    return lattice if isinstance(lattice, Lattice) else lattice.lattice
+
+
+def greedy_edge_coloring(bonds, num_sites):
+    """
+    Colors the bonds of a graph so that bonds sharing a site get different colors.
+
+    Bonds are visited in order and each takes the smallest color not yet used at either endpoint, which needs at most
+    ``2 * max_degree - 1`` colors.
+
+    Args:
+        bonds (numpy.ndarray): The ``(n_bonds, 2)`` bonded site pairs.
+        num_sites (int): The number of sites.
+
+    Returns:
+        numpy.ndarray: The color of every bond.
+    """
+    used = [0] * num_sites
+    colors = np.empty(len(bonds), dtype=np.int32)
+    for index, (i, j) in enumerate(np.asarray(bonds).tolist()):
+        taken = used[i] | used[j]
+        color = (~taken & (taken + 1)).bit_length() - 1
+        colors[index] = color
+        used[i] |= 1 << color
+        used[j] |= 1 << color
+    return colors
+
+
+def square_edge_coloring(lattice):
+    """
+    Colors the bonds of a square lattice with at most four colors.
+
+    Horizontal bonds take color 0 or 1 by the parity of their left column and vertical bonds color 2 or 3 by the
+    parity of their upper row. This is a proper coloring unless a periodic dimension has odd length, where the wrap
+    bonds fall back to ``greedy_edge_coloring``.
+
+    Args:
+        lattice (Lattice): A lattice created by ``Lattice.square``.
+
+    Returns:
+        numpy.ndarray: The color of every bond.
+    """
+    rows, cols = lattice.shape
+    i, j = lattice.bonds[:, 0].astype(np.int64), lattice.bonds[:, 1].astype(np.int64)
+    horizontal = i // cols == j // cols
+    # The wrap bond (cols - 1, 0) is stored as (0, cols - 1); its left end is the last column
+    left = np.where(j - i == 1, i, j) % cols
+    upper = np.where(j - i == cols, i, j) // cols
+    colors = np.where(horizontal, left % 2, 2 + upper % 2).astype(np.int32)
+    wraps = (horizontal & (j - i != 1)) | (~horizontal & (j - i != cols))
+    odd_wrap = (horizontal & (cols % 2 == 1)) | (~horizontal & (rows % 2 == 1))
+    if np.any(wraps & odd_wrap):
+        return greedy_edge_coloring(lattice.bonds, lattice.num_sites)
+    return colors
+
+
+def schedule_bonds(lattice):
+    """
+    Splits the bonds of a lattice into layers of disjoint bonds.
+
+    Square lattices use ``square_edge_coloring`` (four layers), other graphs ``greedy_edge_coloring``.
+
+    Args:
+        lattice (Lattice, SquareLattice or SquareLatticeMatrix): The lattice.
+
+    Returns:
+        list: One ``(n_layer_bonds, 2)`` int32 array of bonds per layer; no site appears twice within a layer.
+    """
+    lattice = _as_lattice(lattice)
+    if lattice.shape is not None:
+        colors = square_edge_coloring(lattice)
+    else:
+        colors = greedy_edge_coloring(lattice.bonds, lattice.num_sites)
+    num_colors = int(colors.max()) + 1 if len(colors) else 0
+    return [lattice.bonds[colors == color] for color in range(num_colors)]
+
+
+@instrumented(circuit_metrics)
+def create_layered_heisenberg_circuit(lattice, t, trotter_steps=1):
+    """
+    Constructs a Heisenberg circuit that applies every bond once per Trotter step, layer by layer.
+
+    Every gate is ``rxx(2 * t)``, ``ryy(2 * t)`` or ``rzz(2 * t)``, i.e. ``exp(-1j * t * P)`` for ``P`` the XX, YY or ZZ
+    Pauli term, and these three commute, so each bond contributes exactly ``exp(-1j * t * (XX + YY + ZZ))`` per step.
+    A step is thus a first-order Trotter step of ``exp(-1j * t * H)`` for ``H = sum_bonds (XX + YY + ZZ)``, with the
+    bonds ordered by layer. ``create_heisenberg_lattice_circuit`` visits every bond from both endpoints with the same
+    angles, so it applies every bond twice and evolves for ``2 * t`` instead.
+
+    The gates of a layer act on disjoint qubits and are emitted together, so a step has depth ``3 * n_layers``: 12 on
+    a square lattice, independent of its size.
+
+    Args:
+        lattice (Lattice, SquareLattice or SquareLatticeMatrix): The lattice.
+        t (Parameter): A Qiskit Parameter representing the time evolution parameter for the Heisenberg model.
+        trotter_steps (int): Number of Trotter steps. Defaults to 1.
+
+    Returns:
+        QuantumCircuit: The layered circuit.
+    """
+    from qiskit.circuit import QuantumCircuit
+
+    layers = [layer.tolist() for layer in schedule_bonds(lattice)]
+    qc = QuantumCircuit(_as_lattice(lattice).num_sites)
+    for _ in range(trotter_steps):
+        for layer in layers:
+            for gate in (qc.rxx, qc.ryy, qc.rzz):
+                for i, j in layer:
+                    gate(2 * t, i, j)
+    return qc
+
+
+def circuit_cost(qc):
+    """
+    Reports the cost of a circuit.
+
+    Args:
+        qc (QuantumCircuit): The circuit.
+
+    Returns:
+        dict: The circuit ``'depth'``, the number of ``'two_qubit_gates'`` and the total number of ``'gates'``.
+    """
+    return {'depth': qc.depth(), 'two_qubit_gates': qc.num_nonlocal_gates(), 'gates': qc.size()}
@@ -0,0 +1,156 @@
+import numpy as np
+from scipy.linalg import eigvalsh
+from qham.basis import combination_states
+
+class MomentumSzBlocks:
+    """
+    Block-diagonalizes the periodic Heisenberg chain using total S^z and lattice momentum.
+
+    States use the bit convention of ``HeisenbergMatvec`` (site ``i`` in bit ``N - 1 - i``, set bits are down spins).
+    Within a magnetization sector every translation orbit is represented by its smallest member, the representative.
+    The momentum state ``|a(k)>`` built from representative ``a`` with periodicity ``R_a`` exists when
+    ``k * R_a`` is a multiple of ``N``, and the Hamiltonian couples ``|a(k)>`` to ``|b(k)>`` with amplitude
+    ``h * sqrt(R_a / R_b) * exp(-2j * pi * k * l / N)``, where ``l`` translates the flipped state back to ``b``.
+
+    Attributes:
+        N (int): The number of spins.
+        J (float): The exchange interaction strength.
+    """
+    def __init__(self, N, J):
+        """
+        Initializes the block decomposition of the periodic chain.
+
+        Args:
+            N (int): The number of spins.
+            J (float): The exchange interaction strength.
+        """
+        self.N = N
+        self.J = J
+        self._tables = {}
+
+    def sectors(self):
+        """
+        Lists the symmetry sectors of the chain.
+
+        Returns:
+            list: ``(sz, k)`` labels, where ``sz`` is the total S^z and ``k`` labels the momentum ``2 * pi * k / N``.
+        """
+        return [((self.N - 2 * num_down) / 2, k) for num_down in range(self.N + 1) for k in range(self.N)]
+
+    def _translate(self, states):
+        # Site i moves to site i + 1, i.e. its bit moves one position down and bit 0 wraps around to the top
+        return (states >> 1) | ((states & 1) << (self.N - 1))
+
+    def _representatives(self, states):
+        """Returns the representative of each state and the number of translations that maps the state onto it."""
+        best = states.copy()
+        shift = np.zeros(states.shape, dtype=np.int64)
+        rotated = states
+        for l in range(1, self.N):
+            rotated = self._translate(rotated)
+            smaller = rotated < best
+            best = np.where(smaller, rotated, best)
+            shift = np.where(smaller, l, shift)
+        return best, shift
+
+    def _sector_table(self, num_down):
+        if num_down not in self._tables:
+            states = combination_states(self.N, num_down)
+            reps, _ = self._representatives(states)
+            reps = states[reps == states]
+            periods = np.full(reps.shape, self.N, dtype=np.int64)
+            rotated = reps
+            for l in range(1, self.N):
+                rotated = self._translate(rotated)
+                periods = np.where((rotated == reps) & (periods == self.N), l, periods)
+            self._tables[num_down] = (reps, periods, self._transitions(reps))
+        return self._tables[num_down]
+
+    def _bond_parity(self, states, i, j):
+        return ((states >> (self.N - 1 - i)) ^ (states >> (self.N - 1 - j))) & 1
+
+    def _transitions(self, reps):
+        """Collects the spin flips of all bonds as (source, target representative, shift) triples."""
+        diagonal = np.zeros(reps.shape, dtype=np.float64)
+        sources, targets, shifts = [], [], []
+        for i in range(self.N):
+            j = (i + 1) % self.N
+            antiparallel = self._bond_parity(reps, i, j)
+            diagonal += -self.J * (1 - 2 * antiparallel)
+            src = np.flatnonzero(antiparallel)
+            flipped = reps[src] ^ ((1 << (self.N - 1 - i)) ^ (1 << (self.N - 1 - j)))
+            target, shift = self._representatives(flipped)
+            sources.append(src)
+            targets.append(target)
+            shifts.append(shift)
+        return diagonal, np.concatenate(sources), np.concatenate(targets), np.concatenate(shifts)
+
+    def basis(self, sz, k):
+        """
+        Lists the representatives spanning a symmetry block.
+
+        Args:
+            sz (float): The total S^z of the block.
+            k (int): The momentum label, ``0 <= k < N``.
+
+        Returns:
+            tuple: The representative states and their periodicities under translation.
+        """
+        reps, periods, _ = self._sector_table(self._num_down(sz))
+        allowed = (k * periods) % self.N == 0
+        return reps[allowed], periods[allowed]
+
+    def _num_down(self, sz):
+        num_down = self.N / 2 - sz
+        if num_down != int(num_down) or not 0 <= num_down <= self.N:
+            raise ValueError(f"sz={sz} is not a valid total S^z for {self.N} spins")
+        return int(num_down)
+
+    def block(self, sz, k):
+        """
+        Builds the Hamiltonian restricted to one ``(sz, k)`` block.
+
+        Args:
+            sz (float): The total S^z of the block.
+            k (int): The momentum label, ``0 <= k < N``.
+
+        Returns:
+            numpy.ndarray: The Hermitian block, real for ``k = 0`` and ``k = N / 2``.
+        """
+        reps, periods, (diagonal, sources, targets, shifts) = self._sector_table(self._num_down(sz))
+        allowed = (k * periods) % self.N == 0
+        index = np.full(reps.shape, -1, dtype=np.int64)
+        index[allowed] = np.arange(np.count_nonzero(allowed))
+        target_positions = np.searchsorted(reps, targets)
+        columns = index[sources]
+        rows = index[target_positions]
+        keep = (columns >= 0) & (rows >= 0)
+        columns, rows = columns[keep], rows[keep]
+        amplitude = -2.0 * self.J * np.sqrt(periods[sources[keep]] / periods[target_positions[keep]])
+        amplitude = amplitude * np.exp(-2j * np.pi * k * shifts[keep] / self.N)
+
+        H = np.diag(diagonal[allowed]).astype(np.complex128)
+        np.add.at(H, (rows, columns), amplitude)
+        if (2 * k) % self.N == 0:
+            return H.real
+        return H
+
+    def eigenvalues(self, sz=None, k=None):
+        """
+        Computes the full spectrum of every requested block.
+
+        Args:
+            sz (float, optional): Restricts the result to one total S^z. Defaults to all sectors.
+            k (int, optional): Restricts the result to one momentum label. Defaults to all momenta.
+
+        Returns:
+            dict: Maps each ``(sz, k)`` label to the ascending eigenvalues of its block; empty blocks are skipped.
+        """
+        spectra = {}
+        for label_sz, label_k in self.sectors():
+            if (sz is not None and label_sz != sz) or (k is not None and label_k != k):
+                continue
+            H = self.block(label_sz, label_k)
+            if H.shape[0]:
+                spectra[(label_sz, label_k)] = eigvalsh(H)
+        return spectra
@@ -1,3 +1,10 @@
-__all__ = ['QuantumHarmonicOscillator']
+from qham._lazy import lazy_exports
 
-from qham.QHO.qho import QuantumHarmonicOscillator
\ No newline at end of file
+_EXPORTS = {
+    'QuantumHarmonicOscillator': 'qham.QHO.qho',
+    'CoupledOscillators': 'qham.QHO.multimode',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,248 @@
+import numpy as np
+import torch
+import scipy.sparse as sp
+from qham.QHO.qho import QuantumHarmonicOscillator
+from qham.instrumentation import eigen_metrics, instrumented, matrix_metrics
+from qham.memory import check_memory, select_representation, sparse_bytes
+from qham.solvers import linear_operator, lowest_eigenpairs
+
+class CoupledOscillators:
+    """
+    Coupled harmonic oscillators with beam-splitter and Kerr couplings.
+
+    The Hamiltonian is ``sum_m omega_m (n_m + 1/2) + sum_m kerr_m / 2 * n_m (n_m - 1)
+    + sum_(i,j) g_ij (a_i_dagger a_j + a_j_dagger a_i)``, where every mode keeps the Fock states ``0 .. n - 1``. Basis
+    states are the occupation tuples in lexicographic order, which is the Kronecker order with mode 0 most
+    significant. With ``max_excitations`` only the tuples with at most that many excitations in total are kept; every
+    term conserves the total excitation number, so the restricted Hamiltonian is exact block by block and its
+    dimension grows polynomially instead of as ``n**M``. States are addressed by their mixed-radix code
+    ``sum_m n_m * n**(M - 1 - m)``, which ``state_index`` maps to the compact index by binary search.
+
+    Attributes:
+        n (int): The number of Fock states per mode.
+        omega (numpy.ndarray): The frequency of every mode.
+        num_modes (int): The number of modes ``M``.
+        couplings (dict): Maps mode pairs ``(i, j)`` to their beam-splitter coupling ``g_ij``.
+        kerr (numpy.ndarray): The Kerr nonlinearity of every mode.
+        max_excitations (int or None): The cutoff of the total excitation number, None for the full product space.
+        dimension (int): The number of basis states.
+    """
+    REPRESENTATIONS = ('sparse', 'matrix-free')
+
+    def __init__(self, n, omega, couplings=None, kerr=0.0, max_excitations=None):
+        """
+        Initializes the model; no operator is built until it is needed.
+
+        Args:
+            n (int): The number of Fock states per mode.
+            omega (array_like): The frequency of every mode; its length sets the number of modes.
+            couplings (dict, optional): Maps mode pairs ``(i, j)`` to their beam-splitter coupling. Defaults to none.
+            kerr (float or array_like): The Kerr nonlinearity of all modes or of every mode. Defaults to 0.
+            max_excitations (int, optional): Keeps only the states with at most this many excitations in total.
+                Defaults to the full product space.
+        """
+        self.n = n
+        self.omega = np.atleast_1d(np.asarray(omega, dtype=np.float64))
+        self.num_modes = self.omega.size
+        self.couplings = {}
+        for (i, j), g in (couplings or {}).items():
+            if i == j or not (0 <= i < self.num_modes and 0 <= j < self.num_modes):
+                raise ValueError(f"couplings need two distinct modes below {self.num_modes}, got {(i, j)}")
+            self.couplings[(i, j)] = g
+        self.kerr = np.broadcast_to(np.asarray(kerr, dtype=np.float64), (self.num_modes,)).copy()
+        self.max_excitations = max_excitations
+        self.dimension = self._count_states()
+        self._strides = n ** np.arange(self.num_modes - 1, -1, -1, dtype=np.int64)
+        self._ladder = QuantumHarmonicOscillator(n, 1.0).create_annihilation_operator(banded=True)[0]
+        self._codes = None
+
+    def _count_states(self):
+        if self.max_excitations is None:
+            return self.n**self.num_modes
+        # counts[s] is the number of occupations of the modes so far with s excitations in total
+        counts = np.zeros(self.max_excitations + 1, dtype=object)
+        counts[0] = 1
+        for _ in range(self.num_modes):
+            counts = np.array([sum(counts[max(0, s - self.n + 1):s + 1]) for s in range(counts.size)], dtype=object)
+        return int(counts.sum())
+
+    def basis_states(self):
+        """
+        Enumerates the occupation tuples of the basis.
+
+        Returns:
+            numpy.ndarray: A ``(dimension, num_modes)`` array of occupations, in the order of the rows of ``H``.
+        """
+        return self._occupations(self.basis_codes())
+
+    def basis_codes(self):
+        """
+        Returns the sorted mixed-radix codes of the basis states, built once and cached.
+
+        Returns:
+            numpy.ndarray: The int64 code of every basis state.
+        """
+        if self._codes is None:
+            if self.max_excitations is None:
+                self._codes = np.arange(self.dimension, dtype=np.int64)
+            else:
+                codes, totals = np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64)
+                for _ in range(self.num_modes):
+                    codes = (codes[:, None] * self.n + np.arange(self.n)).reshape(-1)
+                    totals = (totals[:, None] + np.arange(self.n)).reshape(-1)
+                    keep = totals <= self.max_excitations
+                    codes, totals = codes[keep], totals[keep]
+                self._codes = codes
+        return self._codes
+
+    def _occupations(self, codes):
+        return (codes[:, None] // self._strides) % self.n
+
+    def state_index(self, codes):
+        """
+        Maps mixed-radix codes of basis states to rows of ``H``.
+
+        Args:
+            codes (numpy.ndarray): Codes of states inside the basis.
+
+        Returns:
+            numpy.ndarray: The corresponding row indices.
+        """
+        if self.max_excitations is None:
+            return codes
+        return np.searchsorted(self.basis_codes(), codes)
+
+    def annihilation_operator(self, mode):
+        """
+        Builds the annihilation operator of one mode on the basis.
+
+        In the full product space this is the Kronecker product ``I x ... x a x ... x I`` of the single-mode
+        ``create_annihilation_operator``; with an excitation cutoff the same matrix elements are placed by
+        ``state_index``, which is closed under lowering.
+
+        Args:
+            mode (int): The mode.
+
+        Returns:
+            scipy.sparse.csr_matrix: The operator.
+        """
+        if self.max_excitations is None:
+            a = sp.diags(self._ladder[1:], 1, shape=(self.n, self.n))
+            left = sp.identity(self.n**mode, format='csr')
+            right = sp.identity(self.n**(self.num_modes - 1 - mode), format='csr')
+            return sp.kron(sp.kron(left, a), right, format='csr')
+        codes = self.basis_codes()
+        occupied = self._occupations(codes)[:, mode] > 0
+        source = np.flatnonzero(occupied)
+        target = self.state_index(codes[occupied] - self._strides[mode])
+        values = self._ladder[self._occupations(codes[occupied])[:, mode]]
+        return sp.csr_matrix((values, (target, source)), shape=(self.dimension, self.dimension))
+
+    def _diagonal(self, codes):
+        occupations = self._occupations(codes).astype(np.float64)
+        return (occupations + 0.5) @ self.omega + (occupations * (occupations - 1)) @ (self.kerr / 2)
+
+    def nnz(self):
+        """Bounds the stored entries of the sparse Hamiltonian: the diagonal and two hops per basis state and coupling."""
+        return self.dimension * (1 + 2 * len(self.couplings))
+
+    def estimate_memory(self, representation='sparse'):
+        """
+        Estimates the memory of the Hamiltonian without building it.
+
+        Args:
+            representation (str): ``'sparse'`` for the CSR matrix of ``create_sparse_hamiltonian`` or
+                ``'matrix-free'`` for the basis codes, the diagonal and the vectors of one ``as_linear_operator``
+                product. Defaults to ``'sparse'``.
+
+        Returns:
+            int: The number of bytes.
+        """
+        if representation == 'sparse':
+            return sparse_bytes(self.dimension, self.nnz())
+        if representation == 'matrix-free':
+            return (6 + self.num_modes) * self.dimension * 8
+        raise ValueError(f"unknown representation {representation!r}, expected one of {self.REPRESENTATIONS}")
+
+    def operator(self, representation='auto'):
+        """
+        Builds the Hamiltonian in the leanest form needed to fit into the memory budget.
+
+        Args:
+            representation (str): ``'sparse'``, ``'matrix-free'`` or ``'auto'`` for the first of these that fits
+                into the budget. Defaults to ``'auto'``.
+
+        Returns:
+            scipy.sparse.csr_matrix or scipy.sparse.linalg.LinearOperator: The Hamiltonian.
+        """
+        if select_representation(self, representation) == 'sparse':
+            return self.create_sparse_hamiltonian()
+        return self.as_linear_operator()
+
+    @instrumented(matrix_metrics)
+    def create_sparse_hamiltonian(self):
+        """
+        Assembles the Hamiltonian from the annihilation operators of the modes.
+
+        Returns:
+            scipy.sparse.csr_matrix: The float64 Hamiltonian matrix.
+        """
+        check_memory(self.estimate_memory('sparse'), "the sparse coupled-oscillator Hamiltonian")
+        H = sp.diags(self._diagonal(self.basis_codes()), format='csr')
+        lowering = {}
+        for (i, j), g in self.couplings.items():
+            for mode in (i, j):
+                if mode not in lowering:
+                    lowering[mode] = self.annihilation_operator(mode)
+            hop = lowering[i].T @ lowering[j]
+            H = H + g * (hop + hop.T)
+        return H.tocsr()
+
+    def as_linear_operator(self):
+        """
+        Wraps the Hamiltonian as a matrix-free ``LinearOperator``.
+
+        Only the diagonal and the basis codes are stored. Each product recomputes the occupations, and each coupling
+        moves one excitation between its modes by shifting the codes by the difference of their strides.
+
+        Returns:
+            scipy.sparse.linalg.LinearOperator: The Hamiltonian as a linear operator.
+        """
+        check_memory(self.estimate_memory('matrix-free'), "the matrix-free coupled-oscillator Hamiltonian")
+        codes = self.basis_codes()
+        diagonal = self._diagonal(codes)
+
+        def matvec(v):
+            # Complex states, e.g. the Krylov vectors of a time evolution, keep their imaginary part
+            v = np.asarray(v).reshape(-1)
+            out = diagonal * v.astype(np.result_type(v, np.float64), copy=False)
+            occupations = self._occupations(codes)
+            for (i, j), g in self.couplings.items():
+                # a_i_dagger a_j moves an excitation from mode j to mode i; its transpose moves it back
+                source = np.flatnonzero((occupations[:, j] > 0) & (occupations[:, i] < self.n - 1))
+                target = self.state_index(codes[source] + self._strides[i] - self._strides[j])
+                amplitude = g * self._ladder[occupations[source, i] + 1] * self._ladder[occupations[source, j]]
+                np.add.at(out, target, amplitude * v[source])
+                np.add.at(out, source, amplitude * v[target])
+            return out
+
+        return linear_operator(matvec, self.dimension)
+
+    @instrumented(eigen_metrics)
+    def lowest_eigenpairs(self, k=1, tol=0, maxiter=None, v0=None, representation='auto'):
+        """
+        Computes the lowest eigenpairs with an iterative Lanczos solver.
+
+        Args:
+            k (int): The number of eigenpairs to compute. Defaults to 1.
+            tol (float): The relative accuracy of the eigenvalues; 0 means machine precision. Defaults to 0.
+            maxiter (int, optional): The maximum number of solver iterations.
+            v0 (numpy.ndarray, optional): The starting vector of the iteration.
+            representation (str): The representation of the Hamiltonian, see ``operator``. Defaults to ``'auto'``.
+
+        Returns:
+            tuple: A tensor of the ``k`` lowest eigenvalues and a tensor of the corresponding eigenvectors.
+        """
+        eigenvalues, eigenvectors = lowest_eigenpairs(self.operator(representation), k=k, tol=tol, maxiter=maxiter,
+                                                      v0=v0)
+        return torch.from_numpy(eigenvalues), torch.from_numpy(eigenvectors)
@@ -1,64 +1,335 @@
+import numpy as np
 import torch
+import scipy.sparse as sp
+from scipy.linalg import LinAlgError, cholesky_banded, eig_banded, eigh_tridiagonal
+from scipy.sparse.linalg import LinearOperator, eigsh, splu
+from qham.instrumentation import eigen_metrics, instrumented, matrix_metrics
+from qham.memory import check_memory, select_representation, sparse_bytes
+from qham.solvers import linear_operator, lowest_eigenpairs, sweep_eigenpairs
+from qham.templates import OperatorTemplate
 
 class QuantumHarmonicOscillator:
     """
     A class representing the quantum harmonic oscillator, a fundamental model in quantum mechanics.
 
+    The Hamiltonian is ``omega * (a_dagger a + 1/2) + displacement * x + cubic * x**3 + quartic * x**4`` with the
+    dimensionless position ``x = (a + a_dagger) / sqrt(2)``. Every term is banded in the Fock basis (``x**p`` couples
+    states at most ``p`` apart), so it is stored as its ``bandwidth + 1`` lower diagonals and diagonalized with a
+    tridiagonal or banded eigensolver in ``O(n * bandwidth**2)`` work, which makes truncations of ``10**5`` states
+    routine.
+
     Attributes:
         n (int): The number of quantum states to consider in the oscillator model.
         omega (float): The angular frequency of the oscillator.
-        hamiltonian (torch.Tensor): The Hamiltonian matrix of the oscillator.
+        displacement (float): The strength of the linear term ``x``.
+        cubic (float): The strength of the cubic anharmonicity ``x**3``.
+        quartic (float): The strength of the quartic anharmonicity ``x**4``.
+        hamiltonian (torch.Tensor): The Hamiltonian matrix of the oscillator, built on first access.
     """
+    REPRESENTATIONS = ('dense', 'sparse', 'matrix-free')
+    TERMS = {'displacement': 1, 'cubic': 3, 'quartic': 4}
 
-    def __init__(self, n, omega):
+    def __init__(self, n, omega, displacement=0.0, cubic=0.0, quartic=0.0):
         """
         Initializes the QuantumHarmonicOscillator with the given number of states and frequency.
 
         Args:
             n (int): The number of quantum states for the oscillator.
             omega (float): The angular frequency of the oscillator.
+            displacement (float): The strength of the linear term ``x``. Defaults to 0.
+            cubic (float): The strength of the cubic term ``x**3``. Defaults to 0.
+            quartic (float): The strength of the quartic term ``x**4``. Defaults to 0.
         """
         self.n = n
         self.omega = omega
-        self.hamiltonian = self.create_hamiltonian()
+        self.displacement = displacement
+        self.cubic = cubic
+        self.quartic = quartic
+        self._hamiltonian = None
+        self._templates = None
+
+    @property
+    def hamiltonian(self):
+        """The dense Hamiltonian matrix, built on first access."""
+        if self._hamiltonian is None:
+            self._hamiltonian = self.create_hamiltonian()
+        return self._hamiltonian
+
+    @hamiltonian.setter
+    def hamiltonian(self, value):
+        self._hamiltonian = value
+
+    @property
+    def bandwidth(self):
+        """The number of nonzero diagonals of the Hamiltonian on each side of the main one."""
+        return max([power for name, power in self.TERMS.items() if getattr(self, name)] + [0])
+
+    def estimate_memory(self, representation='dense'):
+        """
+        Estimates the memory of the Hamiltonian without building it.
+
+        Args:
+            representation (str): ``'dense'`` for the matrix ``hamiltonian`` in torch's default dtype, ``'sparse'``
+                for the CSR matrix of ``operator_templates`` or ``'matrix-free'`` for the bands and the vectors of one
+                ``as_linear_operator`` product. Defaults to ``'dense'``.
+
+        Returns:
+            int: The number of bytes.
+        """
+        if representation == 'dense':
+            return self.n**2 * torch.empty(0).element_size()
+        if representation == 'sparse':
+            return sparse_bytes(self.n, self.n * (2 * self.bandwidth + 1))
+        if representation == 'matrix-free':
+            return (self.bandwidth + 4) * self.n * 8
+        raise ValueError(f"unknown representation {representation!r}, expected one of {self.REPRESENTATIONS}")
+
+    def operator(self, representation='auto'):
+        """
+        Builds the Hamiltonian in the leanest form needed to fit into the memory budget.
+
+        Args:
+            representation (str): ``'dense'``, ``'sparse'``, ``'matrix-free'`` or ``'auto'`` for the first of these
+                that fits into the budget. Defaults to ``'auto'``.
+
+        Returns:
+            torch.Tensor or scipy.sparse.csr_matrix or scipy.sparse.linalg.LinearOperator: The Hamiltonian.
 
-    def create_annihilation_operator(self):
+        Raises:
+            MemoryBudgetError: If no allowed representation fits into the budget.
         """
-        Creates the annihilation operator matrix for n quantum states, which is a lower-triangular matrix.
+        representation = select_representation(self, representation)
+        if representation == 'dense':
+            return self.hamiltonian
+        if representation == 'sparse':
+            return self.operator_templates().assemble(**self._coefficients(self.omega))
+        return self.as_linear_operator()
+
+    def create_annihilation_operator(self, banded=False):
+        """
+        Creates the annihilation operator matrix for n quantum states, which has ``sqrt(1), ..., sqrt(n - 1)`` on its
+        first superdiagonal.
+
+        Args:
+            banded (bool): If True, returns the operator in the upper banded storage of ``scipy.linalg``, a ``(2, n)``
+                array whose first row holds the superdiagonal (shifted by one) and whose second row holds the zero
+                diagonal, instead of a dense matrix. The creation operator is its transpose, i.e. the same array read
+                as lower banded storage. Defaults to False.
 
         Returns:
-            torch.Tensor: The annihilation operator represented as a PyTorch tensor.
+            torch.Tensor or numpy.ndarray: The annihilation operator, dense as a PyTorch tensor or banded.
         """
+        if banded:
+            bands = np.zeros((2, self.n))
+            bands[0, 1:] = np.sqrt(np.arange(1, self.n))
+            return bands
         indices = torch.arange(1, self.n)
         values = torch.sqrt(indices)
         return torch.diag(values, 1)
 
+    def position_operator(self, power=1):
+        """
+        Builds a power of the dimensionless position ``x = (a + a_dagger) / sqrt(2)``.
+
+        The power is taken of the truncated ``x``, so the result stays symmetric; entries within ``power`` states of
+        the cutoff differ from the untruncated operator.
+
+        Args:
+            power (int): The exponent. Defaults to 1.
+
+        Returns:
+            scipy.sparse.csr_matrix: The operator, with ``power`` nonzero diagonals on each side of the main one.
+        """
+        off_diagonal = np.sqrt(np.arange(1, self.n) / 2)
+        x = sp.diags([off_diagonal, off_diagonal], [-1, 1], shape=(self.n, self.n), format='csr')
+        result = sp.identity(self.n, format='csr')
+        for _ in range(power):
+            result = result @ x
+        return result
+
+    def _coefficients(self, omega):
+        coefficients = {'omega': omega}
+        coefficients.update({name: getattr(self, name) for name in self.TERMS if getattr(self, name)})
+        return coefficients
+
+    def banded_hamiltonian(self):
+        """
+        Assembles the Hamiltonian in the lower banded storage of ``scipy.linalg.eig_banded``.
+
+        Returns:
+            numpy.ndarray: A ``(bandwidth + 1, n)`` float64 array whose row ``k`` holds the ``k``-th subdiagonal,
+            ``bands[k, j] = H[j + k, j]``.
+        """
+        bands = np.zeros((self.bandwidth + 1, self.n))
+        bands[0] = self.omega * (np.arange(self.n) + 0.5)
+        for name, power in self.TERMS.items():
+            strength = getattr(self, name)
+            if strength:
+                term = self.position_operator(power)
+                for k in range(power + 1):
+                    bands[k, :self.n - k] += strength * term.diagonal(-k)
+        return bands
+
+    @instrumented(matrix_metrics)
     def create_hamiltonian(self):
         """
-        Constructs the Hamiltonian matrix for the quantum harmonic oscillator using the annihilation and creation operators.
+        Constructs the dense Hamiltonian matrix of the oscillator from its bands.
 
         Returns:
             torch.Tensor: The Hamiltonian matrix as a PyTorch tensor.
         """
-        a = self.create_annihilation_operator()
-        a_dagger = a.T
-        H = self.omega * (a_dagger @ a + 0.5 * torch.eye(self.n))
+        check_memory(self.estimate_memory('dense'), "the dense oscillator Hamiltonian")
+        bands = torch.from_numpy(self.banded_hamiltonian()).to(torch.get_default_dtype())
+        # The bands are written through diagonal views, so the only n x n allocation is H itself
+        H = torch.zeros(self.n, self.n, dtype=bands.dtype)
+        H.diagonal().copy_(bands[0])
+        for k in range(1, bands.shape[0]):
+            H.diagonal(-k).copy_(bands[k, :self.n - k])
+            H.diagonal(k).copy_(bands[k, :self.n - k])
         return H
 
-    def find_eigenstates(self):
+    def operator_templates(self):
         """
-        Diagonalizes the Hamiltonian matrix to find its eigenvalues and eigenvectors, representing the energy levels and state vectors of the oscillator.
+        Builds the structural operators of the Hamiltonian once and caches them on the oscillator.
 
         Returns:
-            tuple: A tuple containing a tensor of eigenvalues and a matrix of eigenvectors.
+            OperatorTemplate: The ``omega`` operator ``a_dagger a + 1/2`` and the powers of ``x`` of the nonzero
+            anharmonic terms, so that ``H = omega * (a_dagger a + 1/2) + displacement * x + ...``.
+        """
+        if self._templates is None:
+            operators = {'omega': sp.diags(np.arange(self.n) + 0.5)}
+            operators.update({name: self.position_operator(power) for name, power in self.TERMS.items()
+                              if getattr(self, name)})
+            self._templates = OperatorTemplate(operators)
+        return self._templates
+
+    def sweep(self, omega, k=1, dense=None, tol=0):
         """
-        eigenvalues, eigenvectors = torch.linalg.eigh(self.hamiltonian)
-        return eigenvalues, eigenvectors
+        Computes the lowest energy levels for a list of angular frequencies, keeping the anharmonic terms fixed.
+
+        Args:
+            omega (array_like): The angular frequencies.
+            k (int): The number of energy levels per point. Defaults to 1.
+            dense (bool, optional): Forces batched dense (True) or iterative (False) diagonalization. Defaults to dense
+                for up to 2048 states.
+            tol (float): The relative accuracy of the iterative solver. Defaults to 0.
+
+        Returns:
+            torch.Tensor: A tensor of shape ``(len(omega), k)`` with the energy levels for every frequency.
+        """
+        coefficients = [self._coefficients(value) for value in np.atleast_1d(omega)]
+        return torch.from_numpy(sweep_eigenpairs(self.operator_templates(), coefficients, k=k, dense=dense, tol=tol))
+
+    @instrumented(eigen_metrics)
+    def find_eigenstates(self, k=None):
+        """
+        Diagonalizes the banded Hamiltonian to find its eigenvalues and eigenvectors, representing the energy levels
+        and state vectors of the oscillator.
+
+        The harmonic oscillator, with or without displacement, is tridiagonal and solved with
+        ``scipy.linalg.eigh_tridiagonal``. Anharmonic terms widen the band; then ``scipy.linalg.eig_banded`` is used
+        for up to 2048 states or when all levels are requested, and otherwise ARPACK in shift-invert mode around a
+        lower bound of the spectrum, with a banded LU factorization, since ``eig_banded`` allocates an ``n x n``
+        workspace even when only a few levels are selected. The dense matrix is never formed.
+
+        Args:
+            k (int, optional): Computes only the ``k`` lowest levels. Defaults to all ``n``; the ``n x n`` matrix of
+                eigenvectors then dominates the memory for large truncations.
+
+        Returns:
+            tuple: A tensor of eigenvalues in ascending order and a matrix whose columns are the eigenvectors, in
+            torch's default dtype.
+        """
+        k = self.n if k is None else k
+        if not 0 < k <= self.n:
+            raise ValueError(f"k must lie between 1 and n={self.n}, got {k}")
+        check_memory(self.n * k * 8, f"{k} eigenvectors of the oscillator")
+        bands = self.banded_hamiltonian()
+        select = ('a', None) if k == self.n else ('i', (0, k - 1))
+        if self.bandwidth <= 1:
+            off_diagonal = bands[1, :-1] if self.bandwidth else np.zeros(self.n - 1)
+            eigenvalues, eigenvectors = eigh_tridiagonal(bands[0], off_diagonal, select=select[0],
+                                                         select_range=select[1])
+        elif k == self.n or self.n <= 2048:
+            eigenvalues, eigenvectors = eig_banded(bands, lower=True, select=select[0], select_range=select[1])
+        else:
+            eigenvalues, eigenvectors = self._shift_invert_eigenpairs(bands, k)
+        dtype = torch.get_default_dtype()
+        return torch.from_numpy(eigenvalues).to(dtype), torch.from_numpy(eigenvectors).to(dtype)
+
+    def _shift_invert_eigenpairs(self, bands, k, tol=0, maxiter=None, v0=None):
+        """Finds the ``k`` lowest eigenpairs of a banded Hamiltonian as those closest to a shift below the spectrum."""
+        # The eigenvalues lie above sigma exactly when H - sigma is positive definite, i.e. has a Cholesky factor
+        sigma, step = bands[0].min(), 1.0
+        while True:
+            shifted = bands.copy()
+            shifted[0] -= sigma - step
+            try:
+                cholesky_banded(shifted, lower=True)
+                break
+            except LinAlgError:
+                step *= 2
+        sigma -= step
+        offsets = range(1 - bands.shape[0], bands.shape[0])
+        diagonals = [bands[abs(offset), :self.n - abs(offset)] for offset in offsets]
+        H = sp.diags(diagonals, offsets, format='csc')
+        factor = splu((H - sigma * sp.identity(self.n, format='csc')).tocsc())
+        inverse = LinearOperator((self.n, self.n), matvec=factor.solve, dtype=np.float64)
+        eigenvalues, eigenvectors = eigsh(H, k=k, sigma=sigma, which='LM', OPinv=inverse, tol=tol, maxiter=maxiter,
+                                          v0=v0)
+        order = np.argsort(eigenvalues)
+        return eigenvalues[order], eigenvectors[:, order]
+
+    def as_linear_operator(self):
+        """
+        Wraps the Hamiltonian as a matrix-free ``LinearOperator`` that applies its bands to a state vector.
+
+        Returns:
+            scipy.sparse.linalg.LinearOperator: The Hamiltonian as a linear operator.
+        """
+        bands = self.banded_hamiltonian()
+
+        def matvec(v):
+            # Complex states, e.g. the Krylov vectors of a time evolution, keep their imaginary part
+            v = np.asarray(v).reshape(-1)
+            out = bands[0] * v.astype(np.result_type(v, np.float64), copy=False)
+            for k in range(1, bands.shape[0]):
+                band = bands[k, :self.n - k]
+                out[k:] += band * v[:self.n - k]            # Lower diagonal k
+                out[:self.n - k] += band * v[k:]            # Upper diagonal k
+            return out
+
+        return linear_operator(matvec, self.n)
+
+    def lowest_eigenpairs(self, k=1, tol=0, maxiter=None, v0=None):
+        """
+        Computes the lowest energy levels with an iterative Lanczos solver, never forming the dense Hamiltonian.
+
+        Anharmonic terms make the top of the spectrum grow like ``n**2``, far faster than the gaps at the bottom, so
+        plain Lanczos iterations stall for wide bands and large truncations. These cases are solved in shift-invert
+        mode around a lower bound of the spectrum, as in ``find_eigenstates``.
+
+        Args:
+            k (int): The number of eigenpairs to compute. Defaults to 1.
+            tol (float): The relative accuracy of the eigenvalues; 0 means machine precision. Defaults to 0.
+            maxiter (int, optional): The maximum number of solver iterations.
+            v0 (numpy.ndarray, optional): The starting vector of the iteration.
+
+        Returns:
+            tuple: A tensor of the ``k`` lowest eigenvalues and a tensor of the corresponding eigenvectors.
+        """
+        if k < self.n and (self.bandwidth > 1 or self.n > 2048):
+            eigenvalues, eigenvectors = self._shift_invert_eigenpairs(self.banded_hamiltonian(), k, tol=tol,
+                                                                      maxiter=maxiter, v0=v0)
+        else:
+            eigenvalues, eigenvectors = lowest_eigenpairs(self.as_linear_operator(), k=k, tol=tol, maxiter=maxiter,
+                                                          v0=v0)
+        return torch.from_numpy(eigenvalues), torch.from_numpy(eigenvectors)
 
     def print_eigenvalues(self):
         """
         Prints the calculated eigenvalues (energy levels) of the quantum harmonic oscillator.
-        """        
+        """
         eigenvalues, _ = self.find_eigenstates()
         print("Eigenvalues (Energy Levels):", eigenvalues)
 
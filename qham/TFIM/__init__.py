@@ -1,5 +1,13 @@
-__all__ = ['TFIMSimulation',
-            'create_tfim_circuit']
+from qham._lazy import lazy_exports
 
-from qham.TFIM.tfim import TFIMSimulation
-from qham.TFIM.tfimq import create_tfim_circuit
\ No newline at end of file
+_EXPORTS = {
+    'TFIMSimulation': 'qham.TFIM.tfim',
+    'create_tfim_circuit': 'qham.TFIM.tfimq',
+    'tfim_circuit_template': 'qham.TFIM.tfimq',
+    'bind_tfim_circuit': 'qham.TFIM.tfimq',
+    'create_tfim_hamiltonian': 'qham.TFIM.tfimh',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,187 @@
+import ast
+import os
+import pickle
+
+import numpy as np
+import torch
+
+_HEADER_SIZE = 256
+_MAGIC = b'\x93NUMPY\x01\x00'
+
+
+class Checkpoint:
+    """
+    Saves and restores the complete state of a ``TFIMSimulation`` run in a directory.
+
+    The lattice is written into one of two slots of a memory-mapped ``.npy`` file, ``lattice.npy``, and the step
+    counter, the torch RNG state and the attributes the simulation lists in ``CHECKPOINT_STATE`` (observable
+    accumulators, exchange counters, the packed backend's generator, ...) are pickled into ``state.pkl``. The state
+    file names the valid slot and is replaced atomically only after the other slot has been flushed, so a job killed
+    at any point leaves a consistent checkpoint behind and resuming continues the run bitwise-exactly.
+
+    Lattice snapshots are appended to ``snapshots.npy``, a single ``.npy`` file with a fixed-size header that is
+    rewritten on every append, so ``numpy.load(path, mmap_mode='r')`` reads the series lazily at any time.
+
+    Attributes:
+        directory (str): The directory holding the checkpoint files.
+    """
+    LATTICE = 'lattice.npy'
+    STATE = 'state.pkl'
+    SNAPSHOTS = 'snapshots.npy'
+
+    def __init__(self, directory):
+        """
+        Initializes a checkpoint, creating the directory if needed.
+
+        Args:
+            directory (str): The directory holding the checkpoint files.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def exists(self):
+        """Returns whether a state has been saved."""
+        return os.path.exists(self._path(self.STATE))
+
+    def _load_state(self):
+        with open(self._path(self.STATE), 'rb') as file:
+            return pickle.load(file)
+
+    def save(self, simulation, step):
+        """
+        Saves the state of a simulation.
+
+        Args:
+            simulation (TFIMSimulation): The simulation.
+            step (int): The number of steps of the current run that have been completed.
+        """
+        lattice = _lattice_array(simulation.lattice)
+        previous = self._load_state() if self.exists() else None
+        slots = self._lattice_slots(lattice, 'r+' if previous is not None else 'w+')
+        slot = 0 if previous is None else 1 - previous['slot']
+        slots[slot] = lattice
+        slots.flush()
+        del slots
+        state = {
+            'slot': slot,
+            'step': step,
+            'torch_rng': torch.get_rng_state(),
+            'attributes': {name: getattr(simulation, name) for name in simulation.CHECKPOINT_STATE},
+            'snapshots': self._snapshot_count(),
+        }
+        temporary = self._path(self.STATE + '.tmp')
+        with open(temporary, 'wb') as file:
+            pickle.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self._path(self.STATE))
+
+    def _lattice_slots(self, lattice, mode):
+        path = self._path(self.LATTICE)
+        if mode == 'w+' or not os.path.exists(path):
+            return np.lib.format.open_memmap(path, mode='w+', dtype=lattice.dtype, shape=(2,) + lattice.shape)
+        slots = np.lib.format.open_memmap(path, mode=mode)
+        if slots.shape[1:] != lattice.shape or slots.dtype != lattice.dtype:
+            raise ValueError(f"the checkpoint holds a {slots.dtype} lattice of shape {slots.shape[1:]}, "
+                             f"got {lattice.dtype} of shape {lattice.shape}")
+        return slots
+
+    def restore(self, simulation):
+        """
+        Restores the saved state into a simulation.
+
+        The simulation's parameters are kept, so a finished run can be extended by resuming it with more steps.
+        Snapshots appended after the saved state are discarded, since the resumed run will append them again.
+
+        Args:
+            simulation (TFIMSimulation): A simulation created with the parameters of the saved run.
+
+        Returns:
+            int: The number of steps of the run that had been completed.
+        """
+        state = self._load_state()
+        slots = np.lib.format.open_memmap(self._path(self.LATTICE), mode='r')
+        lattice = np.array(slots[state['slot']])
+        del slots
+        for name, value in state['attributes'].items():
+            setattr(simulation, name, value)
+        if isinstance(simulation.lattice, torch.Tensor):
+            simulation.lattice = torch.from_numpy(lattice)
+        else:
+            simulation.lattice = type(simulation.lattice)(lattice)
+        torch.set_rng_state(state['torch_rng'])
+        self._truncate_snapshots(state['snapshots'])
+        return state['step']
+
+    def append_snapshot(self, simulation):
+        """
+        Appends the current lattice to the snapshot series.
+
+        Tensor lattices are stored as int8 spins, packed lattices as their words.
+
+        Args:
+            simulation (TFIMSimulation): The simulation.
+        """
+        snapshot = _snapshot_array(simulation.lattice)
+        path = self._path(self.SNAPSHOTS)
+        if not os.path.exists(path):
+            with open(path, 'wb') as file:
+                file.write(_snapshot_header(snapshot.dtype, (0,) + snapshot.shape))
+        dtype, shape = self._snapshot_layout()
+        if shape[1:] != snapshot.shape or dtype != snapshot.dtype:
+            raise ValueError(f"the snapshots are {dtype} of shape {shape[1:]}, got {snapshot.dtype} of shape "
+                             f"{snapshot.shape}")
+        with open(path, 'r+b') as file:
+            file.seek(_HEADER_SIZE + shape[0] * snapshot.nbytes)
+            file.write(snapshot.tobytes())
+            file.seek(0)
+            file.write(_snapshot_header(dtype, (shape[0] + 1,) + shape[1:]))
+
+    def _snapshot_layout(self):
+        with open(self._path(self.SNAPSHOTS), 'rb') as file:
+            header = ast.literal_eval(file.read(_HEADER_SIZE)[len(_MAGIC) + 2:].decode('latin1'))
+        return np.dtype(header['descr']), header['shape']
+
+    def _snapshot_count(self):
+        if not os.path.exists(self._path(self.SNAPSHOTS)):
+            return 0
+        return self._snapshot_layout()[1][0]
+
+    def _truncate_snapshots(self, count):
+        if count == self._snapshot_count():
+            return
+        dtype, shape = self._snapshot_layout()
+        with open(self._path(self.SNAPSHOTS), 'r+b') as file:
+            file.truncate(_HEADER_SIZE + count * dtype.itemsize * int(np.prod(shape[1:])))
+            file.write(_snapshot_header(dtype, (count,) + shape[1:]))
+
+    def snapshots(self):
+        """
+        Opens the snapshot series without loading it.
+
+        Returns:
+            numpy.memmap or None: A read-only ``(count, ...)`` array, or None if no snapshot has been taken.
+        """
+        path = self._path(self.SNAPSHOTS)
+        if not os.path.exists(path) or self._snapshot_count() == 0:
+            return None
+        return np.load(path, mmap_mode='r')
+
+
+def _lattice_array(lattice):
+    return lattice.numpy() if isinstance(lattice, torch.Tensor) else lattice.words
+
+
+def _snapshot_array(lattice):
+    return lattice.to(torch.int8).numpy() if isinstance(lattice, torch.Tensor) else lattice.words
+
+
+def _snapshot_header(dtype, shape):
+    """Builds a version 1.0 ``.npy`` header padded to a fixed size, so it can be rewritten in place as rows are added."""
+    header = repr({'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)), 'fortran_order': False, 'shape': shape})
+    length = _HEADER_SIZE - len(_MAGIC) - 2
+    header = header.ljust(length - 1) + '\n'
+    return _MAGIC + length.to_bytes(2, 'little') + header.encode('latin1')
@@ -0,0 +1,83 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+import scipy.sparse as sp
+import torch
+from scipy.sparse.csgraph import connected_components
+
+@lru_cache(maxsize=16)
+def square_lattice_neighbors(size):
+    """
+    Build the neighbor table of the periodic square lattice.
+
+    Sites are numbered row by row, ``site = row * size + col``.
+
+    Args:
+        size (int): The width and height of the lattice.
+
+    Returns:
+        torch.Tensor: A ``(size * size, 4)`` long tensor with the down, up, right and left neighbor of every site.
+    """
+    sites = torch.arange(size * size).view(size, size)
+    return torch.stack([torch.roll(sites, -1, 0), torch.roll(sites, 1, 0),
+                        torch.roll(sites, -1, 1), torch.roll(sites, 1, 1)], dim=-1).view(-1, 4)
+
+
+def wolff_update(lattice, beta):
+    """
+    Grow and flip one Wolff cluster.
+
+    The cluster is grown layer by layer from a random seed: every bond from the current frontier to an aligned spin
+    outside the cluster is activated with probability ``1 - exp(-2 * beta)``, all on whole index tensors.
+
+    Args:
+        lattice (torch.Tensor): A ``(size, size)`` lattice of +1/-1 spins.
+        beta (float): The inverse temperature.
+
+    Returns:
+        tuple: The updated lattice and the number of flipped spins.
+    """
+    size = lattice.shape[-1]
+    neighbors = square_lattice_neighbors(size)
+    spins = lattice.reshape(-1)
+    p_add = 1 - math.exp(-2 * float(beta))
+    seed = torch.randint(spins.numel(), (1,))
+    in_cluster = torch.zeros(spins.numel(), dtype=torch.bool)
+    in_cluster[seed] = True
+    frontier = seed
+    while frontier.numel():
+        candidates = neighbors[frontier].reshape(-1)
+        candidates = candidates[(spins[candidates] == spins[seed]) & ~in_cluster[candidates]]
+        frontier = torch.unique(candidates[torch.rand(candidates.numel()) < p_add])
+        in_cluster[frontier] = True
+    flipped = torch.where(in_cluster, -spins, spins).view_as(lattice)
+    return flipped, int(in_cluster.sum())
+
+
+def swendsen_wang_update(lattice, beta):
+    """
+    Perform one Swendsen-Wang update.
+
+    Bonds between aligned neighbors are activated with probability ``1 - exp(-2 * beta)``, the clusters are labeled
+    with a connected-components pass over the sparse bond graph, and every cluster is flipped with probability 1/2.
+
+    Args:
+        lattice (torch.Tensor): A ``(size, size)`` lattice of +1/-1 spins.
+        beta (float): The inverse temperature.
+
+    Returns:
+        tuple: The updated lattice and the number of clusters.
+    """
+    size = lattice.shape[-1]
+    neighbors = square_lattice_neighbors(size)
+    spins = lattice.reshape(-1)
+    sites = torch.arange(spins.numel()).repeat(2)
+    partners = torch.cat([neighbors[:, 0], neighbors[:, 2]])      # down and right bonds
+    p_add = 1 - math.exp(-2 * float(beta))
+    active = (spins[sites] == spins[partners]) & (torch.rand(sites.numel()) < p_add)
+    graph = sp.coo_matrix((np.ones(int(active.sum())), (sites[active].numpy(), partners[active].numpy())),
+                          shape=(spins.numel(), spins.numel()))
+    num_clusters, labels = connected_components(graph, directed=False)
+    flip = (torch.rand(num_clusters) < 0.5)[torch.from_numpy(labels).long()]
+    return torch.where(flip, -spins, spins).view_as(lattice), num_clusters
@@ -0,0 +1,111 @@
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import torch
+from qham.TFIM.tfim import TFIMSimulation
+
+_SHARED = {}
+
+
+def expand_grid(params_grid):
+    """
+    Expands a parameter grid into the keyword arguments of the individual simulations.
+
+    Args:
+        params_grid (dict or list): Either a dictionary mapping each parameter to a list of values, expanded into
+            their Cartesian product, or a list of keyword-argument dictionaries used as given.
+
+    Returns:
+        list: One keyword-argument dictionary per simulation.
+    """
+    if isinstance(params_grid, dict):
+        names = list(params_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*(params_grid[name] for name in names))]
+    return [dict(params) for params in params_grid]
+
+
+def _initialize_worker(name, threads):
+    torch.set_num_threads(threads)
+    # Workers share the resource tracker of the parent, which alone unlinks the block
+    _SHARED['memory'] = SharedMemory(name=name)
+
+
+def _lattice_tensor(simulation):
+    lattice = simulation.lattice
+    return lattice.to_tensor() if hasattr(lattice, 'to_tensor') else lattice
+
+
+def _run_task(task):
+    simulation, params, seed_sequence, offset, measure, thermalization = task
+    torch.manual_seed(int(seed_sequence.generate_state(1, dtype=np.uint64)[0]))
+    sim = simulation(**params)
+    observables = sim.run_simulation(measure=measure, thermalization=thermalization)
+    spins = _lattice_tensor(sim).reshape(-1).to(torch.int8).numpy()
+    buffer = np.ndarray(spins.shape, dtype=np.int8, buffer=_SHARED['memory'].buf, offset=offset)
+    buffer[:] = spins
+    del buffer
+    return None if observables is None else observables.summary()
+
+
+def run_ensemble(params_grid, n_workers=None, seed=None, simulation=TFIMSimulation, measure=False,
+                 thermalization=0, threads_per_worker=1):
+    """
+    Runs independent simulations in parallel on a pool of worker processes.
+
+    Every simulation is seeded from its own child of ``numpy.random.SeedSequence(seed)``, so the results depend only
+    on ``seed`` and the grid, not on the number of workers or the order in which tasks finish. Each worker pins torch
+    to ``threads_per_worker`` intra-op threads to avoid oversubscription. The final lattices are written as int8
+    spins into one shared-memory block instead of being pickled back; only the small observable summaries travel
+    through the pool.
+
+    Args:
+        params_grid (dict or list): The simulation parameters, see ``expand_grid``.
+        n_workers (int, optional): The number of worker processes. Defaults to ``os.cpu_count()``; 1 runs every
+            simulation in the calling process, leaving its torch random state and thread count unchanged.
+        seed (int, optional): The root seed of the ensemble. Defaults to fresh entropy.
+        simulation (type): The simulation class, ``TFIMSimulation`` or a subclass. Defaults to ``TFIMSimulation``.
+        measure (bool): Whether to stream observables during every run. Defaults to False.
+        thermalization (int): The number of unmeasured initial steps. Defaults to 0.
+        threads_per_worker (int): The number of torch threads of every worker. Defaults to 1.
+
+    Returns:
+        list: One dictionary per simulation, in grid order, with the ``'params'``, the final ``'lattice'`` tensor and
+        the ``'observables'`` summary (None unless ``measure`` is set).
+    """
+    tasks = expand_grid(params_grid)
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    shapes = [simulation.lattice_shape(**params) for params in tasks]
+    offsets = np.concatenate([[0], np.cumsum([math.prod(shape) for shape in shapes])]).astype(int)
+    n_workers = os.cpu_count() if n_workers is None else n_workers
+    memory = SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+    try:
+        jobs = [(simulation, params, seeds[index], int(offsets[index]), measure, thermalization)
+                for index, params in enumerate(tasks)]
+        if n_workers == 1:
+            # Run like a worker, without touching the caller's random state or thread count
+            _SHARED['memory'] = memory
+            threads = torch.get_num_threads()
+            torch.set_num_threads(threads_per_worker)
+            try:
+                with torch.random.fork_rng():
+                    summaries = [_run_task(job) for job in jobs]
+            finally:
+                torch.set_num_threads(threads)
+                del _SHARED['memory']
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_initialize_worker,
+                                     initargs=(memory.name, threads_per_worker)) as pool:
+                summaries = list(pool.map(_run_task, jobs))
+        spins = np.ndarray((int(offsets[-1]),), dtype=np.int8, buffer=memory.buf)
+        lattices = [torch.from_numpy(spins[start:stop].astype(np.float32).reshape(shape))
+                    for start, stop, shape in zip(offsets[:-1], offsets[1:], shapes)]
+        del spins
+    finally:
+        memory.close()
+        memory.unlink()
+    return [{'params': params, 'lattice': lattice, 'observables': summary}
+            for params, lattice, summary in zip(tasks, lattices, summaries)]
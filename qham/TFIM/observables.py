@@ -0,0 +1,234 @@
+import numpy as np
+
+class BinningAccumulator:
+    """
+    Accumulates a stream of measurements in constant memory and estimates their correlated error bar.
+
+    Each binning level ``l`` keeps Welford running moments of the means of consecutive blocks of ``2**l`` samples, and
+    at most one pending block per level waits for its partner. The error bar of the mean grows with the block size
+    until the blocks are longer than the autocorrelation time and then plateaus; the plateau is estimated from the
+    levels that still hold at least ``min_bins`` blocks. Values may be scalars or arrays, e.g. one entry per replica.
+
+    Attributes:
+        min_bins (int): The number of blocks a level needs before its error bar is trusted.
+        count (int): The number of measurements added so far.
+    """
+    def __init__(self, min_bins=32):
+        """
+        Initializes an empty accumulator.
+
+        Args:
+            min_bins (int): The number of blocks a level needs before its error bar is trusted. Defaults to 32.
+        """
+        self.min_bins = min_bins
+        self.count = 0
+        self._counts = []
+        self._means = []
+        self._m2 = []
+        self._pending = []
+
+    def add(self, value):
+        """
+        Adds one measurement.
+
+        Args:
+            value (float or array_like): The measured value, of the same shape for every call.
+        """
+        value = np.array(value, dtype=np.float64)
+        self.count += 1
+        level = 0
+        while True:
+            if level == len(self._counts):
+                self._counts.append(0)
+                self._means.append(np.zeros_like(value))
+                self._m2.append(np.zeros_like(value))
+                self._pending.append(None)
+            self._counts[level] += 1
+            delta = value - self._means[level]
+            self._means[level] = self._means[level] + delta / self._counts[level]
+            self._m2[level] = self._m2[level] + delta * (value - self._means[level])
+            if self._pending[level] is None:
+                self._pending[level] = value
+                return
+            value = (self._pending[level] + value) / 2
+            self._pending[level] = None
+            level += 1
+
+    @property
+    def mean(self):
+        """The mean of all measurements."""
+        if not self.count:
+            raise ValueError("no measurements have been added")
+        return self._means[0]
+
+    @property
+    def variance(self):
+        """The sample variance of the measurements."""
+        if self.count < 2:
+            return np.full(np.shape(self.mean), np.nan)
+        return self._m2[0] / (self.count - 1)
+
+    def level_errors(self):
+        """
+        Computes the error bar of the mean at every binning level with at least two blocks.
+
+        Returns:
+            list: The standard error estimated from blocks of ``2**l`` samples, indexed by ``l``.
+        """
+        return [np.sqrt(m2 / (n - 1) / n) for n, m2 in zip(self._counts, self._m2) if n >= 2]
+
+    def error(self):
+        """
+        Estimates the error bar of the mean, accounting for autocorrelations.
+
+        Returns:
+            float or numpy.ndarray: The largest error bar over the levels with at least ``min_bins`` blocks, or
+            ``inf`` while even the unbinned level has fewer than ``min_bins`` samples.
+        """
+        trusted = [error for n, error in zip(self._counts, self.level_errors()) if n >= self.min_bins]
+        if not trusted:
+            return np.full(np.shape(self.mean), np.inf)
+        return np.max(trusted, axis=0)
+
+    def tau_int(self):
+        """
+        Estimates the integrated autocorrelation time from the growth of the binned error bar.
+
+        Returns:
+            float or numpy.ndarray: ``(error / naive_error)**2 / 2``, which is 1/2 for uncorrelated samples.
+        """
+        naive = self.level_errors()[0] if self.count >= 2 else np.nan
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(naive > 0, (self.error() / naive)**2 / 2, 0.5)
+
+
+class TFIMObservables:
+    """
+    Streams the magnetization and energy of a ``TFIMSimulation`` and derives its thermodynamic observables.
+
+    Per measurement the absolute magnetization ``m = |sum_i s_i| / N`` and the energy per site ``e = E / N`` are fed
+    to ``BinningAccumulator`` objects together with ``m**2``, ``m**4`` and ``e**2``, from which the susceptibility
+    ``beta * N * (<m^2> - <m>^2)``, the specific heat ``beta^2 * N * (<e^2> - <e>^2)`` and the Binder cumulant
+    ``1 - <m^4> / (3 <m^2>^2)`` follow. All quantities hold one entry per replica when several temperatures are run.
+
+    Attributes:
+        num_sites (int): The number of lattice sites ``N``.
+        beta (numpy.ndarray): The inverse temperature of every replica.
+    """
+    MOMENTS = ('magnetization', 'magnetization2', 'magnetization4', 'energy', 'energy2')
+
+    def __init__(self, num_sites, beta, min_bins=32):
+        """
+        Initializes empty accumulators.
+
+        Args:
+            num_sites (int): The number of lattice sites.
+            beta (float or list): The inverse temperature, or one per replica.
+            min_bins (int): The number of blocks a binning level needs before its error bar is trusted. Defaults to 32.
+        """
+        self.num_sites = num_sites
+        self.beta = np.asarray(beta, dtype=np.float64)
+        self._accumulators = {name: BinningAccumulator(min_bins) for name in self.MOMENTS}
+
+    @property
+    def count(self):
+        """The number of measurements taken so far."""
+        return self._accumulators['energy'].count
+
+    def measure(self, simulation):
+        """
+        Records the current configuration of a simulation.
+
+        Args:
+            simulation (TFIMSimulation): The simulation to measure.
+        """
+        magnetization = simulation.magnetization().abs() / self.num_sites
+        energy = simulation.energy() / self.num_sites
+        self.add(magnetization.double().numpy(), energy.double().numpy())
+
+    def add(self, magnetization, energy):
+        """
+        Records one measurement.
+
+        Args:
+            magnetization (float or array_like): The absolute magnetization per site.
+            energy (float or array_like): The energy per site.
+        """
+        m = np.asarray(magnetization, dtype=np.float64)
+        e = np.asarray(energy, dtype=np.float64)
+        for name, value in zip(self.MOMENTS, (m, m**2, m**4, e, e**2)):
+            self._accumulators[name].add(value)
+
+    def mean(self, name):
+        """
+        Returns the running mean of a recorded moment, one of ``MOMENTS``.
+
+        Args:
+            name (str): The moment, e.g. ``'magnetization'`` or ``'energy'``.
+
+        Returns:
+            float or numpy.ndarray: The mean.
+        """
+        return self._accumulator(name).mean
+
+    def error(self, name):
+        """
+        Returns the binned error bar of the mean of a recorded moment.
+
+        Args:
+            name (str): The moment, e.g. ``'magnetization'`` or ``'energy'``.
+
+        Returns:
+            float or numpy.ndarray: The error bar, ``inf`` while too few measurements have been taken.
+        """
+        return self._accumulator(name).error()
+
+    def tau_int(self, name):
+        """
+        Returns the integrated autocorrelation time of a recorded moment, in units of measurements.
+
+        Args:
+            name (str): The moment, e.g. ``'magnetization'`` or ``'energy'``.
+
+        Returns:
+            float or numpy.ndarray: The autocorrelation time.
+        """
+        return self._accumulator(name).tau_int()
+
+    def _accumulator(self, name):
+        if name not in self._accumulators:
+            raise ValueError(f"unknown observable {name!r}, expected one of {self.MOMENTS}")
+        return self._accumulators[name]
+
+    def susceptibility(self):
+        """Returns the magnetic susceptibility ``beta * N * (<m^2> - <m>^2)``."""
+        return self.beta * self.num_sites * (self.mean('magnetization2') - self.mean('magnetization')**2)
+
+    def specific_heat(self):
+        """Returns the specific heat ``beta^2 * N * (<e^2> - <e>^2)``."""
+        return self.beta**2 * self.num_sites * (self.mean('energy2') - self.mean('energy')**2)
+
+    def binder_cumulant(self):
+        """Returns the Binder cumulant ``1 - <m^4> / (3 <m^2>^2)``."""
+        return 1 - self.mean('magnetization4') / (3 * self.mean('magnetization2')**2)
+
+    def summary(self):
+        """
+        Collects the current estimates.
+
+        Returns:
+            dict: The means and error bars of the magnetization and energy, their autocorrelation times, the
+            susceptibility, the specific heat and the Binder cumulant.
+        """
+        return {
+            'magnetization': self.mean('magnetization'),
+            'magnetization_error': self.error('magnetization'),
+            'magnetization_tau': self.tau_int('magnetization'),
+            'energy': self.mean('energy'),
+            'energy_error': self.error('energy'),
+            'energy_tau': self.tau_int('energy'),
+            'susceptibility': self.susceptibility(),
+            'specific_heat': self.specific_heat(),
+            'binder_cumulant': self.binder_cumulant(),
+            'count': self.count,
+        }
@@ -0,0 +1,218 @@
+import math
+
+import numpy as np
+import torch
+from qham.basis import popcount
+from qham.TFIM.tfim import TFIMSimulation
+
+WORD_BITS = 64
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+_EVEN_BITS = np.uint64(0x5555555555555555)
+_ODD_BITS = np.uint64(0xAAAAAAAAAAAAAAAA)
+
+
+class PackedLattice:
+    """
+    A square lattice of +1/-1 spins stored one bit per spin in uint64 words.
+
+    Row ``i`` occupies ``size // 64`` words and column ``j`` lives in bit ``j % 64`` of word ``j // 64``; a set bit
+    is a down spin (-1). Two spins are anti-aligned exactly where the XOR of their words is set, so neighbor
+    alignments of 64 sites are resolved by one bitwise operation and counted with ``popcount``.
+
+    Attributes:
+        words (numpy.ndarray): The ``(size, size // 64)`` uint64 words.
+        size (int): The width and height of the lattice.
+    """
+    def __init__(self, words):
+        """
+        Wraps packed words.
+
+        Args:
+            words (numpy.ndarray): A ``(size, size // 64)`` array of uint64 words.
+        """
+        self.words = np.ascontiguousarray(words, dtype=np.uint64)
+        self.size = self.words.shape[0]
+        if self.words.shape != (self.size, self.size // WORD_BITS) or self.size % WORD_BITS:
+            raise ValueError(f"expected a (size, size // {WORD_BITS}) array with size a multiple of {WORD_BITS}, "
+                             f"got shape {self.words.shape}")
+
+    @classmethod
+    def random(cls, size, rng):
+        """
+        Creates a lattice with independent random spins.
+
+        Args:
+            size (int): The width and height of the lattice, a multiple of 64.
+            rng (numpy.random.Generator): The random number generator.
+
+        Returns:
+            PackedLattice: The lattice.
+        """
+        return cls(rng.integers(0, _ALL_ONES, size=(size, size // WORD_BITS), dtype=np.uint64, endpoint=True))
+
+    @classmethod
+    def from_tensor(cls, lattice):
+        """
+        Packs a ``(size, size)`` tensor or array of +1/-1 spins.
+
+        Args:
+            lattice (torch.Tensor or numpy.ndarray): The spins.
+
+        Returns:
+            PackedLattice: The packed lattice.
+        """
+        down = np.asarray(lattice) < 0
+        packed = np.packbits(down, axis=-1, bitorder='little')
+        return cls(np.ascontiguousarray(packed).view('<u8'))
+
+    def numpy(self):
+        """
+        Unpacks the spins.
+
+        Returns:
+            numpy.ndarray: A ``(size, size)`` float32 array of +1/-1 spins.
+        """
+        bytes_ = self.words.astype('<u8').view(np.uint8)
+        down = np.unpackbits(bytes_, axis=-1, bitorder='little')
+        return 1 - 2 * down.astype(np.float32)
+
+    def to_tensor(self):
+        """
+        Unpacks the spins into the layout of ``TFIMSimulation.lattice``.
+
+        Returns:
+            torch.Tensor: A ``(size, size)`` float32 tensor of +1/-1 spins.
+        """
+        return torch.from_numpy(self.numpy())
+
+    def neighbor_words(self):
+        """
+        Shifts the lattice onto the four nearest neighbors of every site, with periodic boundaries.
+
+        Returns:
+            tuple: The words holding, at each site's bit, its down, up, right and left neighbor.
+        """
+        words = self.words
+        down = np.roll(words, -1, axis=0)
+        up = np.roll(words, 1, axis=0)
+        # Column j + 1 is the next bit, carried in from bit 0 of the next word at the end of a word
+        right = (words >> np.uint64(1)) | (np.roll(words, -1, axis=1) << np.uint64(WORD_BITS - 1))
+        left = (words << np.uint64(1)) | (np.roll(words, 1, axis=1) >> np.uint64(WORD_BITS - 1))
+        return down, up, right, left
+
+    def magnetization(self):
+        """Returns the total magnetization ``sum_i s_i``."""
+        return self.size * self.size - 2 * int(popcount(self.words).sum())
+
+    def energy(self):
+        """Returns the Ising energy ``-sum_<ij> s_i s_j``, counting every bond once."""
+        down, _, right, _ = self.neighbor_words()
+        anti_aligned = int(popcount(self.words ^ down).sum() + popcount(self.words ^ right).sum())
+        return 2 * anti_aligned - 2 * self.size * self.size
+
+    def sublattice_mask(self, color):
+        """
+        Selects one checkerboard sublattice.
+
+        Args:
+            color (int): 0 for the sites with even ``i + j``, 1 for the others.
+
+        Returns:
+            numpy.ndarray: A ``(size, 1)`` column of words that broadcasts over the lattice.
+        """
+        odd_rows = (np.arange(self.size) + color) % 2 == 1
+        return np.where(odd_rows, _ODD_BITS, _EVEN_BITS).astype(np.uint64).reshape(-1, 1)
+
+
+class PackedTFIMSimulation(TFIMSimulation):
+    """
+    A ``TFIMSimulation`` whose lattice is a ``PackedLattice``, for lattices too large for one float per spin.
+
+    The lattice uses 1 bit per spin instead of 32 and the checkerboard Metropolis sweep runs on whole words: the four
+    neighbor XORs are reduced with bit-sliced adder logic to the masks of sites with no and with exactly one
+    anti-aligned neighbor, the only flips that are not always accepted, and random bits with the acceptance
+    probabilities are drawn 64 at a time. Only a single scalar ``beta`` and lattice sizes that are multiples of 64
+    are supported. ``lattice.numpy()`` and ``lattice.to_tensor()`` unpack the spins, e.g. for ``plot_lattice``.
+
+    Attributes:
+        rng (numpy.random.Generator): The generator of the random bits.
+    """
+    CHECKPOINT_STATE = TFIMSimulation.CHECKPOINT_STATE + ('rng',)
+
+    def __init__(self, size=64, beta=0.4, h=0.05, steps=100, seed=None):
+        """
+        Initializes the simulation with a random packed lattice.
+
+        Args:
+            size (int): The width and height of the lattice, a multiple of 64. Defaults to 64.
+            beta (float): The inverse temperature. Defaults to 0.4.
+            h (float): The transverse field strength. Defaults to 0.05.
+            steps (int): The number of Monte Carlo steps. Defaults to 100.
+            seed (int, optional): Seeds the random bits. Defaults to a seed drawn from the torch generator, so
+                ``torch.manual_seed`` makes runs reproducible.
+        """
+        if size % WORD_BITS:
+            raise ValueError(f"the packed lattice needs a size that is a multiple of {WORD_BITS}, got {size}")
+        if torch.as_tensor(beta).dim() != 0:
+            raise ValueError("the packed lattice supports a single scalar beta")
+        if seed is None:
+            seed = torch.randint(2**62, (1,)).item()
+        self.rng = np.random.default_rng(seed)
+        super().__init__(size, beta, h, steps, update='checkerboard', exchange_interval=0)
+
+    def initialize_lattice(self):
+        """Initialize the packed lattice to a random state with spins up or down."""
+        return PackedLattice.random(self.size, self.rng)
+
+    def random_bits(self, probability, shape):
+        """
+        Draws words whose bits are independently set with the given probability.
+
+        Every bit compares a random binary fraction with ``probability`` from the most significant digit down; a
+        bit is decided at the first digit where the two differ, so all bits are settled after a few dozen words.
+
+        Args:
+            probability (float): The probability of a set bit.
+            shape (tuple): The shape of the array of words.
+
+        Returns:
+            numpy.ndarray: The random words.
+        """
+        result = np.zeros(shape, dtype=np.uint64)
+        undecided = np.full(shape, _ALL_ONES)
+        for _ in range(53):
+            if probability <= 0 or not undecided.any():
+                break
+            probability *= 2
+            digit = probability >= 1
+            probability -= digit
+            uniform = self.rng.integers(0, _ALL_ONES, size=shape, dtype=np.uint64, endpoint=True)
+            if digit:
+                result |= undecided & ~uniform
+                undecided &= uniform
+            else:
+                undecided &= ~uniform
+        return result
+
+    def checkerboard_step(self):
+        """Perform one sweep that updates every site of one sublattice at once, then the other, on packed words."""
+        p_one = math.exp(-4 * float(self.beta))
+        words = self.lattice.words
+        for color in (0, 1):
+            a, b, c, d = (words ^ neighbor for neighbor in self.lattice.neighbor_words())
+            any_anti = a | b | c | d
+            # An odd count without an anti-aligned pair among (a, b) or (c, d) is exactly one
+            one_anti = (a ^ b ^ c ^ d) & ~((a & b) | (c & d))
+            first = self.random_bits(p_one, words.shape)
+            second = self.random_bits(p_one, words.shape)
+            accept = (any_anti & ~one_anti) | (one_anti & first) | (~any_anti & first & second)
+            field = self.random_bits(self.h, words.shape)
+            words ^= self.lattice.sublattice_mask(color) & (accept ^ field)
+
+    def magnetization(self):
+        """Return the total magnetization ``sum_i s_i`` of the lattice."""
+        return torch.tensor(float(self.lattice.magnetization()))
+
+    def energy(self):
+        """Return the Ising energy ``-sum_<ij> s_i s_j`` of the lattice."""
+        return torch.tensor(float(self.lattice.energy()))
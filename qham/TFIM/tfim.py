@@ -1,5 +1,9 @@
+import inspect
+
 import torch
-import matplotlib.pyplot as plt
+from qham.instrumentation import instrumented, simulation_metrics
+from qham.TFIM.cluster import swendsen_wang_update, wolff_update
+from qham.TFIM.observables import TFIMObservables
 
 class TFIMSimulation:
     
@@ -7,34 +11,103 @@ class TFIMSimulation:
 
     Attributes:
         size (int): The width and height of the square lattice.
-        beta (float): The inverse temperature parameter for the simulation.
+        beta (float or list): The inverse temperature parameter, or one inverse temperature per replica.
         h (float): The transverse field strength applied to the system.
         steps (int): The number of Monte Carlo steps to perform in the simulation.
-        lattice (torch.Tensor): The lattice representing the spins, initialized randomly.
+        update (str): The update scheme used by each step, ``'random'``, ``'checkerboard'``, ``'wolff'`` or ``'swendsen-wang'``.
+        num_replicas (int or None): The number of replicas, or None for a single lattice at a scalar ``beta``.
+        exchange_interval (int): The number of steps between replica-exchange attempts; 0 disables them.
+        lattice (torch.Tensor): The lattice representing the spins, initialized randomly, with shape
+            ``(size, size)`` or ``(num_replicas, size, size)``.
+        exchange_attempts (torch.Tensor): The number of attempted swaps between each pair of neighboring temperatures.
+        exchange_accepted (torch.Tensor): The number of accepted swaps between each pair of neighboring temperatures.
+        observables (TFIMObservables or None): The streaming measurements of the last measured run.
+        completed_steps (int): The number of steps performed by the last ``run_simulation``.
 
     """
 
-    def __init__(self, size=10, beta=0.4, h=0.05, steps=100):
+    UPDATES = ('random', 'checkerboard', 'wolff', 'swendsen-wang')
+    OBSERVABLES = TFIMObservables
+    CHECKPOINT_STATE = ('observables', 'exchange_attempts', 'exchange_accepted', '_exchange_offset')
+
+    def __init__(self, size=10, beta=0.4, h=0.05, steps=100, update='random', exchange_interval=1):
         """Initialize the simulation with the given parameters.
 
+        Passing a sequence of inverse temperatures as ``beta`` creates one replica per temperature. All replicas are
+        updated in lockstep and configurations of neighboring temperatures are swapped by parallel tempering.
+
         Args:
             size (int): The lattice size. Defaults to 10.
-            beta (float): The inverse temperature parameter. Defaults to 0.4.
+            beta (float or list): The inverse temperature parameter, or one per replica. Defaults to 0.4.
             h (float): The transverse field strength. Defaults to 0.05.
             steps (int): The number of simulation steps. Defaults to 100.
+            update (str): ``'random'`` visits randomly chosen sites one at a time; ``'checkerboard'`` updates
+                each sublattice of the (even-sized) lattice at once with whole-tensor operations; ``'wolff'`` and
+                ``'swendsen-wang'`` flip whole clusters, which avoids critical slowing down. Defaults to ``'random'``,
+                or ``'checkerboard'`` when several replicas are simulated.
+            exchange_interval (int): The number of steps between replica-exchange attempts; 0 disables them. Defaults to 1.
         """        
+        self.num_replicas = None if torch.as_tensor(beta).dim() == 0 else len(beta)
+        if self.num_replicas is not None and update == 'random':
+            update = 'checkerboard'
+        if update not in self.UPDATES:
+            raise ValueError(f"update must be one of {self.UPDATES}, got {update!r}")
+        if update == 'checkerboard' and size % 2:
+            raise ValueError(f"the checkerboard update needs an even lattice size, got {size}")
         self.size = size
         self.beta = beta
         self.h = h
         self.steps = steps
+        self.update = update
+        self.exchange_interval = exchange_interval
         self.lattice = self.initialize_lattice()
+        self.observables = None
+        self.completed_steps = 0
+        num_pairs = max((self.num_replicas or 1) - 1, 0)
+        self.exchange_attempts = torch.zeros(num_pairs, dtype=torch.long)
+        self.exchange_accepted = torch.zeros(num_pairs, dtype=torch.long)
+        self._exchange_offset = 0
+        self._sublattices = None
+
+    @classmethod
+    def lattice_shape(cls, **params):
+        """
+        Computes the shape of the lattice tensor without building the simulation.
+
+        Args:
+            **params: The keyword arguments of the constructor; missing ones take their defaults.
+
+        Returns:
+            tuple: The shape of the lattice as a tensor.
+        """
+        arguments = cls._constructor_arguments(params)
+        size, beta = arguments['size'], arguments['beta']
+        return (size, size) if torch.as_tensor(beta).dim() == 0 else (len(beta), size, size)
+
+    @classmethod
+    def _constructor_arguments(cls, params):
+        bound = inspect.signature(cls.__init__).bind(None, **params)
+        bound.apply_defaults()
+        return bound.arguments
+
+    @property
+    def betas(self):
+        """The inverse temperatures as a tensor, a scalar or one entry per replica."""
+        return torch.as_tensor(self.beta, dtype=torch.float32)
 
     def initialize_lattice(self):
         """Initialize the lattice to a random state with spins up or down."""        
-        return torch.randint(2, (self.size, self.size), dtype=torch.float32) * 2 - 1
+        shape = (self.size, self.size) if self.num_replicas is None else (self.num_replicas, self.size, self.size)
+        return torch.randint(2, shape, dtype=torch.float32) * 2 - 1
 
     def tfim_step(self):
-        """Perform a single Monte Carlo step of the TFIM simulation."""        
+        """Perform a single Monte Carlo step of the TFIM simulation using the configured update."""        
+        if self.update == 'checkerboard':
+            self.checkerboard_step()
+            return
+        if self.update in ('wolff', 'swendsen-wang'):
+            self.cluster_step()
+            return
         for _ in range(self.lattice.numel()):
             i, j = torch.randint(0, self.lattice.shape[0], (1,)).item(), torch.randint(0, self.lattice.shape[1], (1,)).item()
             S = self.lattice[i, j]
@@ -48,15 +121,149 @@ class TFIMSimulation:
             if torch.rand(1).item() < self.h:
                 self.lattice[i, j] *= -1
 
-    def run_simulation(self):
-        """Run the simulation for the specified number of steps."""        
-        for _ in range(self.steps):
+    def acceptance_table(self):
+        """Return the Metropolis acceptance probabilities for the five possible energy changes -8, -4, 0, 4 and 8.
+
+        With replicas the table has one row per inverse temperature.
+        """
+        deltaE = torch.arange(-8, 9, 4, dtype=torch.float32)
+        return torch.clamp(torch.exp(-self.betas.unsqueeze(-1) * deltaE), max=1.0)
+
+    def checkerboard_step(self):
+        """Perform one sweep that updates every site of one sublattice at once, then the other.
+
+        Neighbor sums come from ``torch.roll`` on the periodic lattice, acceptance probabilities are looked up in
+        ``acceptance_table`` and random numbers are drawn for the whole lattice in bulk.
+        """
+        table = self.acceptance_table()
+        if self.num_replicas is not None:
+            replicas = torch.arange(self.num_replicas).view(-1, 1, 1)
+        if self._sublattices is None:
+            parity = (torch.arange(self.size).view(-1, 1) + torch.arange(self.size)) % 2
+            self._sublattices = [parity == color for color in (0, 1)]
+        for sublattice in self._sublattices:
+            deltaE = 2 * self.lattice * self.neighbor_sum()
+            index = ((deltaE + 8) / 4).long()
+            probability = table[index] if self.num_replicas is None else table[replicas, index]
+            accept = torch.rand(self.lattice.shape) < probability
+            flip = sublattice & (accept ^ (torch.rand(self.lattice.shape) < self.h))
+            self.lattice = torch.where(flip, -self.lattice, self.lattice)
+
+    def cluster_step(self):
+        """Perform one cluster-update step followed by the transverse-field flips.
+
+        A ``'wolff'`` step flips single clusters until as many spins as the lattice holds have been flipped, so one
+        step costs about as much as a sweep; a ``'swendsen-wang'`` step decomposes the whole lattice into clusters once.
+        Each replica is updated at its own temperature.
+        """
+        lattices = self.lattice.unsqueeze(0) if self.num_replicas is None else self.lattice
+        betas = self.betas.reshape(-1)
+        updated = []
+        for lattice, beta in zip(lattices, betas):
+            if self.update == 'wolff':
+                flipped = 0
+                while flipped < lattice.numel():
+                    lattice, cluster_size = wolff_update(lattice, beta)
+                    flipped += cluster_size
+            else:
+                lattice, _ = swendsen_wang_update(lattice, beta)
+            updated.append(lattice)
+        lattice = torch.stack(updated)
+        lattice = torch.where(torch.rand(lattice.shape) < self.h, -lattice, lattice)
+        self.lattice = lattice[0] if self.num_replicas is None else lattice
+
+    def neighbor_sum(self):
+        """Return the sum of the four nearest-neighbor spins of every site on the periodic lattice."""
+        return torch.roll(self.lattice, 1, -2) + torch.roll(self.lattice, -1, -2) + \
+               torch.roll(self.lattice, 1, -1) + torch.roll(self.lattice, -1, -1)
+
+    def magnetization(self):
+        """Return the total magnetization ``sum_i s_i`` of the lattice, one value per replica."""
+        return self.lattice.sum(dim=(-2, -1))
+
+    def energy(self):
+        """Return the Ising energy ``-sum_<ij> s_i s_j`` of the lattice, one value per replica."""
+        bonds = self.lattice * (torch.roll(self.lattice, 1, -2) + torch.roll(self.lattice, 1, -1))
+        return -bonds.sum(dim=(-2, -1))
+
+    def replica_exchange(self):
+        """Attempt parallel-tempering swaps between neighboring temperatures.
+
+        Pairs ``(r, r + 1)`` starting at an alternating even or odd offset are swapped with probability
+        ``min(1, exp((beta_r - beta_{r+1}) * (E_r - E_{r+1})))``. The configurations move while the temperatures
+        stay attached to their replica slots.
+        """
+        if self.num_replicas is None or self.num_replicas < 2:
+            return
+        first = torch.arange(self._exchange_offset, self.num_replicas - 1, 2)
+        self._exchange_offset = 1 - self._exchange_offset
+        energies = self.energy()
+        betas = self.betas
+        log_ratio = (betas[first] - betas[first + 1]) * (energies[first] - energies[first + 1])
+        accepted = torch.rand(first.shape) < torch.exp(torch.clamp(log_ratio, max=0.0))
+        self.exchange_attempts[first] += 1
+        self.exchange_accepted[first[accepted]] += 1
+        order = torch.arange(self.num_replicas)
+        swapped = first[accepted]
+        order[swapped], order[swapped + 1] = swapped + 1, swapped
+        self.lattice = self.lattice[order]
+
+    @instrumented(simulation_metrics)
+    def run_simulation(self, measure=False, thermalization=0, target_error=None, target='energy', checkpoint=None,
+                       checkpoint_interval=100, snapshot_interval=0):
+        """Run the simulation for the specified number of steps.
+
+        When measuring, the magnetization and energy are streamed into ``observables`` after every step past the
+        thermalization, so no configurations are stored. Repeated measured runs keep accumulating into the same
+        ``observables``.
+
+        With a ``checkpoint`` the run first resumes from the state saved there, if any, and saves its state every
+        ``checkpoint_interval`` steps and when it ends, so an interrupted run can be continued bitwise-exactly.
+
+        Args:
+            measure (bool): Whether to record observables. Defaults to False.
+            thermalization (int): The number of initial steps that are not measured. Defaults to 0.
+            target_error (float, optional): Ends the run early once the error bar of ``target`` is below this value
+                for every replica; implies ``measure``. ``steps`` stays the upper limit.
+            target (str): The observable the stopping rule watches, one of ``TFIMObservables.MOMENTS``.
+                Defaults to ``'energy'``.
+            checkpoint (Checkpoint, optional): Where to save and resume the state of the run.
+            checkpoint_interval (int): The number of steps between checkpoints. Defaults to 100.
+            snapshot_interval (int): The number of steps between lattice snapshots appended to the checkpoint's
+                time series; 0 disables them. Defaults to 0.
+
+        Returns:
+            TFIMObservables or None: The accumulated observables when measuring.
+        """
+        start = checkpoint.restore(self) if checkpoint is not None and checkpoint.exists() else 0
+        measure = measure or target_error is not None
+        if measure and self.observables is None:
+            self.observables = self.OBSERVABLES(self.size * self.size, self.beta)
+        self.completed_steps = 0
+        for step in range(start, self.steps):
             self.tfim_step()
+            self.completed_steps += 1
+            if self.exchange_interval and (step + 1) % self.exchange_interval == 0:
+                self.replica_exchange()
+            if checkpoint is not None and snapshot_interval and (step + 1) % snapshot_interval == 0:
+                checkpoint.append_snapshot(self)
+            if measure and step >= thermalization:
+                self.observables.measure(self)
+                if target_error is not None and (self.observables.error(target) <= target_error).all():
+                    break
+            if checkpoint is not None and (step + 1) % checkpoint_interval == 0:
+                checkpoint.save(self, step + 1)
+        if checkpoint is not None:
+            checkpoint.save(self, self.steps)
+        return self.observables if measure else None
+
+    def plot_lattice(self, replica=0):
+        """Plot the current state of the lattice, or of one replica."""        
+        import matplotlib.pyplot as plt
 
-    def plot_lattice(self):
-        """Plot the current state of the lattice."""        
+        lattice = self.lattice if self.num_replicas is None else self.lattice[replica]
         plt.figure(figsize=(5, 5))
-        plt.imshow(self.lattice.numpy(), cmap='coolwarm')
+        plt.imshow(lattice.numpy(), cmap='coolwarm')
         plt.colorbar(label='Spin')
         plt.title('TFIM Lattice Configuration')
         plt.show()
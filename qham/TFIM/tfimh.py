@@ -0,0 +1,34 @@
+import numpy as np
+import scipy.sparse as sp
+
+def create_tfim_hamiltonian(n_qubits, J=1.0, h=1.0, periodic_boundary=False):
+    """
+    Create the Hamiltonian of the transverse field Ising chain, ``H = -J * sum Z_i Z_{i+1} - h * sum X_i``.
+
+    Qubit ``q`` is stored in bit ``q`` of the basis index, the ordering used by Qiskit, so states can be compared
+    directly with those of ``create_tfim_circuit``. One layer of that circuit approximates ``exp(-1j * dt * H)``
+    for ``theta_z = -2 * J * dt`` and ``theta_x = -2 * h * dt``.
+
+    Args:
+        n_qubits (int): Number of qubits (spins) in the chain.
+        J (float): The ZZ coupling strength. Defaults to 1.0.
+        h (float): The transverse field strength. Defaults to 1.0.
+        periodic_boundary (bool): If True, couples the last and first qubits as ``create_tfim_circuit`` does.
+
+    Returns:
+        scipy.sparse.csr_matrix: The float64 Hamiltonian matrix.
+    """
+    dim = 2**n_qubits
+    states = np.arange(dim, dtype=np.int64)
+    bonds = [(i, i + 1) for i in range(n_qubits - 1)]
+    if periodic_boundary and n_qubits > 2:
+        bonds.append((n_qubits - 1, 0))
+
+    diagonal = np.zeros(dim)
+    for i, j in bonds:
+        diagonal -= J * (1 - 2 * (((states >> i) ^ (states >> j)) & 1))
+    rows = [states] + [states] * n_qubits
+    cols = [states] + [states ^ (1 << q) for q in range(n_qubits)]
+    data = [diagonal] + [np.full(dim, -h)] * n_qubits
+    H = sp.coo_matrix((np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))), shape=(dim, dim))
+    return H.tocsr()
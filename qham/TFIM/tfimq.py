@@ -1,6 +1,10 @@
-from qiskit import QuantumCircuit
+from functools import lru_cache
 
-def create_tfim_circuit(n_qubits, theta_z, theta_x, periodic_boundary=False):
+from qham.instrumentation import circuit_metrics, instrumented
+
+
+@instrumented(circuit_metrics)
+def create_tfim_circuit(n_qubits, theta_z, theta_x, periodic_boundary=False, trotter_steps=1):
     """
     Create a quantum circuit representing the Transverse Field Ising Model (TFIM).
 
@@ -9,30 +13,91 @@ def create_tfim_circuit(n_qubits, theta_z, theta_x, periodic_boundary=False):
         theta_z (float): Parameter for ZZ interaction strength.
         theta_x (float): Parameter for transverse field strength.
         periodic_boundary (bool): If True, applies periodic boundary conditions.
+        trotter_steps (int): Number of Trotter layers. Defaults to 1.
 
     Returns:
         QuantumCircuit: The constructed quantum circuit representing the TFIM.
     """
+    from qiskit import QuantumCircuit
+
     qc = QuantumCircuit(n_qubits)
     
-    # Add ZZ interactions
-    for i in range(n_qubits - 1):
-        qc.cx(i, i + 1)
-        qc.rz(theta_z, i + 1)
-        qc.cx(i, i + 1)
+    for _ in range(trotter_steps):
+        # Add ZZ interactions
+        for i in range(n_qubits - 1):
+            qc.cx(i, i + 1)
+            qc.rz(theta_z, i + 1)
+            qc.cx(i, i + 1)
+        
+        # Apply periodic boundary conditions if specified
+        if periodic_boundary and n_qubits > 2:
+            qc.cx(n_qubits - 1, 0)
+            qc.rz(theta_z, 0)
+            qc.cx(n_qubits - 1, 0)
+        
+        # Add transverse field interactions
+        for i in range(n_qubits):
+            qc.rx(theta_x, i)
     
-    # Apply periodic boundary conditions if specified
+    return qc
+
+def tfim_circuit_template(n_qubits, periodic_boundary=False, trotter_steps=1):
+    """
+    Create a parameterized TFIM circuit from a template memoized per ``(n_qubits, periodic_boundary, trotter_steps)``.
+
+    Every Trotter layer applies native ``rzz(theta_z)`` gates to the bonds of the chain, each equivalent to the
+    CX-RZ-CX sandwich of ``create_tfim_circuit`` with one two-qubit gate instead of two, followed by ``rx(theta_x)``
+    on every qubit. The angles are the Qiskit ``Parameter`` objects ``theta_z`` and ``theta_x``, so a sweep builds
+    (and transpiles) the template once and only binds values per point. Every call returns a copy of the memoized
+    circuit, so callers may extend it in place without affecting later calls.
+
+    Args:
+        n_qubits (int): Number of qubits (spins) in the chain.
+        periodic_boundary (bool): If True, applies periodic boundary conditions.
+        trotter_steps (int): Number of Trotter layers. Defaults to 1.
+
+    Returns:
+        QuantumCircuit: The parameterized circuit.
+    """
+    return _cached_tfim_template(n_qubits, periodic_boundary, trotter_steps).copy()
+
+@lru_cache(maxsize=64)
+def _cached_tfim_template(n_qubits, periodic_boundary, trotter_steps):
+    # Shared between callers, so it is only ever copied or bound, never handed out
+    from qiskit.circuit import Parameter, QuantumCircuit
+
+    theta_z = Parameter('theta_z')
+    theta_x = Parameter('theta_x')
+    bonds = [(i, i + 1) for i in range(n_qubits - 1)]
     if periodic_boundary and n_qubits > 2:
-        qc.cx(n_qubits - 1, 0)
-        qc.rz(theta_z, 0)
-        qc.cx(n_qubits - 1, 0)
-    
-    # Add transverse field interactions
-    for i in range(n_qubits):
-        qc.rx(theta_x, i)
-    
+        bonds.append((n_qubits - 1, 0))
+    qc = QuantumCircuit(n_qubits)
+    for _ in range(trotter_steps):
+        for i, j in bonds:
+            qc.rzz(theta_z, i, j)
+        for i in range(n_qubits):
+            qc.rx(theta_x, i)
     return qc
 
+@instrumented(circuit_metrics)
+def bind_tfim_circuit(n_qubits, theta_z, theta_x, periodic_boundary=False, trotter_steps=1):
+    """
+    Create a TFIM circuit with numeric angles by binding the cached template of ``tfim_circuit_template``.
+
+    Args:
+        n_qubits (int): Number of qubits (spins) in the chain.
+        theta_z (float): Angle of the ZZ rotations.
+        theta_x (float): Angle of the transverse-field rotations.
+        periodic_boundary (bool): If True, applies periodic boundary conditions.
+        trotter_steps (int): Number of Trotter layers. Defaults to 1.
+
+    Returns:
+        QuantumCircuit: The bound circuit.
+    """
+    template = _cached_tfim_template(n_qubits, periodic_boundary, trotter_steps)
+    values = {parameter.name: parameter for parameter in template.parameters}
+    return template.assign_parameters({values['theta_z']: theta_z, values['theta_x']: theta_x})
+
 # Enhanced usage example with periodic boundary conditions
 # n_qubits = 4
 # theta_z = 1.0
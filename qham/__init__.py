@@ -1,24 +1,26 @@
 # qham/__init__.py
 
-__all__ = [
-    'HubbardModel',
+# Submodules are imported on first use (PEP 562), so `import qham` does not load torch, scipy, matplotlib or qiskit
+from qham._lazy import lazy_exports
 
-    'HeisenbergModel',
-    'create_heisenberg_circuit',
-    'SquareLattice',
-    'SquareLatticeMatrix',
+_EXPORTS = {
+    'HubbardModel': 'qham.FHM.fhm',
 
-    'QuantumHarmonicOscillator',
+    'HeisenbergModel': 'qham.HBM.hmb',
+    'create_heisenberg_circuit': 'qham.HBM.hmbq',
+    'SquareLattice': 'qham.HBM.hmbslq',
+    'SquareLatticeMatrix': 'qham.HBM.hmbsmlq',
 
-    'TFIMSimulation',
-    'create_tfim_circuit',
-]
+    'QuantumHarmonicOscillator': 'qham.QHO.qho',
+    'CoupledOscillators': 'qham.QHO.multimode',
 
-from qham.FHM.fhm import HubbardModel
-from qham.HBM.hmb import HeisenbergModel
-from qham.HBM.hmbq import create_heisenberg_circuit
-from qham.HBM.hmbslq import SquareLattice
-from qham.HBM.hmbsmlq import SquareLatticeMatrix
-from qham.QHO.qho import QuantumHarmonicOscillator
-from qham.TFIM.tfim import TFIMSimulation
-from qham.TFIM.tfimq import create_tfim_circuit
\ No newline at end of file
+    'TFIMSimulation': 'qham.TFIM.tfim',
+    'create_tfim_circuit': 'qham.TFIM.tfimq',
+    'tfim_circuit_template': 'qham.TFIM.tfimq',
+    'bind_tfim_circuit': 'qham.TFIM.tfimq',
+    'create_tfim_hamiltonian': 'qham.TFIM.tfimh',
+}
+
+__all__ = list(_EXPORTS)
+
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
\ No newline at end of file
@@ -0,0 +1,34 @@
+import importlib
+import importlib.util
+
+
+def lazy_exports(package, exports):
+    """
+    Creates the PEP 562 module hooks that import a package's exports on first access.
+
+    Importing a package then only costs the import of the package itself; each submodule (and the torch, scipy,
+    matplotlib or qiskit imports it pulls in) is loaded when one of its names is first used, and cached in the
+    package's namespace so later lookups bypass the hook. Submodules and subpackages, e.g. ``qham.TFIM``, are
+    imported on attribute access as well.
+
+    Args:
+        package (str): The ``__name__`` of the package.
+        exports (dict): Maps every exported name to the module that defines it.
+
+    Returns:
+        tuple: The ``__getattr__`` and ``__dir__`` functions of the package.
+    """
+    def __getattr__(name):
+        if name in exports:
+            value = getattr(importlib.import_module(exports[name]), name)
+        elif not name.startswith('_') and importlib.util.find_spec(f"{package}.{name}") is not None:
+            value = importlib.import_module(f"{package}.{name}")
+        else:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(vars(importlib.import_module(package))) | set(exports))
+
+    return __getattr__, __dir__
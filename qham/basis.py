@@ -0,0 +1,105 @@
+import numpy as np
+from math import comb
+
+
+def binomial_table(n):
+    """
+    Builds a table of binomial coefficients.
+
+    Args:
+        n (int): The largest upper index of the table.
+
+    Returns:
+        numpy.ndarray: An ``(n + 1, n + 1)`` integer array whose entry ``[i, j]`` is ``C(i, j)`` (zero for ``j > i``).
+    """
+    table = np.zeros((n + 1, n + 1), dtype=np.int64)
+    for i in range(n + 1):
+        for j in range(i + 1):
+            table[i, j] = comb(i, j)
+    return table
+
+
+def popcount(states):
+    """
+    Counts the set bits of every integer in an array.
+
+    Args:
+        states (array_like): Non-negative integers below ``2**63``.
+
+    Returns:
+        numpy.ndarray: The number of set bits of each entry.
+    """
+    x = np.asarray(states).astype(np.uint64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+def rank_states(states, num_bits, table=None):
+    """
+    Maps bit strings with a fixed number of set bits to their index in the combinatorial number system.
+
+    The rank of a state whose set bits are at positions ``c_1 < c_2 < ... < c_k`` is ``sum_j C(c_j, j)``,
+    so the states of a sector are numbered ``0 .. C(num_bits, k) - 1`` in increasing integer order.
+
+    Args:
+        states (array_like): Integers whose lowest ``num_bits`` bits encode the occupations.
+        num_bits (int): The number of bits (modes) in each state.
+        table (numpy.ndarray, optional): A precomputed ``binomial_table(num_bits)``.
+
+    Returns:
+        numpy.ndarray: The rank of each state.
+    """
+    if table is None:
+        table = binomial_table(num_bits)
+    states = np.asarray(states, dtype=np.int64)
+    rank = np.zeros(states.shape, dtype=np.int64)
+    count = np.zeros(states.shape, dtype=np.int64)
+    for pos in range(num_bits):
+        bit = (states >> pos) & 1
+        count += bit
+        rank += bit * table[pos, count]
+    return rank
+
+
+def unrank_states(ranks, num_bits, num_set, table=None):
+    """
+    Inverse of ``rank_states``: maps combinatorial ranks back to bit strings.
+
+    Args:
+        ranks (array_like): Ranks in ``0 .. C(num_bits, num_set) - 1``.
+        num_bits (int): The number of bits (modes) in each state.
+        num_set (int): The number of set bits in each state.
+        table (numpy.ndarray, optional): A precomputed ``binomial_table(num_bits)``.
+
+    Returns:
+        numpy.ndarray: The bit strings as integers.
+    """
+    if table is None:
+        table = binomial_table(num_bits)
+    remainder = np.array(ranks, dtype=np.int64)
+    remaining = np.full(remainder.shape, num_set, dtype=np.int64)
+    states = np.zeros(remainder.shape, dtype=np.int64)
+    for pos in reversed(range(num_bits)):
+        threshold = table[pos, remaining]
+        take = (remaining > 0) & (remainder >= threshold)
+        states |= take.astype(np.int64) << pos
+        remainder -= np.where(take, threshold, 0)
+        remaining -= take
+    return states
+
+
+def combination_states(num_bits, num_set):
+    """
+    Enumerates all bit strings of a given length with a fixed number of set bits.
+
+    Args:
+        num_bits (int): The number of bits (modes).
+        num_set (int): The number of set bits.
+
+    Returns:
+        numpy.ndarray: The ``C(num_bits, num_set)`` states in increasing order, so that ``states[r]`` has rank ``r``.
+    """
+    table = binomial_table(num_bits)
+    return unrank_states(np.arange(table[num_bits, num_set]), num_bits, num_set, table)
@@ -0,0 +1,122 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import eigh_tridiagonal
+from scipy.sparse.linalg import LinearOperator, aslinearoperator
+
+
+def _as_operator(hamiltonian):
+    if hasattr(hamiltonian, 'as_linear_operator'):
+        return hamiltonian.as_linear_operator()
+    return aslinearoperator(hamiltonian)
+
+
+def krylov_expm_multiply(hamiltonian, psi, dt, krylov_dim=20, tol=1e-10):
+    """
+    Computes ``exp(-1j * dt * H) @ psi`` in a Lanczos (Krylov) subspace without forming ``exp(-1j * dt * H)``.
+
+    The step is split into smaller substeps whenever the Lanczos error estimate exceeds ``tol``, so memory stays at
+    ``krylov_dim`` vectors regardless of ``dt``.
+
+    Args:
+        hamiltonian: A Hermitian ``LinearOperator``, sparse or dense matrix, or a qham model with ``as_linear_operator()``.
+        psi (numpy.ndarray): The state to propagate.
+        dt (float): The time step.
+        krylov_dim (int): The maximum dimension of the Krylov subspace. Defaults to 20.
+        tol (float): The tolerated error per step. Defaults to 1e-10.
+
+    Returns:
+        numpy.ndarray: The propagated state.
+    """
+    operator = _as_operator(hamiltonian)
+    psi = np.asarray(psi, dtype=np.complex128).reshape(-1)
+    remaining = dt
+    substep = dt
+    while remaining != 0:
+        substep = remaining if abs(substep) > abs(remaining) else substep
+        propagated, error = _lanczos_step(operator, psi, substep, krylov_dim)
+        if error > tol and abs(substep) > abs(dt) * 1e-8:
+            substep /= 2
+            continue
+        psi = propagated
+        remaining -= substep
+    return psi
+
+
+def _lanczos_step(operator, psi, dt, krylov_dim):
+    """Propagates ``psi`` by ``dt`` in a Krylov subspace and returns the result with an error estimate."""
+    norm = np.linalg.norm(psi)
+    if norm == 0:
+        return psi.copy(), 0.0
+    m = min(krylov_dim, psi.size)
+    basis = np.empty((m, psi.size), dtype=np.complex128)
+    alpha = np.zeros(m)
+    beta = np.zeros(m)
+    basis[0] = psi / norm
+    size = m
+    for j in range(m):
+        w = operator.matvec(basis[j]).reshape(-1).astype(np.complex128)
+        alpha[j] = np.vdot(basis[j], w).real
+        # Full reorthogonalization keeps the small basis numerically orthonormal
+        w -= basis[:j + 1].T @ (basis[:j + 1].conj() @ w)
+        beta[j] = np.linalg.norm(w)
+        if beta[j] < 1e-12 * max(1.0, abs(alpha[j])):
+            size = j + 1
+            beta[j] = 0.0
+            break
+        if j + 1 < m:
+            basis[j + 1] = w / beta[j]
+    eigenvalues, eigenvectors = eigh_tridiagonal(alpha[:size], beta[:size - 1])
+    coefficients = eigenvectors @ (np.exp(-1j * dt * eigenvalues) * eigenvectors[0])
+    error = norm * beta[size - 1] * abs(coefficients[-1])
+    return norm * (basis[:size].T @ coefficients), error
+
+
+def expectation(operator, psi):
+    """
+    Computes the expectation value ``<psi|O|psi>`` of a Hermitian operator.
+
+    Args:
+        operator: A callable ``f(psi)``, a ``LinearOperator``, a sparse or dense matrix, or a qham model.
+        psi (numpy.ndarray): The state.
+
+    Returns:
+        float: The (real) expectation value.
+    """
+    if isinstance(operator, (np.ndarray, LinearOperator)) or sp.issparse(operator) or hasattr(operator, 'as_linear_operator'):
+        return np.vdot(psi, _as_operator(operator).matvec(psi)).real
+    return operator(psi)
+
+
+def evolve(hamiltonian, psi0, times, observables=None, krylov_dim=20, tol=1e-10):
+    """
+    Propagates a state under a Hamiltonian and streams the results on a time grid.
+
+    The state is advanced from one grid time to the next with ``krylov_expm_multiply``, so only the current state is
+    kept in memory and results are produced as they become available.
+
+    Args:
+        hamiltonian: A Hermitian ``LinearOperator``, sparse or dense matrix, or a qham model with ``as_linear_operator()``.
+        psi0 (numpy.ndarray): The state at ``times[0]``.
+        times (array_like): The increasing time grid.
+        observables (dict, optional): Maps names to operators or callables ``f(psi)``. If given, their expectation
+            values are yielded instead of the state.
+        krylov_dim (int): The maximum dimension of the Krylov subspace. Defaults to 20.
+        tol (float): The tolerated error per step. Defaults to 1e-10.
+
+    Yields:
+        tuple: ``(t, state)``, or ``(t, {name: value})`` when ``observables`` is given.
+    """
+    operator = _as_operator(hamiltonian)
+    times = np.asarray(times, dtype=np.float64)
+    if np.any(np.diff(times) < 0):
+        raise ValueError("times must be increasing")
+    psi = np.array(psi0, dtype=np.complex128).reshape(-1)
+    previous = times[0] if times.size else 0.0
+    for t in times:
+        if t != previous:
+            psi = krylov_expm_multiply(operator, psi, t - previous, krylov_dim=krylov_dim, tol=tol)
+            previous = t
+        if observables is None:
+            yield t, psi.copy()
+        else:
+            yield t, {name: expectation(operator_, psi) for name, operator_ in observables.items()}
@@ -0,0 +1,216 @@
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_callbacks = []
+_frames = []
+_track_memory = False
+# tracemalloc.reset_peak is new in Python 3.9; without it peaks are only exact for calls that start the tracing
+_reset_peak = getattr(tracemalloc, 'reset_peak', None)
+
+
+def add_callback(callback):
+    """
+    Registers a function that receives an event for every instrumented call.
+
+    Events are dictionaries with the ``'name'`` of the call (e.g. ``'HubbardModel.create_hamiltonian'``), its wall
+    ``'time'`` in seconds, its ``'peak_memory'`` in bytes above the memory at entry when memory tracking is on (None
+    otherwise) and call-specific metrics such as ``'dim'``, ``'nnz'``, ``'gates'`` or ``'sweeps_per_second'``.
+    Callbacks run synchronously in the calling thread.
+
+    Args:
+        callback (callable): A function of one event.
+    """
+    _callbacks.append(callback)
+
+
+def remove_callback(callback):
+    """
+    Unregisters a callback.
+
+    Args:
+        callback (callable): A function registered with ``add_callback``.
+    """
+    _callbacks.remove(callback)
+
+
+def set_memory_tracking(enabled):
+    """
+    Switches the measurement of peak allocations on or off.
+
+    Peaks are measured with ``tracemalloc``, which sees Python and NumPy allocations but not those of torch's own
+    allocator, and slows allocation-heavy code down noticeably while an instrumented call runs. Before Python 3.9
+    the peak cannot be reset, so nested calls and calls made while tracing was already on report an upper bound: the
+    highest allocation since tracing started.
+
+    Args:
+        enabled (bool): Whether to measure peak allocations.
+
+    Returns:
+        bool: The previous setting.
+    """
+    global _track_memory
+    previous = _track_memory
+    _track_memory = enabled
+    return previous
+
+
+def enabled():
+    """Returns whether any callback is registered, i.e. whether instrumented calls are measured."""
+    return bool(_callbacks)
+
+
+def instrumented(metrics=None, name=None):
+    """
+    Decorates a function so that its calls are measured and reported to the registered callbacks.
+
+    Without callbacks the wrapper only checks that the registry is empty before calling the function, so
+    instrumentation is free when disabled. Nested instrumented calls are reported individually, innermost first.
+
+    Args:
+        metrics (callable, optional): Computes call-specific metrics as ``metrics(result, *args, **kwargs)``, returning
+            a dictionary. A ``'sweeps'`` entry is turned into ``'sweeps_per_second'`` as well.
+        name (str, optional): The event name. Defaults to the qualified name of the function.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(func):
+        event_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _callbacks:
+                return func(*args, **kwargs)
+            return _measure(event_name, func, metrics, args, kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _measure(name, func, metrics, args, kwargs):
+    frame = _enter_frame() if _track_memory else None
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = _exit_frame(frame) if frame is not None else None
+    event = {'name': name, 'time': elapsed, 'peak_memory': peak}
+    if metrics is not None:
+        event.update(metrics(result, *args, **kwargs))
+    if 'sweeps' in event:
+        event['sweeps_per_second'] = event['sweeps'] / elapsed if elapsed > 0 else float('inf')
+    for callback in list(_callbacks):
+        callback(event)
+    return result
+
+
+def _enter_frame():
+    # Peaks of nested calls are folded into their parents, since resetting the tracemalloc peak loses the old one
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    current, peak = tracemalloc.get_traced_memory()
+    if _frames:
+        _frames[-1]['peak'] = max(_frames[-1]['peak'], peak)
+    if _reset_peak is not None:
+        _reset_peak()
+    frame = {'start': current, 'peak': current, 'started': started}
+    _frames.append(frame)
+    return frame
+
+
+def _exit_frame(frame):
+    _frames.pop()
+    peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+    if _frames:
+        _frames[-1]['peak'] = max(_frames[-1]['peak'], peak)
+    if frame['started']:
+        tracemalloc.stop()
+    return peak - frame['start']
+
+
+class MetricsRegistry:
+    """
+    A callback that keeps every event and aggregates them by name.
+
+    Attributes:
+        events (list): The events in the order they were reported.
+    """
+    def __init__(self):
+        """Initializes an empty registry."""
+        self.events = []
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def summary(self):
+        """
+        Aggregates the events by name.
+
+        Returns:
+            dict: Maps every name to its number of ``'calls'``, the ``'total_time'`` and ``'max_time'`` in seconds,
+            the largest ``'peak_memory'`` (None without memory tracking) and the metrics of the last call.
+        """
+        summary = {}
+        for event in self.events:
+            entry = summary.setdefault(event['name'], {'calls': 0, 'total_time': 0.0, 'max_time': 0.0,
+                                                       'peak_memory': None})
+            entry['calls'] += 1
+            entry['total_time'] += event['time']
+            entry['max_time'] = max(entry['max_time'], event['time'])
+            if event['peak_memory'] is not None:
+                entry['peak_memory'] = max(entry['peak_memory'] or 0, event['peak_memory'])
+            entry.update({key: value for key, value in event.items() if key not in ('name', 'time', 'peak_memory')})
+        return summary
+
+
+@contextmanager
+def record(memory=False):
+    """
+    Collects the events of all instrumented calls inside a ``with`` block.
+
+    Args:
+        memory (bool): Whether to measure peak allocations as well, see ``set_memory_tracking``. Defaults to False.
+
+    Yields:
+        MetricsRegistry: The registry receiving the events.
+    """
+    registry = MetricsRegistry()
+    previous = set_memory_tracking(memory or _track_memory)
+    add_callback(registry)
+    try:
+        yield registry
+    finally:
+        remove_callback(registry)
+        set_memory_tracking(previous)
+
+
+def matrix_metrics(result, *args, **kwargs):
+    """Reports the dimension and the stored entries (nonzero entries of a dense matrix) of a returned operator."""
+    if hasattr(result, 'nnz'):
+        return {'dim': result.shape[0], 'nnz': int(result.nnz)}
+    if hasattr(result, 'count_nonzero'):
+        return {'dim': result.shape[0], 'nnz': int(result.count_nonzero())}
+    import numpy as np
+
+    return {'dim': result.shape[0], 'nnz': int(np.count_nonzero(result))}
+
+
+def eigen_metrics(result, *args, **kwargs):
+    """Reports the dimension and the number of eigenpairs of a returned ``(eigenvalues, eigenvectors)`` pair."""
+    eigenvalues, eigenvectors = result
+    return {'dim': eigenvectors.shape[0], 'eigenpairs': len(eigenvalues)}
+
+
+def circuit_metrics(result, *args, **kwargs):
+    """Reports the qubits, gates and depth of a returned circuit."""
+    return {'qubits': result.num_qubits, 'gates': result.size(), 'depth': result.depth()}
+
+
+def simulation_metrics(result, simulation, *args, **kwargs):
+    """Reports the Monte Carlo sweeps performed by a run and the lattice size of the simulation."""
+    return {'sweeps': simulation.completed_steps, 'size': simulation.size}
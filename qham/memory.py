@@ -0,0 +1,137 @@
+import os
+
+REPRESENTATIONS = ('dense', 'sparse', 'matrix-free')
+ENVIRONMENT_VARIABLE = 'QHAM_MEMORY_BUDGET'
+_UNITS = {'': 1, 'K': 2**10, 'M': 2**20, 'G': 2**30, 'T': 2**40}
+_budget = None
+
+
+class MemoryBudgetError(MemoryError):
+    """Raised when building an operator would exceed the memory budget."""
+
+
+def parse_bytes(value):
+    """
+    Parses a number of bytes.
+
+    Args:
+        value (int or str): A number of bytes, or a string such as ``'512M'`` or ``'8G'`` with a binary unit suffix.
+
+    Returns:
+        int: The number of bytes.
+    """
+    if isinstance(value, str):
+        text = value.strip().upper()
+        # Slicing instead of str.removesuffix, which needs Python 3.9
+        for suffix in ('B', 'I'):
+            if text.endswith(suffix):
+                text = text[:-1]
+        unit = text[-1:] if text[-1:] in _UNITS else ''
+        return int(float(text[:len(text) - len(unit)]) * _UNITS[unit])
+    return int(value)
+
+
+def format_bytes(nbytes):
+    """Formats a number of bytes with a binary unit, e.g. ``'1.5 GiB'``."""
+    for unit in ('B', 'KiB', 'MiB', 'GiB', 'TiB'):
+        if nbytes < 1024 or unit == 'TiB':
+            return f"{nbytes:.0f} {unit}" if unit == 'B' else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+
+
+def set_memory_budget(nbytes):
+    """
+    Sets the memory budget of operator construction for the current process.
+
+    Args:
+        nbytes (int or str or None): The budget, see ``parse_bytes``. None restores the default of
+            ``get_memory_budget``.
+
+    Returns:
+        int or None: The previously set budget.
+    """
+    global _budget
+    previous = _budget
+    _budget = None if nbytes is None else parse_bytes(nbytes)
+    return previous
+
+
+def get_memory_budget():
+    """
+    Returns the memory budget of operator construction.
+
+    The budget set with ``set_memory_budget`` takes precedence over the ``QHAM_MEMORY_BUDGET`` environment variable,
+    which in turn overrides the default: the physical memory of the machine, or no limit where it cannot be read.
+
+    Returns:
+        int or None: The budget in bytes, or None if unlimited.
+    """
+    if _budget is not None:
+        return _budget
+    if os.environ.get(ENVIRONMENT_VARIABLE):
+        return parse_bytes(os.environ[ENVIRONMENT_VARIABLE])
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def check_memory(nbytes, description):
+    """
+    Fails fast if an allocation would exceed the memory budget.
+
+    Args:
+        nbytes (int): The size of the allocation in bytes.
+        description (str): What is being built, for the error message.
+
+    Raises:
+        MemoryBudgetError: If ``nbytes`` exceeds the budget.
+    """
+    budget = get_memory_budget()
+    if budget is not None and nbytes > budget:
+        raise MemoryBudgetError(f"{description} needs {format_bytes(nbytes)}, more than the memory budget of "
+                                f"{format_bytes(budget)}; use a smaller system, another representation or raise "
+                                f"the budget with set_memory_budget or {ENVIRONMENT_VARIABLE}")
+
+
+def sparse_bytes(dim, nnz, itemsize=8):
+    """
+    Estimates the memory of a CSR matrix, assuming int64 indices.
+
+    Args:
+        dim (int): The number of rows.
+        nnz (int): The number of stored entries.
+        itemsize (int): The bytes per stored value. Defaults to 8.
+
+    Returns:
+        int: The number of bytes.
+    """
+    return nnz * (itemsize + 8) + (dim + 1) * 8
+
+
+def select_representation(model, representation='auto'):
+    """
+    Chooses the representation in which a model's Hamiltonian is built.
+
+    Args:
+        model: A model with a ``REPRESENTATIONS`` tuple, ordered from fastest to leanest, and an ``estimate_memory``
+            method.
+        representation (str): One of the model's ``REPRESENTATIONS``, or ``'auto'`` for the first one that fits into
+            the memory budget. Defaults to ``'auto'``.
+
+    Returns:
+        str: The representation.
+
+    Raises:
+        MemoryBudgetError: If the requested representation, or with ``'auto'`` every representation, exceeds the
+            budget.
+    """
+    if representation != 'auto':
+        check_memory(model.estimate_memory(representation), f"the {representation} Hamiltonian")
+        return representation
+    for candidate in model.REPRESENTATIONS:
+        budget = get_memory_budget()
+        if budget is None or model.estimate_memory(candidate) <= budget:
+            return candidate
+    leanest = model.REPRESENTATIONS[-1]
+    check_memory(model.estimate_memory(leanest), f"the {leanest} Hamiltonian")
@@ -0,0 +1,96 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, aslinearoperator, eigsh
+
+
+def lowest_eigenpairs(operator, k=1, tol=0, maxiter=None, v0=None):
+    """
+    Finds the lowest eigenpairs of a Hermitian operator with the implicitly restarted Lanczos method (ARPACK).
+
+    The operator is only ever applied to vectors, so a matrix-free ``LinearOperator`` never has to be
+    materialized. Only when ``k`` is not smaller than the dimension, which ARPACK cannot handle, is the
+    operator applied to the identity to solve the (tiny) problem densely.
+
+    Args:
+        operator (scipy.sparse.linalg.LinearOperator or scipy.sparse.spmatrix or numpy.ndarray): The Hermitian operator.
+        k (int): The number of eigenpairs to compute. Defaults to 1.
+        tol (float): The relative accuracy of the eigenvalues; 0 means machine precision. Defaults to 0.
+        maxiter (int, optional): The maximum number of Arnoldi update iterations.
+        v0 (numpy.ndarray, optional): The starting vector of the iteration, e.g. a previous ground state.
+
+    Returns:
+        tuple: An array of the ``k`` lowest eigenvalues in ascending order and a matrix whose columns are the eigenvectors.
+    """
+    operator = aslinearoperator(operator)
+    dim = operator.shape[0]
+    if k < 1:
+        raise ValueError(f"k must be positive, got {k}")
+    if k >= dim:
+        if k > dim:
+            raise ValueError(f"k={k} exceeds the dimension {dim} of the operator")
+        eigenvalues, eigenvectors = np.linalg.eigh(operator.matmat(np.eye(dim, dtype=operator.dtype)))
+        return eigenvalues, eigenvectors
+    eigenvalues, eigenvectors = eigsh(operator, k=k, which='SA', tol=tol, maxiter=maxiter, v0=v0)
+    order = np.argsort(eigenvalues)
+    return eigenvalues[order], eigenvectors[:, order]
+
+
+def linear_operator(matvec, dim, dtype=np.float64):
+    """
+    Wraps a Hermitian matrix-vector product as a ``LinearOperator``.
+
+    The operator keeps ``dtype`` for the eigensolvers but is also applied to complex vectors, e.g. during a time
+    evolution, so ``matvec`` must preserve the dtype of its input rather than cast it to ``dtype``.
+
+    Args:
+        matvec (callable): A function mapping a one-dimensional vector of length ``dim`` to ``H @ vector``.
+        dim (int): The dimension of the Hilbert space.
+        dtype (numpy.dtype): The dtype of the operator. Defaults to float64.
+
+    Returns:
+        scipy.sparse.linalg.LinearOperator: The operator; its adjoint is itself.
+    """
+    def apply(v):
+        return matvec(np.ravel(v))
+
+    return LinearOperator((dim, dim), matvec=apply, rmatvec=apply, dtype=dtype)
+
+
+def sweep_eigenpairs(template, coefficients, k=1, dense=None, tol=0):
+    """
+    Computes the lowest energy levels of an ``OperatorTemplate`` for many coefficient sets.
+
+    Small problems are assembled into stacks of dense matrices and diagonalized in batches. Larger ones are solved
+    point by point with the Lanczos solver, starting each point from the previous ground state.
+
+    Args:
+        template (OperatorTemplate): The structural operators of the Hamiltonian.
+        coefficients (list): A list of ``{name: value}`` dictionaries, one per parameter point.
+        k (int): The number of energy levels per point. Defaults to 1.
+        dense (bool, optional): Forces the batched dense (True) or iterative (False) path. Defaults to dense for
+            dimensions up to 2048.
+        tol (float): The relative accuracy of the iterative solver. Defaults to 0.
+
+    Returns:
+        numpy.ndarray: An array of shape ``(len(coefficients), k)`` with the energy levels of every point.
+
+    Raises:
+        ValueError: If ``k`` is not between 1 and the dimension of the operators.
+    """
+    dim = template.shape[0]
+    if not 1 <= k <= dim:
+        raise ValueError(f"k must lie between 1 and the dimension {dim} of the operator, got {k}")
+    if dense is None:
+        dense = dim <= 2048
+    energies = np.empty((len(coefficients), k))
+    if dense:
+        chunk = max(1, 2**24 // (dim * dim))
+        for start in range(0, len(coefficients), chunk):
+            stack = template.assemble_dense(coefficients[start:start + chunk])
+            energies[start:start + chunk] = np.linalg.eigvalsh(stack)[:, :k]
+        return energies
+    v0 = None
+    for point, values in enumerate(coefficients):
+        levels, vectors = lowest_eigenpairs(template.assemble(**values), k=k, tol=tol, v0=v0)
+        energies[point] = levels
+        v0 = vectors[:, 0]
+    return energies
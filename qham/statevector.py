@@ -0,0 +1,181 @@
+import numpy as np
+from qham.instrumentation import instrumented
+
+GATES = ('rx', 'rz', 'rxx', 'ryy', 'rzz', 'cx')
+
+
+def _run_metrics(result, simulator, circuit, *args, **kwargs):
+    return {'qubits': circuit.num_qubits, 'gates': circuit.size(), 'batch': result.shape[0] if result.ndim == 2 else 1}
+
+
+def zero_state(num_qubits, batch=None):
+    """
+    Creates the all-zero computational basis state.
+
+    Args:
+        num_qubits (int): The number of qubits.
+        batch (int, optional): The number of copies, stacked along a leading axis.
+
+    Returns:
+        numpy.ndarray: A complex128 state of shape ``(2**num_qubits,)``, or ``(batch, 2**num_qubits)``.
+    """
+    state = np.zeros((1 if batch is None else batch, 2**num_qubits), dtype=np.complex128)
+    state[:, 0] = 1.0
+    return state[0] if batch is None else state
+
+
+class StatevectorSimulator:
+    """
+    Applies the rotations and CX gates of qham's Trotter circuits directly to NumPy state vectors.
+
+    The ``2**N`` amplitudes of a batch of ``B`` states are viewed as an array of shape ``(B, 2, ..., 2)`` with one
+    axis per qubit, using Qiskit's little-endian ordering (qubit ``q`` is bit ``q`` of the basis index, i.e. axis
+    ``N - q``). A gate combines the two (or four) slices of its qubits' axes in place, so no gate matrix is ever formed
+    and every gate costs ``O(B * 2**N)``. Angles may differ between the states of the batch, which simulates a whole
+    parameter sweep in one pass.
+
+    Attributes:
+        num_qubits (int): The number of qubits.
+    """
+    def __init__(self, num_qubits):
+        """
+        Initializes the simulator.
+
+        Args:
+            num_qubits (int): The number of qubits.
+        """
+        self.num_qubits = num_qubits
+
+    def _axis(self, qubit):
+        return self.num_qubits - qubit
+
+    def _slice(self, *pairs):
+        """Selects the amplitudes where each ``(qubit, bit)`` pair holds."""
+        index = [slice(None)] * (self.num_qubits + 1)
+        for qubit, bit in pairs:
+            index[self._axis(qubit)] = bit
+        return tuple(index)
+
+    def _broadcast(self, angles, removed):
+        return angles.reshape((-1,) + (1,) * (self.num_qubits - removed))
+
+    def rz(self, state, theta, qubit):
+        """Applies ``exp(-1j * theta / 2 * Z)`` in place."""
+        phase = self._broadcast(np.exp(0.5j * theta), 1)
+        state[self._slice((qubit, 0))] *= phase.conj()
+        state[self._slice((qubit, 1))] *= phase
+
+    def rx(self, state, theta, qubit):
+        """Applies ``exp(-1j * theta / 2 * X)`` in place."""
+        c = self._broadcast(np.cos(theta / 2), 1)
+        s = self._broadcast(-1j * np.sin(theta / 2), 1)
+        a0, a1 = state[self._slice((qubit, 0))], state[self._slice((qubit, 1))]
+        b0 = a0.copy()
+        a0 *= c
+        a0 += s * a1
+        a1 *= c
+        a1 += s * b0
+
+    def rzz(self, state, theta, first, second):
+        """Applies ``exp(-1j * theta / 2 * Z Z)`` in place."""
+        phase = self._broadcast(np.exp(0.5j * theta), 2)
+        for b0 in (0, 1):
+            for b1 in (0, 1):
+                state[self._slice((first, b0), (second, b1))] *= phase.conj() if b0 == b1 else phase
+
+    def _flip_pairs(self, state, theta, first, second, signs):
+        """Mixes every amplitude with the one of both bits flipped, ``a <- cos * a - 1j * sin * sign * a_flipped``."""
+        c = self._broadcast(np.cos(theta / 2), 2)
+        s = self._broadcast(-1j * np.sin(theta / 2), 2)
+        for b1, sign in ((0, signs[0]), (1, signs[1])):
+            a = state[self._slice((first, 0), (second, b1))]
+            flipped = state[self._slice((first, 1), (second, 1 - b1))]
+            original = a.copy()
+            a *= c
+            a += (sign * s) * flipped
+            flipped *= c
+            flipped += (sign * s) * original
+
+    def rxx(self, state, theta, first, second):
+        """Applies ``exp(-1j * theta / 2 * X X)`` in place."""
+        self._flip_pairs(state, theta, first, second, (1, 1))
+
+    def ryy(self, state, theta, first, second):
+        """Applies ``exp(-1j * theta / 2 * Y Y)`` in place; ``YY`` flips equal bits with sign -1, unequal ones with +1."""
+        self._flip_pairs(state, theta, first, second, (-1, 1))
+
+    def cx(self, state, control, target):
+        """Applies a CX gate in place by swapping the target's amplitudes where the control is set."""
+        a0 = state[self._slice((control, 1), (target, 0))]
+        a1 = state[self._slice((control, 1), (target, 1))]
+        swap = a0.copy()
+        a0[...] = a1
+        a1[...] = swap
+
+    @instrumented(_run_metrics)
+    def run(self, circuit, parameters=None, state=None):
+        """
+        Simulates a circuit made of the gates in ``GATES`` (barriers are skipped).
+
+        Args:
+            circuit (QuantumCircuit): The circuit, possibly with unbound parameters.
+            parameters (dict, optional): Maps each ``Parameter`` (or its name) to a value or to a 1D array of values,
+                one per state of the batch.
+            state (numpy.ndarray, optional): The initial state of shape ``(2**N,)`` or ``(B, 2**N)``. Defaults to
+                ``|0...0>``.
+
+        Returns:
+            numpy.ndarray: The final state of shape ``(2**N,)``, or ``(B, 2**N)`` when a batch of states or
+            parameter values is given.
+        """
+        if circuit.num_qubits != self.num_qubits:
+            raise ValueError(f"the circuit has {circuit.num_qubits} qubits, the simulator {self.num_qubits}")
+        values = {getattr(key, 'name', key): np.atleast_1d(np.asarray(value, dtype=np.float64))
+                  for key, value in (parameters or {}).items()}
+        batched = (state is not None and np.ndim(state) == 2) or any(value.size > 1 for value in values.values())
+        batch = max([value.size for value in values.values()] + [1 if state is None else np.shape(np.atleast_2d(state))[0]])
+        if state is None:
+            state = zero_state(self.num_qubits, batch)
+        else:
+            state = np.array(np.broadcast_to(np.atleast_2d(state), (batch, 2**self.num_qubits)), dtype=np.complex128)
+        tensor = state.reshape((batch,) + (2,) * self.num_qubits)
+        for instruction in circuit.data:
+            operation = instruction.operation
+            if operation.name == 'barrier':
+                continue
+            if operation.name not in GATES:
+                raise ValueError(f"unsupported gate {operation.name!r}, expected one of {GATES}")
+            qubits = [circuit.find_bit(qubit).index for qubit in instruction.qubits]
+            angles = [_evaluate(param, values, batch) for param in operation.params]
+            getattr(self, operation.name)(tensor, *angles, *qubits)
+        return state if batched else state[0]
+
+
+def _evaluate(param, values, batch):
+    """Evaluates a gate angle for every state of the batch."""
+    names = [parameter.name for parameter in getattr(param, 'parameters', ())]
+    if not names:
+        return np.full(batch, float(param))
+    missing = [name for name in names if name not in values]
+    if missing:
+        raise ValueError(f"no values given for the parameters {missing}")
+    lookup = {parameter: np.broadcast_to(values[parameter.name], (batch,)) for parameter in param.parameters}
+    if len(names) == 1 and getattr(param, 'name', None) == names[0]:
+        return np.array(lookup[next(iter(param.parameters))])
+    return np.array([float(param.bind({parameter: value[b] for parameter, value in lookup.items()}))
+                     for b in range(batch)])
+
+
+def simulate(circuit, parameters=None, state=None):
+    """
+    Simulates a circuit with ``StatevectorSimulator``.
+
+    Args:
+        circuit (QuantumCircuit): The circuit, made of RX, RZ, RXX, RYY, RZZ and CX gates.
+        parameters (dict, optional): Maps each ``Parameter`` (or its name) to a value or a 1D array of values.
+        state (numpy.ndarray, optional): The initial state. Defaults to ``|0...0>``.
+
+    Returns:
+        numpy.ndarray: The final state, with a leading batch axis when a batch is simulated.
+    """
+    return StatevectorSimulator(circuit.num_qubits).run(circuit, parameters, state)
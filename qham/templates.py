@@ -0,0 +1,90 @@
+import numpy as np
+import scipy.sparse as sp
+
+class OperatorTemplate:
+    """
+    A family of sparse Hamiltonians ``H = sum_name c_name * A_name`` built from fixed structural operators.
+
+    All terms are merged onto one shared sparsity pattern when the template is created, so assembling ``H`` for new
+    coefficients only scales and sums the stored data vectors; the index arrays are never rebuilt.
+
+    Attributes:
+        names (list): The names of the structural operators, in insertion order.
+        shape (tuple): The shape of the operators.
+        nnz (int): The number of stored entries of the shared sparsity pattern.
+    """
+    def __init__(self, operators):
+        """
+        Merges the structural operators onto a shared sparsity pattern.
+
+        Args:
+            operators (dict): Maps each term name to its sparse operator; all operators must have the same shape.
+        """
+        self.names = list(operators)
+        shapes = {operator.shape for operator in operators.values()}
+        if len(shapes) != 1:
+            raise ValueError(f"all operators must have the same shape, got {sorted(shapes)}")
+        self.shape = shapes.pop()
+        coo = [sp.coo_matrix(operators[name]) for name in self.names]
+        positions = np.concatenate([c.row.astype(np.int64) * self.shape[1] + c.col for c in coo])
+        pattern, inverse = np.unique(positions, return_inverse=True)
+        rows = pattern // self.shape[1]
+        self.nnz = pattern.size
+        self._indices = (pattern % self.shape[1]).astype(np.int64)
+        self._indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=self.shape[0]))])
+        self._data = {}
+        start = 0
+        for name, c in zip(self.names, coo):
+            data = np.zeros(self.nnz, dtype=np.result_type(c.dtype, np.float64))
+            np.add.at(data, inverse[start:start + c.nnz], c.data)
+            self._data[name] = data
+            start += c.nnz
+
+    def term(self, name):
+        """
+        Returns one structural operator on the shared sparsity pattern.
+
+        Args:
+            name (str): The name of the term.
+
+        Returns:
+            scipy.sparse.csr_matrix: The operator.
+        """
+        return self.assemble(**{name: 1.0})
+
+    def assemble(self, **coefficients):
+        """
+        Assembles ``sum_name c_name * A_name`` for the given coefficients; omitted terms have coefficient 0.
+
+        Args:
+            **coefficients (float): The coefficient of each named term.
+
+        Returns:
+            scipy.sparse.csr_matrix: The assembled operator.
+        """
+        return sp.csr_matrix((self._combine(coefficients), self._indices, self._indptr), shape=self.shape)
+
+    def _combine(self, coefficients):
+        unknown = set(coefficients) - set(self.names)
+        if unknown:
+            raise ValueError(f"unknown terms {sorted(unknown)}, expected some of {self.names}")
+        data = np.zeros(self.nnz, dtype=np.result_type(*self._data.values()))
+        for name, value in coefficients.items():
+            data += value * self._data[name]
+        return data
+
+    def assemble_dense(self, coefficients):
+        """
+        Assembles a stack of dense matrices, one per row of coefficients.
+
+        Args:
+            coefficients (list): A list of ``{name: value}`` dictionaries.
+
+        Returns:
+            numpy.ndarray: An array of shape ``(len(coefficients),) + shape``.
+        """
+        rows = np.repeat(np.arange(self.shape[0]), np.diff(self._indptr))
+        stack = np.zeros((len(coefficients),) + self.shape, dtype=np.result_type(*self._data.values()))
+        for point, values in enumerate(coefficients):
+            stack[point, rows, self._indices] = self._combine(values)
+        return stack
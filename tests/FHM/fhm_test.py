@@ -1,3 +1,4 @@
+import pytest
 import numpy as np
 from qham.FHM.fhm import HubbardModel  
 
@@ -24,4 +25,82 @@ def test_plot_energy_levels_runs():
     energies, _ = model.diagonalize()
     # Test simply runs the function to ensure no errors; it doesn't check the plot output
     model.plot_energy_levels(energies)
-    assert True  # If the function runs without errors, this test passes
\ No newline at end of file
+    assert True  # If the function runs without errors, this test passes
+
+def reference_hamiltonian(num_sites, t, U):
+    # Loop-based construction over occupation tuples, independent of the vectorized builders
+    dim = 4**num_sites
+    H = np.zeros((dim, dim))
+    for idx in range(dim):
+        occ = [(idx >> bit) & 1 for bit in reversed(range(2 * num_sites))]
+        for i in range(num_sites):
+            H[idx, idx] += U * occ[2*i] * occ[2*i+1]
+        for i in range(num_sites - 1):
+            for spin in [0, 1]:
+                if occ[2*i+spin] > occ[2*(i+1)+spin]:
+                    new_occ = list(occ)
+                    new_occ[2*i+spin], new_occ[2*(i+1)+spin] = 0, 1
+                    new_idx = int(''.join(map(str, new_occ)), 2)
+                    H[idx, new_idx] -= t
+                    H[new_idx, idx] -= t
+    return H
+
+def test_sparse_hamiltonian_matches_reference():
+    model = HubbardModel(num_sites=3, t=1.0, U=2.0)
+    H_sparse = model.create_sparse_hamiltonian()
+    assert H_sparse.shape == (64, 64)
+    reference = reference_hamiltonian(3, 1.0, 2.0)
+    assert np.allclose(H_sparse.toarray(), reference)
+    assert np.allclose(model.create_hamiltonian(), reference)
+
+def test_sparse_model_diagonalization():
+    dense = HubbardModel(num_sites=2, t=1.0, U=2.0)
+    model = HubbardModel(num_sites=2, t=1.0, U=2.0, sparse=True)
+    assert model.H.format == 'csr'
+    energies, _ = model.diagonalize()
+    assert np.allclose(energies, dense.diagonalize()[0])
+
+def test_sparse_interaction_term():
+    model = HubbardModel(num_sites=2, t=0.0, U=3.0, sparse=True)
+    # Without hopping the Hamiltonian is diagonal and counts doubly occupied sites
+    diagonal = model.H.diagonal()
+    assert np.count_nonzero(model.H.toarray() - np.diag(diagonal)) == 0
+    assert np.count_nonzero(diagonal) == 7  # 4 + 4 states with a doubly occupied site, 1 counted twice
+    assert np.isclose(model.H[0b1111, 0b1111], 6.0)
+
+def test_sector_dimension():
+    model = HubbardModel(num_sites=8, t=1.0, U=4.0, n_up=4, n_down=4, sparse=True)
+    assert model.dimension == 4900
+    assert model.H.shape == (4900, 4900)
+
+def test_sector_spectra_match_full_spectrum():
+    full = HubbardModel(num_sites=3, t=1.0, U=2.0)
+    energies = []
+    for n_up, n_down, dim in full.sectors():
+        model = HubbardModel(num_sites=3, t=1.0, U=2.0, n_up=n_up, n_down=n_down)
+        assert model.H.shape == (dim, dim)
+        energies.extend(model.diagonalize()[0])
+    assert np.allclose(np.sort(energies), full.diagonalize()[0])
+
+def test_sector_state_index_roundtrip():
+    model = HubbardModel(num_sites=4, t=1.0, U=2.0, n_up=2, n_down=1)
+    states = model.basis_states()
+    assert np.array_equal(model.state_index(states), np.arange(model.dimension))
+
+def test_sector_requires_both_particle_numbers():
+    with pytest.raises(ValueError):
+        HubbardModel(num_sites=2, t=1.0, U=2.0, n_up=1)
+
+def test_lowest_eigenpairs_matches_diagonalize():
+    model = HubbardModel(num_sites=4, t=1.0, U=2.0, n_up=2, n_down=2)
+    energies, vectors = model.lowest_eigenpairs(k=2)
+    assert np.allclose(energies, model.diagonalize()[0][:2])
+    assert vectors.shape == (model.dimension, 2)
+
+def test_sweep_matches_individual_models():
+    model = HubbardModel(num_sites=3, t=1.0, U=1.0, n_up=1, n_down=2)
+    energies = model.sweep(t=[0.5, 1.0], U=[0.0, 4.0], k=2)
+    assert energies.shape == (2, 2, 2)
+    expected = HubbardModel(num_sites=3, t=0.5, U=4.0, n_up=1, n_down=2).diagonalize()[0][:2]
+    assert np.allclose(energies[0, 1], expected)
+    assert model.operator_templates() is model.operator_templates()
\ No newline at end of file
@@ -44,3 +44,24 @@ def test_plot_energy_levels_runs():
     model.plot_energy_levels(eigenvalues)
     assert True  # If the function runs without errors, this test passes
 
+def test_heisenberg_lowest_eigenpairs():
+    N = 6
+    model = HeisenbergModel(N, -1.0)
+    eigenvalues, eigenvectors = model.lowest_eigenpairs(k=2)
+    expected = torch.linalg.eigh(model.H)[0][:2].double()
+    assert torch.allclose(eigenvalues, expected, atol=1e-4)
+    assert eigenvectors.shape == (2**N, 2)
+
+def test_heisenberg_lowest_eigenpairs_does_not_build_matrix():
+    model = HeisenbergModel(10, 1.0)
+    eigenvalues, _ = model.lowest_eigenpairs(k=1, tol=1e-8)
+    # The ferromagnetic chain has ground-state energy -J per bond
+    assert abs(eigenvalues[0].item() + 10) < 1e-6
+    assert model._H is None
+
+def test_heisenberg_sweep():
+    model = HeisenbergModel(4, 1.0)
+    energies = model.sweep([1.0, -2.0], k=1)
+    assert energies.shape == (2, 1)
+    assert np.isclose(energies[0, 0].item(), -4.0)
+    assert np.isclose(energies[1, 0].item(), 2.0 * HeisenbergModel(4, -1.0).lowest_eigenpairs()[0][0].item())
@@ -27,4 +27,11 @@ def test_create_heisenberg_square_lattice_matrix_circuit():
     assert isinstance(qc, QuantumCircuit)
     # For a 2x2 lattice, there should be 3 * 2 * 2 = 12 gates
     # (3 gates per interaction, 2 interactions per qubit for a square lattice)
-    assert len(qc.data) == 12
\ No newline at end of file
+    assert len(qc.data) == 12
+
+def test_periodic_square_lattice_matrix():
+    lattice = SquareLatticeMatrix(3, 3, periodic=True)
+    assert lattice.are_neighbors(0, 2) is True
+    assert np.all(lattice.adjacency_matrix.sum(axis=1) == 4)
+    qc = create_heisenberg_square_lattice_matrix_circuit(lattice, Parameter('t'))
+    assert len(qc.data) == 3 * 18
\ No newline at end of file
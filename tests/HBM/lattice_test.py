@@ -0,0 +1,39 @@
+import numpy as np
+from qham.HBM.lattice import Lattice
+
+def test_open_square_lattice():
+    lattice = Lattice.square(2, 3)
+    assert lattice.num_sites == 6
+    assert lattice.bonds.dtype == np.int32
+    assert lattice.bonds.tolist() == [[0, 1], [0, 3], [1, 2], [1, 4], [2, 5], [3, 4], [4, 5]]
+    # Neighbors are listed up, down, left, right
+    assert lattice.neighbors(4).tolist() == [1, 3, 5]
+    assert lattice.degrees().tolist() == [2, 3, 2, 2, 3, 2]
+
+def test_periodic_square_lattice():
+    lattice = Lattice.square(3, 4, periodic=True)
+    assert lattice.num_bonds == 2 * 12
+    assert np.all(lattice.degrees() == 4)
+    assert lattice.neighbors(0).tolist() == [8, 4, 3, 1]
+    # Dimensions of length 2 are not wrapped, which would duplicate their bonds
+    assert Lattice.square(2, 4, periodic=True).num_bonds == 4 + 2 * 4
+
+def test_are_neighbors_and_adjacency_matrix():
+    lattice = Lattice.square(3, 3)
+    assert lattice.are_neighbors(0, 1) is True
+    assert lattice.are_neighbors(0, 4) is False
+    matrix = lattice.adjacency_matrix()
+    assert (matrix != matrix.T).nnz == 0
+    assert matrix.sum() == 2 * lattice.num_bonds
+    assert np.array_equal(lattice.adjacency_matrix(sparse=False), matrix.toarray())
+
+def test_directed_edges_follow_neighbor_order():
+    lattice = Lattice.square(3, 3)
+    sites, neighbors = lattice.directed_edges()
+    assert len(sites) == 2 * lattice.num_bonds
+    assert neighbors[sites == 4].tolist() == lattice.neighbors(4).tolist()
+
+def test_large_lattice_is_compact():
+    lattice = Lattice.square(1000, 1000, periodic=True)
+    assert lattice.num_bonds == 2 * 10**6
+    assert lattice.bonds.nbytes == 16 * 10**6
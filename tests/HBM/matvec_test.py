@@ -0,0 +1,48 @@
+import numpy as np
+import torch
+from qham.HBM.hmb import HeisenbergModel
+from qham.HBM.matvec import HeisenbergMatvec
+
+def kronecker_hamiltonian(N, J):
+    # The reference construction from tensor products of Pauli matrices on every bond of the periodic chain
+    paulis = [np.array([[0, 1], [1, 0]]), np.array([[0, -1j], [1j, 0]]), np.array([[1, 0], [0, -1]])]
+    H = np.zeros((2**N, 2**N), dtype=complex)
+    for i in range(N):
+        for pauli in paulis:
+            term = np.eye(1)
+            for j in range(N):
+                term = np.kron(term, pauli if j in (i, (i + 1) % N) else np.eye(2))
+            H -= J * term
+    return H
+
+def test_sparse_matches_kronecker_hamiltonian():
+    N = 5
+    H = HeisenbergMatvec(N, 0.7).to_sparse()
+    assert H.dtype == np.float64
+    reference = kronecker_hamiltonian(N, 0.7)
+    assert np.allclose(reference.imag, 0)
+    assert np.allclose(H.toarray(), reference.real)
+    assert np.allclose(HeisenbergModel(N, 0.7).H.numpy(), reference)
+
+def test_apply_matches_sparse_for_states_and_batches():
+    engine = HeisenbergMatvec(6, 1.3)
+    H = engine.to_sparse()
+    rng = np.random.default_rng(0)
+    psi = rng.standard_normal(2**6)
+    batch = rng.standard_normal((2**6, 3))
+    assert np.allclose(engine.apply(psi), H @ psi)
+    assert np.allclose(engine.apply(batch), H @ batch)
+
+def test_apply_torch_in_place():
+    engine = HeisenbergMatvec(4, 1.0)
+    psi = torch.randn(2**4, 2, dtype=torch.float64)
+    out = torch.empty_like(psi)
+    result = engine.apply(psi, out=out)
+    assert result is out
+    assert np.allclose(out.numpy(), engine.to_sparse() @ psi.numpy())
+
+def test_custom_bonds():
+    # An open two-bond chain: the Neel-like state |010> has two antiparallel bonds
+    engine = HeisenbergMatvec(3, 1.0, bonds=[(0, 1), (1, 2)])
+    assert engine.diagonal[0b010] == 2.0
+    assert engine.diagonal[0b000] == -2.0
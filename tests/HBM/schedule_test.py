@@ -0,0 +1,65 @@
+import numpy as np
+from qiskit.circuit import Parameter
+from qiskit.quantum_info import Operator, SparsePauliOp
+from scipy.linalg import expm
+from qham.HBM.lattice import Lattice
+from qham.HBM.hmbslq import SquareLattice, create_heisenberg_lattice_circuit
+from qham.HBM.schedule import (greedy_edge_coloring, schedule_bonds, create_layered_heisenberg_circuit,
+                               circuit_cost)
+
+def assert_valid_schedule(lattice, layers):
+    scheduled = sorted(map(tuple, np.concatenate(layers).tolist()))
+    assert scheduled == sorted(map(tuple, lattice.bonds.tolist()))
+    for layer in layers:
+        assert len(np.unique(layer)) == layer.size
+
+def test_square_lattice_uses_four_layers():
+    for rows, cols, periodic in [(3, 4, False), (5, 5, False), (4, 6, True)]:
+        lattice = Lattice.square(rows, cols, periodic)
+        layers = schedule_bonds(lattice)
+        assert len(layers) == 4
+        assert_valid_schedule(lattice, layers)
+
+def test_odd_periodic_lattice_falls_back_to_greedy():
+    lattice = Lattice.square(3, 3, periodic=True)
+    layers = schedule_bonds(lattice)
+    assert_valid_schedule(lattice, layers)
+    # 9 sites admit at most 4 disjoint bonds, so 18 bonds need at least 5 layers
+    assert len(layers) == 5
+
+def test_greedy_edge_coloring():
+    bonds = np.array([[0, 1], [0, 2], [1, 2], [3, 4]])
+    assert greedy_edge_coloring(bonds, 5).tolist() == [0, 1, 2, 0]
+
+def test_layered_circuit_cost():
+    t = Parameter('t')
+    lattice = SquareLattice(4, 4)
+    qc = create_layered_heisenberg_circuit(lattice, t, trotter_steps=2)
+    cost = circuit_cost(qc)
+    assert cost['two_qubit_gates'] == 2 * 3 * lattice.lattice.num_bonds
+    assert cost['depth'] == 2 * 3 * 4
+    old = circuit_cost(create_heisenberg_lattice_circuit(lattice, t))
+    assert old['two_qubit_gates'] == 2 * 3 * lattice.lattice.num_bonds
+    assert old['depth'] > cost['depth']
+
+def bond_hamiltonian(i, j, num_qubits):
+    terms = [(pauli, [i, j], 1.0) for pauli in ('XX', 'YY', 'ZZ')]
+    return SparsePauliOp.from_sparse_list(terms, num_qubits).to_matrix()
+
+def test_layered_circuit_applies_every_bond_once():
+    lattice = Lattice.square(2, 3)
+    t = 0.37
+    unitary = Operator(create_layered_heisenberg_circuit(lattice, t)).data
+    reference = np.eye(2**lattice.num_sites)
+    for layer in schedule_bonds(lattice):
+        for i, j in layer.tolist():
+            reference = expm(-1j * t * bond_hamiltonian(i, j, lattice.num_sites)) @ reference
+    assert np.allclose(unitary, reference)
+
+def test_layered_circuit_is_a_trotter_step_of_the_evolution():
+    lattice = Lattice.square(2, 3)
+    t = 1e-3
+    H = sum(bond_hamiltonian(i, j, lattice.num_sites) for i, j in lattice.bonds.tolist())
+    exact = expm(-1j * t * H)
+    layered = Operator(create_layered_heisenberg_circuit(lattice, t)).data
+    assert np.abs(layered - exact).max() < 1e-4
@@ -0,0 +1,32 @@
+import numpy as np
+import torch
+from qham.HBM.hmb import HeisenbergModel
+from qham.HBM.symmetry import MomentumSzBlocks
+
+def test_blocks_reproduce_full_spectrum():
+    for N, J in [(6, 1.0), (7, -0.5)]:
+        model = HeisenbergModel(N, J)
+        spectra = model.solve_symmetry_resolved()
+        energies = torch.sort(torch.cat(list(spectra.values())))[0]
+        expected = np.linalg.eigvalsh(model.build_sparse_hamiltonian().toarray())
+        assert energies.shape == (2**N,)
+        assert np.allclose(energies.numpy(), expected)
+
+def test_blocks_are_hermitian():
+    blocks = MomentumSzBlocks(8, 1.0)
+    for sz, k in [(0.0, 0), (0.0, 1), (1.0, 3), (0.0, 4)]:
+        H = blocks.block(sz, k)
+        assert np.allclose(H, H.conj().T)
+    assert np.isrealobj(blocks.block(0.0, 4))
+
+def test_block_sizes():
+    blocks = MomentumSzBlocks(8, 1.0)
+    reps, periods = blocks.basis(0.0, 0)
+    assert len(reps) == 10  # necklaces of 4 up and 4 down spins
+    assert sum(len(blocks.basis(0.0, k)[0]) for k in range(8)) == 70
+
+def test_labels_filter():
+    spectra = MomentumSzBlocks(6, 1.0).eigenvalues(sz=3.0)
+    # The fully polarized state has zero momentum only
+    assert list(spectra) == [(3.0, 0)]
+    assert np.allclose(spectra[(3.0, 0)], [-6.0])
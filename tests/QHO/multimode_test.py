@@ -0,0 +1,54 @@
+import numpy as np
+import torch
+from scipy.linalg import expm
+from qham.evolution import evolve
+from qham.QHO.multimode import CoupledOscillators
+
+def test_cutoff_basis():
+    model = CoupledOscillators(4, [1.0, 1.0, 1.0], max_excitations=2)
+    states = model.basis_states()
+    assert model.dimension == len(states) == 10
+    assert np.all(states.sum(axis=1) <= 2)
+    assert np.all(model.state_index(model.basis_codes()) == np.arange(10))
+
+def test_annihilation_operator_matches_kronecker_product():
+    full = CoupledOscillators(3, [1.0, 2.0, 3.0])
+    restricted = CoupledOscillators(3, [1.0, 2.0, 3.0], max_excitations=6)
+    assert restricted.dimension == full.dimension == 27
+    for mode in range(3):
+        assert np.allclose(full.annihilation_operator(mode).toarray(), restricted.annihilation_operator(mode).toarray())
+
+def test_beam_splitter_normal_modes():
+    omega, g = 1.0, 0.3
+    model = CoupledOscillators(12, [omega, omega], couplings={(0, 1): g}, max_excitations=6)
+    eigenvalues, _ = model.lowest_eigenpairs(k=4)
+    levels = sorted((p + 0.5) * (omega + g) + (q + 0.5) * (omega - g) for p in range(4) for q in range(4))
+    assert torch.allclose(eigenvalues, torch.tensor(levels[:4], dtype=torch.float64))
+
+def test_cutoff_is_exact_below_the_cutoff():
+    kwargs = dict(couplings={(0, 1): 0.1, (1, 2): 0.2}, kerr=[0.05, 0.0, 0.1])
+    full = CoupledOscillators(4, [1.0, 1.2, 0.9], **kwargs).create_sparse_hamiltonian().toarray()
+    restricted = CoupledOscillators(4, [1.0, 1.2, 0.9], max_excitations=3, **kwargs).create_sparse_hamiltonian()
+    assert np.allclose(np.linalg.eigvalsh(restricted.toarray())[:4], np.linalg.eigvalsh(full)[:4])
+
+def test_matrix_free_matches_sparse():
+    model = CoupledOscillators(6, [1.0, 1.1, 0.9, 1.05], couplings={(0, 1): 0.1, (2, 1): 0.2, (3, 0): 0.05},
+                               kerr=0.02, max_excitations=5)
+    H = model.create_sparse_hamiltonian()
+    assert H.nnz <= model.nnz()
+    assert abs(H - H.T).max() == 0
+    v = np.random.default_rng(0).standard_normal(model.dimension)
+    assert np.allclose(model.as_linear_operator() @ v, H @ v)
+    sparse, _ = model.lowest_eigenpairs(k=3, representation='sparse')
+    matrix_free, _ = model.lowest_eigenpairs(k=3, representation='matrix-free')
+    assert torch.allclose(sparse, matrix_free)
+
+def test_evolve_complex_state():
+    model = CoupledOscillators(4, [1.0, 1.3], couplings={(0, 1): 0.2}, kerr=0.05, max_excitations=4)
+    rng = np.random.default_rng(1)
+    psi0 = rng.standard_normal(model.dimension) + 1j * rng.standard_normal(model.dimension)
+    psi0 /= np.linalg.norm(psi0)
+    H = model.create_sparse_hamiltonian().toarray()
+    assert np.allclose(model.as_linear_operator() @ psi0, H @ psi0)
+    for t, state in evolve(model, psi0, [0.0, 0.5, 1.0]):
+        assert np.allclose(state, expm(-1j * t * H) @ psi0)
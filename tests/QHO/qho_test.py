@@ -37,3 +37,67 @@ def test_eigenvalues():
     # For a quantum harmonic oscillator, the eigenvalues should be of the form (n+0.5) * omega
     expected_eigenvalues = torch.tensor([(i + 0.5) * omega for i in range(n)])
     assert torch.allclose(eigenvalues, expected_eigenvalues, atol=1e-5)
+
+def test_lowest_eigenpairs():
+    qho = QuantumHarmonicOscillator(100, 2.0)
+    eigenvalues, eigenvectors = qho.lowest_eigenpairs(k=3)
+    assert torch.allclose(eigenvalues, torch.tensor([1.0, 3.0, 5.0], dtype=torch.float64))
+    assert eigenvectors.shape == (100, 3)
+
+def test_sweep():
+    qho = QuantumHarmonicOscillator(10, 1.0)
+    energies = qho.sweep([1.0, 3.0], k=2)
+    assert torch.allclose(energies, torch.tensor([[0.5, 1.5], [1.5, 4.5]], dtype=torch.float64))
+
+def test_banded_annihilation_operator():
+    qho = QuantumHarmonicOscillator(6, 1.0)
+    bands = qho.create_annihilation_operator(banded=True)
+    dense = qho.create_annihilation_operator()
+    assert bands.shape == (2, 6)
+    assert torch.allclose(torch.diag(dense, 1), torch.from_numpy(bands[0, 1:]).to(dense.dtype))
+
+def test_displaced_oscillator():
+    qho = QuantumHarmonicOscillator(60, 2.0, displacement=0.8)
+    assert qho.bandwidth == 1
+    eigenvalues, _ = qho.find_eigenstates(k=4)
+    # Completing the square shifts every level by -displacement**2 / (2 * omega)
+    expected = torch.tensor([(i + 0.5) * 2.0 - 0.8**2 / 4.0 for i in range(4)])
+    assert torch.allclose(eigenvalues, expected, atol=1e-5)
+
+def test_anharmonic_find_eigenstates_matches_dense():
+    qho = QuantumHarmonicOscillator(40, 1.0, displacement=0.1, cubic=0.05, quartic=0.2)
+    assert qho.bandwidth == 4
+    eigenvalues, eigenvectors = qho.find_eigenstates()
+    assert eigenvalues.dtype == torch.get_default_dtype()
+    expected = torch.linalg.eigvalsh(qho.create_hamiltonian().double())
+    assert torch.allclose(eigenvalues.double(), expected, atol=1e-4)
+    lowest, vectors = qho.find_eigenstates(k=3)
+    assert vectors.shape == (40, 3)
+    assert torch.allclose(lowest, eigenvalues[:3])
+
+def test_quartic_oscillator_large_truncation():
+    # The ground state of p**2 / 2 + x**2 / 2 + x**4 is 0.8037706512...
+    qho = QuantumHarmonicOscillator(5000, 1.0, quartic=1.0)
+    eigenvalues, eigenvectors = qho.find_eigenstates(k=2)
+    assert abs(eigenvalues[0].item() - 0.8037706512) < 1e-6
+    ground_state = eigenvectors[:, 0].double().numpy()
+    residual = qho.operator('sparse') @ ground_state - eigenvalues[0].item() * ground_state
+    assert abs(residual).max() < 1e-4
+
+def test_anharmonic_sweep_and_linear_operator():
+    qho = QuantumHarmonicOscillator(30, 1.0, quartic=0.1)
+    energies = qho.sweep([1.0, 2.0], k=2)
+    for row, omega in zip(energies, [1.0, 2.0]):
+        expected, _ = QuantumHarmonicOscillator(30, omega, quartic=0.1).find_eigenstates(k=2)
+        assert torch.allclose(row.float(), expected, atol=1e-5)
+    eigenvalues, _ = qho.lowest_eigenpairs(k=2)
+    assert torch.allclose(eigenvalues, energies[0], atol=1e-8)
+
+def test_lowest_eigenpairs_of_large_anharmonic_oscillator():
+    # Plain Lanczos does not converge here, the top of the quartic spectrum is too far from its bottom
+    qho = QuantumHarmonicOscillator(3000, 1.0, quartic=0.1)
+    eigenvalues, eigenvectors = qho.lowest_eigenpairs(k=4)
+    expected, _ = qho.find_eigenstates(k=4)
+    assert torch.allclose(eigenvalues.float(), expected, atol=1e-5)
+    residual = qho.operator('sparse') @ eigenvectors[:, 0].numpy() - eigenvalues[0].item() * eigenvectors[:, 0].numpy()
+    assert abs(residual).max() < 1e-8
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import torch
+from qham.TFIM.checkpoint import Checkpoint
+from qham.TFIM.packed import PackedTFIMSimulation
+from qham.TFIM.tfim import TFIMSimulation
+
+class Preempted(Exception):
+    pass
+
+def preempt_after(sim, steps):
+    step = sim.tfim_step
+    calls = []
+    def interrupted():
+        if len(calls) == steps:
+            raise Preempted()
+        calls.append(None)
+        step()
+    sim.tfim_step = interrupted
+
+def test_resume_is_bitwise_exact(tmp_path):
+    torch.manual_seed(0)
+    reference = TFIMSimulation(8, [0.3, 0.5], 0.05, 40)
+    expected = reference.run_simulation(measure=True, thermalization=5)
+
+    torch.manual_seed(0)
+    interrupted = TFIMSimulation(8, [0.3, 0.5], 0.05, 40)
+    preempt_after(interrupted, 27)
+    checkpoint = Checkpoint(str(tmp_path))
+    with pytest.raises(Preempted):
+        interrupted.run_simulation(measure=True, thermalization=5, checkpoint=checkpoint, checkpoint_interval=10)
+
+    torch.manual_seed(123)
+    resumed = TFIMSimulation(8, [0.3, 0.5], 0.05, 40)
+    observables = resumed.run_simulation(measure=True, thermalization=5, checkpoint=checkpoint, checkpoint_interval=10)
+    assert torch.equal(resumed.lattice, reference.lattice)
+    assert torch.equal(resumed.exchange_accepted, reference.exchange_accepted)
+    assert observables.count == expected.count == 35
+    assert np.array_equal(observables.mean('energy'), expected.mean('energy'))
+
+def test_finished_run_is_not_repeated(tmp_path):
+    torch.manual_seed(1)
+    checkpoint = Checkpoint(str(tmp_path))
+    sim = TFIMSimulation(6, 0.4, 0.05, 10)
+    sim.run_simulation(checkpoint=checkpoint)
+    lattice = sim.lattice.clone()
+    again = TFIMSimulation(6, 0.4, 0.05, 10)
+    again.run_simulation(checkpoint=checkpoint)
+    assert torch.equal(again.lattice, lattice)
+
+def test_snapshots_are_appended_and_truncated_on_resume(tmp_path):
+    torch.manual_seed(2)
+    checkpoint = Checkpoint(str(tmp_path))
+    sim = TFIMSimulation(6, 0.4, 0.05, 20, update='checkerboard')
+    preempt_after(sim, 13)
+    with pytest.raises(Preempted):
+        sim.run_simulation(checkpoint=checkpoint, checkpoint_interval=10, snapshot_interval=2)
+    assert checkpoint.snapshots().shape == (6, 6, 6)
+    resumed = TFIMSimulation(6, 0.4, 0.05, 20, update='checkerboard')
+    resumed.run_simulation(checkpoint=checkpoint, checkpoint_interval=10, snapshot_interval=2)
+    snapshots = checkpoint.snapshots()
+    assert snapshots.shape == (10, 6, 6)
+    assert snapshots.dtype == np.int8
+    assert np.array_equal(snapshots[-1], resumed.lattice.numpy())
+    assert np.array_equal(np.load(tmp_path / 'snapshots.npy'), snapshots)
+
+def test_packed_lattice_checkpoint(tmp_path):
+    torch.manual_seed(3)
+    reference = PackedTFIMSimulation(64, 0.4, 0.05, 6)
+    reference.run_simulation()
+    torch.manual_seed(3)
+    checkpoint = Checkpoint(str(tmp_path))
+    interrupted = PackedTFIMSimulation(64, 0.4, 0.05, 6)
+    preempt_after(interrupted, 4)
+    with pytest.raises(Preempted):
+        interrupted.run_simulation(checkpoint=checkpoint, checkpoint_interval=3)
+    resumed = PackedTFIMSimulation(64, 0.4, 0.05, 6)
+    resumed.run_simulation(checkpoint=checkpoint, checkpoint_interval=3)
+    assert np.array_equal(resumed.lattice.words, reference.lattice.words)
+
+def test_checkpoint_rejects_other_lattice(tmp_path):
+    checkpoint = Checkpoint(str(tmp_path))
+    checkpoint.save(TFIMSimulation(4, 0.4, 0.0, 1), 0)
+    with pytest.raises(ValueError):
+        checkpoint.save(TFIMSimulation(6, 0.4, 0.0, 1), 0)
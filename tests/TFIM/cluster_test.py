@@ -0,0 +1,47 @@
+import torch
+from qham.TFIM.cluster import square_lattice_neighbors, wolff_update, swendsen_wang_update
+from qham.TFIM.tfim import TFIMSimulation
+
+def test_square_lattice_neighbors():
+    neighbors = square_lattice_neighbors(4)
+    assert neighbors.shape == (16, 4)
+    # Site (0, 0): down (1, 0), up (3, 0), right (0, 1), left (0, 3)
+    assert neighbors[0].tolist() == [4, 12, 1, 3]
+
+def test_wolff_flips_whole_aligned_lattice_at_low_temperature():
+    torch.manual_seed(0)
+    lattice = torch.ones(6, 6)
+    flipped, cluster_size = wolff_update(lattice, 50.0)
+    assert cluster_size == 36
+    assert torch.all(flipped == -1)
+
+def test_wolff_cluster_is_single_site_at_infinite_temperature():
+    torch.manual_seed(0)
+    lattice = torch.ones(6, 6)
+    flipped, cluster_size = wolff_update(lattice, 0.0)
+    assert cluster_size == 1
+    assert (flipped == -1).sum() == 1
+
+def test_swendsen_wang_clusters():
+    torch.manual_seed(0)
+    lattice = torch.ones(6, 6)
+    _, num_clusters = swendsen_wang_update(lattice, 0.0)
+    assert num_clusters == 36
+    updated, num_clusters = swendsen_wang_update(lattice, 50.0)
+    assert num_clusters == 1
+    assert torch.all(updated == updated[0, 0])
+
+def test_cluster_updates_order_the_cold_lattice():
+    torch.manual_seed(0)
+    for update in ('wolff', 'swendsen-wang'):
+        sim = TFIMSimulation(8, 1.0, 0.0, 20, update=update)
+        sim.run_simulation()
+        assert sim.lattice.mean().abs() > 0.9
+
+def test_cluster_updates_with_replicas():
+    torch.manual_seed(0)
+    sim = TFIMSimulation(6, [0.2, 1.0], 0.0, 10, update='swendsen-wang')
+    assert sim.update == 'swendsen-wang'
+    sim.run_simulation()
+    assert sim.lattice.shape == (2, 6, 6)
+    assert torch.all(sim.lattice.abs() == 1)
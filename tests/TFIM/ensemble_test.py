@@ -0,0 +1,49 @@
+import torch
+from qham.TFIM.ensemble import expand_grid, run_ensemble
+from qham.TFIM.pimc import PathIntegralTFIM
+from qham.TFIM.tfim import TFIMSimulation
+
+def test_expand_grid():
+    grid = expand_grid({'size': [4, 8], 'beta': [0.3, 0.5, 0.7]})
+    assert len(grid) == 6
+    assert grid[0] == {'size': 4, 'beta': 0.3}
+    assert grid[-1] == {'size': 8, 'beta': 0.7}
+    assert expand_grid([{'size': 4}]) == [{'size': 4}]
+
+def test_run_ensemble_is_reproducible_across_worker_counts():
+    grid = {'size': [4, 6], 'beta': [0.3, 0.8], 'h': [0.0], 'steps': [20], 'update': ['checkerboard']}
+    parallel = run_ensemble(grid, n_workers=2, seed=3, measure=True, thermalization=5)
+    serial = run_ensemble(grid, n_workers=1, seed=3, measure=True, thermalization=5)
+    assert [result['params'] for result in parallel] == expand_grid(grid)
+    for a, b in zip(parallel, serial):
+        assert a['lattice'].shape == (a['params']['size'],) * 2
+        assert torch.equal(a['lattice'], b['lattice'])
+        assert a['observables']['energy'] == b['observables']['energy']
+        assert a['observables']['count'] == 15
+
+def test_run_ensemble_seeds_every_task_independently():
+    results = run_ensemble([{'size': 8, 'steps': 1}] * 2, n_workers=1, seed=0)
+    assert not torch.equal(results[0]['lattice'], results[1]['lattice'])
+    assert results[0]['observables'] is None
+
+def test_run_ensemble_with_other_simulations():
+    results = run_ensemble([{'size': 4, 'beta': 2.0, 'h': 1.0, 'steps': 2, 'slices': 8}], n_workers=2, seed=1,
+                           simulation=PathIntegralTFIM)
+    assert results[0]['lattice'].shape == (8, 4, 4)
+    assert torch.all(results[0]['lattice'].abs() == 1)
+
+def test_lattice_shapes_are_derived_from_params():
+    assert TFIMSimulation.lattice_shape(size=6) == (6, 6)
+    assert TFIMSimulation.lattice_shape(size=4, beta=[0.2, 0.4, 0.6]) == (3, 4, 4)
+    assert TFIMSimulation.lattice_shape() == tuple(TFIMSimulation(steps=0).lattice.shape)
+    assert PathIntegralTFIM.lattice_shape(size=4, slices=6) == (6, 4, 4)
+    assert PathIntegralTFIM.lattice_shape() == tuple(PathIntegralTFIM(steps=0).lattice.shape)
+
+def test_serial_ensemble_leaves_caller_state_alone():
+    torch.manual_seed(5)
+    expected = torch.rand(3)
+    threads = torch.get_num_threads()
+    torch.manual_seed(5)
+    run_ensemble([{'size': 4, 'steps': 1}], n_workers=1, seed=0, threads_per_worker=threads + 1)
+    assert torch.equal(torch.rand(3), expected)
+    assert torch.get_num_threads() == threads
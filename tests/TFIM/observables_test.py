@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+import torch
+from qham.TFIM.observables import BinningAccumulator, TFIMObservables
+from qham.TFIM.tfim import TFIMSimulation
+
+def test_binning_accumulator_matches_numpy():
+    values = np.random.default_rng(0).normal(size=1000)
+    accumulator = BinningAccumulator()
+    for value in values:
+        accumulator.add(value)
+    assert accumulator.count == 1000
+    assert np.isclose(accumulator.mean, values.mean())
+    assert np.isclose(accumulator.variance, values.var(ddof=1))
+    assert np.isclose(accumulator.level_errors()[0], values.std(ddof=1) / np.sqrt(1000))
+    # Uncorrelated samples have tau_int close to 1/2
+    assert 0.3 < accumulator.tau_int() < 1.0
+
+def test_binning_accumulator_detects_autocorrelation():
+    rng = np.random.default_rng(1)
+    accumulator = BinningAccumulator()
+    x = 0.0
+    for _ in range(2**15):
+        x = 0.9 * x + rng.normal()
+        accumulator.add(x)
+    # tau_int = (1 + a) / (2 * (1 - a)) = 9.5 for an AR(1) process
+    assert 6 < accumulator.tau_int() < 14
+    assert accumulator.error() > 3 * accumulator.level_errors()[0]
+
+def test_binning_accumulator_reports_infinite_error_without_enough_bins():
+    accumulator = BinningAccumulator(min_bins=32)
+    for value in range(10):
+        accumulator.add([value, -value])
+    assert np.all(np.isinf(accumulator.error()))
+    assert np.allclose(accumulator.mean, [4.5, -4.5])
+
+def test_observables_of_ordered_lattice():
+    observables = TFIMObservables(16, [0.5, 1.0])
+    for _ in range(4):
+        observables.add([1.0, 1.0], [-2.0, -2.0])
+    assert np.allclose(observables.mean('magnetization'), 1.0)
+    assert np.allclose(observables.susceptibility(), 0.0)
+    assert np.allclose(observables.specific_heat(), 0.0)
+    assert np.allclose(observables.binder_cumulant(), 2 / 3)
+    with pytest.raises(ValueError):
+        observables.error('entropy')
+
+def test_run_simulation_streams_observables():
+    torch.manual_seed(0)
+    sim = TFIMSimulation(8, 0.6, 0.0, 50, update='checkerboard')
+    assert sim.run_simulation() is None
+    observables = sim.run_simulation(measure=True, thermalization=10)
+    assert observables.count == 40
+    summary = observables.summary()
+    assert summary['magnetization'] > 0.9
+    assert summary['energy'] < -1.5
+
+def test_run_simulation_stops_at_target_error():
+    torch.manual_seed(0)
+    sim = TFIMSimulation(8, [0.2, 0.3], 0.0, 10000, update='checkerboard')
+    observables = sim.run_simulation(target_error=0.01)
+    assert observables.count < 10000
+    assert np.all(observables.error('energy') <= 0.01)
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+import torch
+from qham.TFIM.packed import PackedLattice, PackedTFIMSimulation
+from qham.TFIM.tfim import TFIMSimulation
+
+def test_packed_lattice_round_trip():
+    torch.manual_seed(0)
+    lattice = torch.randint(2, (64, 64), dtype=torch.float32) * 2 - 1
+    packed = PackedLattice.from_tensor(lattice)
+    assert packed.words.shape == (64, 1)
+    assert packed.words.dtype == np.uint64
+    assert torch.equal(packed.to_tensor(), lattice)
+
+def test_packed_lattice_rejects_bad_size():
+    with pytest.raises(ValueError):
+        PackedLattice(np.zeros((32, 1), dtype=np.uint64))
+    with pytest.raises(ValueError):
+        PackedTFIMSimulation(size=100)
+    with pytest.raises(ValueError):
+        PackedTFIMSimulation(size=64, beta=[0.3, 0.4])
+
+def test_neighbor_words_match_roll():
+    torch.manual_seed(1)
+    lattice = torch.randint(2, (128, 128), dtype=torch.float32) * 2 - 1
+    packed = PackedLattice.from_tensor(lattice)
+    expected = [torch.roll(lattice, -1, 0), torch.roll(lattice, 1, 0), torch.roll(lattice, -1, 1), torch.roll(lattice, 1, 1)]
+    for words, neighbor in zip(packed.neighbor_words(), expected):
+        assert torch.equal(PackedLattice(words).to_tensor(), neighbor)
+
+def test_packed_energy_and_magnetization_match_tensor():
+    torch.manual_seed(2)
+    sim = TFIMSimulation(64, 0.4, 0.0, 1)
+    packed = PackedLattice.from_tensor(sim.lattice)
+    assert packed.energy() == sim.energy().item()
+    assert packed.magnetization() == sim.magnetization().item()
+
+def test_random_bits_probability():
+    sim = PackedTFIMSimulation(64, 0.4, 0.0, 1, seed=3)
+    bits = PackedLattice(sim.random_bits(0.3, (64, 1))).numpy()
+    assert abs((bits < 0).mean() - 0.3) < 0.03
+    assert not sim.random_bits(0.0, (4,)).any()
+
+def test_packed_simulation_matches_tensor_energy():
+    torch.manual_seed(4)
+    packed = PackedTFIMSimulation(64, 0.3, 0.0, 200)
+    tensor = TFIMSimulation(64, 0.3, 0.0, 200, update='checkerboard')
+    packed_energy = packed.run_simulation(measure=True, thermalization=50).mean('energy')
+    tensor_energy = tensor.run_simulation(measure=True, thermalization=50).mean('energy')
+    assert abs(packed_energy - tensor_energy) < 0.02
+
+def test_packed_simulation_orders_at_low_temperature():
+    torch.manual_seed(5)
+    sim = PackedTFIMSimulation(64, 2.0, 0.0, 5)
+    sim.lattice = PackedLattice.from_tensor(torch.ones(64, 64))
+    sim.run_simulation()
+    assert sim.lattice.magnetization() == 64 * 64
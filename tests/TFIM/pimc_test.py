@@ -0,0 +1,45 @@
+import math
+import numpy as np
+import pytest
+import torch
+from qham.TFIM.pimc import PathIntegralTFIM
+
+def exact_energy_2x2(beta, h):
+    # -sum_i Z_i (Z_{i+x} + Z_{i+y}) - h sum_i X_i on the periodic 2x2 lattice, where every bond appears twice
+    states = np.arange(16)
+    z = 1 - 2 * ((states[:, None] >> np.arange(4)) & 1)
+    H = np.diag(-2.0 * (z[:, 0] * z[:, 1] + z[:, 0] * z[:, 2] + z[:, 1] * z[:, 3] + z[:, 2] * z[:, 3]))
+    for site in range(4):
+        H[states, states ^ (1 << site)] -= h
+    energies = np.linalg.eigvalsh(H)
+    weights = np.exp(-beta * (energies - energies[0]))
+    return (weights * energies).sum() / weights.sum()
+
+def test_couplings():
+    sim = PathIntegralTFIM(4, beta=2.0, h=1.0, steps=1, slices=8)
+    assert sim.lattice.shape == (8, 4, 4)
+    assert sim.spatial_coupling == 0.25
+    assert math.isclose(sim.temporal_coupling, -0.5 * math.log(math.tanh(0.25)))
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        PathIntegralTFIM(4, slices=7)
+    with pytest.raises(ValueError):
+        PathIntegralTFIM(4, h=0.0)
+    with pytest.raises(ValueError):
+        PathIntegralTFIM(4, beta=[1.0, 2.0])
+
+def test_estimators_of_uniform_lattice():
+    sim = PathIntegralTFIM(4, beta=2.0, h=1.0, steps=1, slices=8)
+    sim.lattice = torch.ones(8, 4, 4)
+    assert sim.magnetization().item() == 16
+    assert math.isclose(sim.transverse_magnetization().item(), 16 * math.tanh(0.25), rel_tol=1e-6)
+    assert math.isclose(sim.energy().item(), -32 - 16 * math.tanh(0.25), rel_tol=1e-6)
+
+def test_energy_matches_exact_diagonalization():
+    torch.manual_seed(0)
+    sim = PathIntegralTFIM(2, beta=1.0, h=1.5, steps=2000, slices=32)
+    observables = sim.run_simulation(measure=True, thermalization=200)
+    assert abs(observables.mean('energy') - exact_energy_2x2(1.0, 1.5) / 4) < 0.08
+    assert 0 < observables.mean('transverse') < 1
+    assert 'transverse' in observables.summary()
@@ -0,0 +1,22 @@
+import numpy as np
+from qiskit.quantum_info import Operator
+from qham.TFIM.tfimh import create_tfim_hamiltonian
+from qham.TFIM.tfimq import create_tfim_circuit
+from qham.evolution import krylov_expm_multiply
+
+def test_tfim_hamiltonian_is_hermitian():
+    H = create_tfim_hamiltonian(4, J=1.0, h=0.5, periodic_boundary=True)
+    assert H.shape == (16, 16)
+    assert np.allclose(H.toarray(), H.toarray().T)
+    # The all-up state has energy -J per bond on the periodic chain
+    assert np.isclose(H[0, 0], -4.0)
+
+def test_trotter_layer_error_is_second_order():
+    H = create_tfim_hamiltonian(4, J=1.0, h=0.7)
+    psi = np.zeros(16, dtype=complex)
+    psi[5] = 1
+    errors = []
+    for dt in [0.02, 0.01]:
+        qc = create_tfim_circuit(4, -2 * dt, -2 * 0.7 * dt)
+        errors.append(np.linalg.norm(Operator(qc).data @ psi - krylov_expm_multiply(H, psi, dt)))
+    assert 3.5 < errors[0] / errors[1] < 4.5
@@ -1,7 +1,8 @@
 from qiskit.circuit.library import CXGate, RZGate, RXGate
 from qiskit.circuit import QuantumCircuit, Parameter
 import pytest
-from qham.TFIM.tfimq import create_tfim_circuit  
+from qiskit.quantum_info import Operator
+from qham.TFIM.tfimq import create_tfim_circuit, tfim_circuit_template, bind_tfim_circuit
 
 def test_create_tfim_circuit_without_periodic_boundary():
     n_qubits = 4
@@ -37,3 +38,29 @@ def test_create_tfim_circuit_gate_types():
     # Check if gate types in circuit match expected types
     gates = [data[0] for data in qc.data]
     assert all(isinstance(gate, (CXGate, RZGate, RXGate)) for gate in gates)
+
+def test_create_tfim_circuit_trotter_steps():
+    qc = create_tfim_circuit(4, 0.3, 0.7, trotter_steps=3)
+    assert len(qc.data) == 3 * (3 * 3 + 4)
+
+def test_tfim_circuit_template_is_cached_and_parameterized():
+    template = tfim_circuit_template(4, True, 2)
+    assert tfim_circuit_template(4, True, 2) == template
+    assert sorted(parameter.name for parameter in template.parameters) == ['theta_x', 'theta_z']
+    # One native RZZ per bond and one RX per qubit in each layer
+    assert template.count_ops() == {'rzz': 8, 'rx': 8}
+
+def test_tfim_circuit_template_returns_independent_copies():
+    template = tfim_circuit_template(3)
+    template.barrier()
+    template.rx(0.1, 0)
+    assert 'barrier' not in tfim_circuit_template(3).count_ops()
+    assert 'barrier' not in bind_tfim_circuit(3, 0.1, 0.2).count_ops()
+
+@pytest.mark.parametrize("periodic_boundary", [False, True])
+def test_bind_tfim_circuit_matches_create_tfim_circuit(periodic_boundary):
+    # Both functions take the same positional parameters
+    reference = create_tfim_circuit(4, 0.3, 0.7, periodic_boundary, 2)
+    bound = bind_tfim_circuit(4, 0.3, 0.7, periodic_boundary, 2)
+    assert not bound.parameters
+    assert Operator(bound).equiv(Operator(reference))
@@ -0,0 +1,23 @@
+import numpy as np
+from math import comb
+from qham.basis import binomial_table, popcount, rank_states, unrank_states, combination_states
+
+def test_binomial_table():
+    table = binomial_table(6)
+    assert table[6, 3] == 20
+    assert table[2, 5] == 0
+
+def test_popcount():
+    states = np.array([0, 1, 3, 0b101101, 2**40 - 1])
+    assert np.array_equal(popcount(states), [0, 1, 2, 4, 40])
+
+def test_combination_states_are_sorted_and_complete():
+    states = combination_states(6, 2)
+    assert len(states) == comb(6, 2)
+    assert np.all(np.diff(states) > 0)
+    assert np.all(popcount(states) == 2)
+
+def test_rank_unrank_roundtrip():
+    ranks = np.arange(comb(10, 4))
+    states = unrank_states(ranks, 10, 4)
+    assert np.array_equal(rank_states(states, 10), ranks)
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+from benchmarks.core import compare, measure
+from benchmarks.run import main
+from benchmarks.suites import SUITES, collect
+
+def test_every_suite_has_quick_cases():
+    for name in SUITES:
+        cases = collect([name], quick=True)
+        assert cases
+        assert len({case.key for case in cases}) == len(cases)
+
+def test_measure():
+    case, = collect(['ed'], quick=True, pattern='heisenberg.build_hamiltonian[N=4]')
+    result = measure(case, repeat=2)
+    assert result['key'] == 'heisenberg.build_hamiltonian[N=4]'
+    assert result['params'] == {'N': 4}
+    assert 0 < result['time']['min'] <= result['time']['median'] <= result['time']['max']
+    assert result['peak_memory'] > 0
+    assert result['throughput'] > 0
+
+def test_compare_flags_regressions():
+    old = {'key': 'a', 'time': {'median': 1.0}, 'peak_memory': 100}
+    faster = {'key': 'a', 'time': {'median': 1.2}, 'peak_memory': 105}
+    slower = {'key': 'a', 'time': {'median': 1.5}, 'peak_memory': 100}
+    assert not compare([faster], [old])[0]['regression']
+    assert compare([slower], [old])[0]['regression']
+    assert compare([slower], [old], time_threshold=0.6)[0]['regression'] is False
+    assert compare([slower], [{**old, 'key': 'b'}]) == []
+
+def test_run_writes_json_and_gates_on_baseline(tmp_path):
+    output = tmp_path / 'results.json'
+    key = 'tfim.create_tfim_circuit[n_qubits=4,trotter_steps=1]'
+    arguments = ['--suite', 'circuits', '--quick', '--repeat', '1', '-k', key]
+    assert main(arguments + ['--output', str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert [result['key'] for result in report['results']] == [key]
+    assert 'torch' in report['environment']
+    report['results'][0]['time']['median'] /= 100
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(report))
+    assert main(arguments + ['--baseline', str(baseline)]) == 1
+
+def test_help_describes_the_runner(capsys):
+    with pytest.raises(SystemExit):
+        main(['--help'])
+    assert 'benchmark suites' in capsys.readouterr().out
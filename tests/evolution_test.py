@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from scipy.linalg import expm
+from qham.evolution import evolve, expectation, krylov_expm_multiply
+from qham.HBM.hmb import HeisenbergModel
+from qham.QHO.qho import QuantumHarmonicOscillator
+from qham.TFIM.tfimh import create_tfim_hamiltonian
+
+def test_krylov_step_matches_dense_exponential():
+    H = create_tfim_hamiltonian(5, J=1.0, h=0.7, periodic_boundary=True)
+    psi = np.zeros(32, dtype=complex)
+    psi[3] = 1
+    result = krylov_expm_multiply(H, psi, 2.5, krylov_dim=10)
+    assert np.allclose(result, expm(-2.5j * H.toarray()) @ psi)
+
+def test_evolve_streams_states_on_grid():
+    model = HeisenbergModel(6, 1.0)
+    rng = np.random.default_rng(1)
+    psi0 = rng.standard_normal(64)
+    psi0 /= np.linalg.norm(psi0)
+    H = model.build_sparse_hamiltonian().toarray()
+    times = [0.0, 0.3, 1.0]
+    for t, state in evolve(model, psi0, times):
+        assert np.allclose(state, expm(-1j * t * H) @ psi0)
+
+def test_evolve_observables_conserve_energy():
+    model = HeisenbergModel(8, -1.0)
+    psi0 = np.zeros(2**8)
+    psi0[0b10110010] = 1
+    energy0 = expectation(model, psi0)
+    results = list(evolve(model, psi0, np.linspace(0, 2, 5), observables={'energy': model, 'norm': np.linalg.norm}))
+    assert len(results) == 5
+    for _, values in results:
+        assert np.isclose(values['energy'], energy0)
+        assert np.isclose(values['norm'], 1.0)
+
+def test_evolve_rejects_decreasing_times():
+    with pytest.raises(ValueError):
+        list(evolve(np.eye(2), [1.0, 0.0], [1.0, 0.0]))
+
+def test_evolve_complex_state_of_oscillator():
+    model = QuantumHarmonicOscillator(40, 1.0, displacement=0.3, quartic=0.05)
+    rng = np.random.default_rng(2)
+    psi0 = rng.standard_normal(40) + 1j * rng.standard_normal(40)
+    psi0 /= np.linalg.norm(psi0)
+    H = model.operator('sparse').toarray()
+    assert np.allclose(krylov_expm_multiply(model, psi0, 0.7), expm(-0.7j * H) @ psi0)
+    for t, state in evolve(model, psi0, [0.0, 0.5, 1.0]):
+        assert np.allclose(state, expm(-1j * t * H) @ psi0)
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ('torch', 'scipy', 'matplotlib', 'qiskit')
+
+def loaded_after(statement):
+    code = f"import sys\n{statement}\nprint(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+def test_import_qham_loads_no_heavy_modules():
+    assert loaded_after("import qham; import qham.FHM, qham.HBM, qham.QHO, qham.TFIM") == set()
+
+def test_models_do_not_load_plotting_or_circuits():
+    assert loaded_after("from qham import QuantumHarmonicOscillator") == {'torch', 'scipy'}
+    assert loaded_after("from qham import HubbardModel, HeisenbergModel, TFIMSimulation, SquareLattice") == {
+        'torch', 'scipy'}
+
+def test_circuit_functions_load_qiskit_on_call():
+    assert 'qiskit' not in loaded_after("from qham import create_tfim_circuit, create_heisenberg_circuit")
+    assert 'qiskit' in loaded_after("import qham; qham.create_heisenberg_circuit(3)")
+
+def test_lazy_attributes():
+    import qham
+    from qham.TFIM.tfim import TFIMSimulation
+    assert qham.TFIMSimulation is TFIMSimulation
+    assert 'TFIMSimulation' in dir(qham)
+    assert qham.TFIM.tfimq.create_tfim_circuit is qham.create_tfim_circuit
+    with pytest.raises(AttributeError):
+        qham.missing
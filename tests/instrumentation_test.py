@@ -0,0 +1,105 @@
+import pytest
+import torch
+from qham import instrumentation
+from qham.FHM.fhm import HubbardModel
+from qham.HBM.hmb import HeisenbergModel
+from qham.HBM.hmbslq import SquareLattice, create_heisenberg_lattice_circuit
+from qham.QHO.qho import QuantumHarmonicOscillator
+from qham.TFIM.tfim import TFIMSimulation
+from qham.instrumentation import instrumented
+
+def test_disabled_instrumentation_passes_calls_through():
+    calls = []
+    function = instrumented()(lambda x: calls.append(x) or x)
+    assert not instrumentation.enabled()
+    assert function(3) == 3
+    assert calls == [3]
+
+def test_record_reports_build_and_solve_phases():
+    model = HubbardModel(2, 1.0, 4.0, sparse=True)
+    with instrumentation.record() as registry:
+        model.diagonalize()
+    assert not instrumentation.enabled()
+    summary = registry.summary()
+    sparse = summary['HubbardModel.create_sparse_hamiltonian']
+    assert sparse['calls'] == 1 and sparse['dim'] == 16 and sparse['nnz'] > 0
+    assert summary['HubbardModel.diagonalize']['eigenpairs'] == 16
+    assert all(event['peak_memory'] is None for event in registry.events)
+
+def test_model_metrics():
+    with instrumentation.record() as registry:
+        HeisenbergModel(4, 1.0).solve_eigenvalues()
+        QuantumHarmonicOscillator(10, 1.0).find_eigenstates()
+        create_heisenberg_lattice_circuit(SquareLattice(2, 2), 0.1)
+    summary = registry.summary()
+    assert summary['HeisenbergModel.build_hamiltonian']['dim'] == 16
+    assert summary['HeisenbergModel.solve_eigenvalues']['eigenpairs'] == 16
+    assert summary['QuantumHarmonicOscillator.find_eigenstates']['dim'] == 10
+    circuit = summary['create_heisenberg_lattice_circuit']
+    assert circuit['qubits'] == 4 and circuit['gates'] > 0 and circuit['depth'] > 0
+
+def test_simulation_reports_sweeps_per_second():
+    torch.manual_seed(0)
+    simulation = TFIMSimulation(size=4, steps=7, update='checkerboard')
+    with instrumentation.record() as registry:
+        simulation.run_simulation()
+    event, = registry.events
+    assert event['name'] == 'TFIMSimulation.run_simulation'
+    assert event['sweeps'] == 7 and event['size'] == 4
+    assert event['sweeps_per_second'] == pytest.approx(7 / event['time'])
+
+def test_peak_memory_of_nested_calls():
+    @instrumented(name='inner')
+    def inner():
+        return bytearray(4_000_000)
+
+    @instrumented(name='outer')
+    def outer():
+        inner()
+        return bytearray(1_000_000)
+
+    with instrumentation.record(memory=True) as registry:
+        outer()
+    inner_event, outer_event = registry.events
+    assert inner_event['name'] == 'inner' and outer_event['name'] == 'outer'
+    assert inner_event['peak_memory'] >= 4_000_000
+    assert outer_event['peak_memory'] >= inner_event['peak_memory']
+    assert not instrumentation.set_memory_tracking(False)
+
+def test_callbacks_receive_events_until_removed():
+    events = []
+    function = instrumented(lambda result, x: {'value': result}, name='double')(lambda x: 2 * x)
+    instrumentation.add_callback(events.append)
+    try:
+        function(2)
+    finally:
+        instrumentation.remove_callback(events.append)
+    function(3)
+    assert [(event['name'], event['value']) for event in events] == [('double', 4)]
+
+def test_failed_calls_are_not_reported():
+    function = instrumented()(lambda: 1 / 0)
+    with instrumentation.record(memory=True) as registry:
+        with pytest.raises(ZeroDivisionError):
+            function()
+    assert registry.events == []
+    assert not instrumentation._frames
+
+def test_peak_memory_without_reset_peak(monkeypatch):
+    # Python 3.8 has no tracemalloc.reset_peak; peaks then become upper bounds instead of failing
+    monkeypatch.setattr(instrumentation, '_reset_peak', None)
+
+    @instrumented(name='inner')
+    def inner():
+        return bytearray(2_000_000)
+
+    @instrumented(name='outer')
+    def outer():
+        inner()
+
+    with instrumentation.record(memory=True) as registry:
+        outer()
+    inner_event, outer_event = registry.events
+    assert inner_event['peak_memory'] >= 2_000_000
+    assert outer_event['peak_memory'] >= inner_event['peak_memory']
+
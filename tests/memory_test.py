@@ -0,0 +1,103 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import torch
+from scipy.sparse.linalg import LinearOperator
+from qham.FHM.fhm import HubbardModel
+from qham.HBM.hmb import HeisenbergModel
+from qham.QHO.qho import QuantumHarmonicOscillator
+from qham.memory import (MemoryBudgetError, get_memory_budget, parse_bytes, select_representation,
+                         set_memory_budget)
+
+@pytest.fixture
+def budget():
+    previous = set_memory_budget(None)
+    yield set_memory_budget
+    set_memory_budget(previous)
+
+def test_parse_bytes():
+    assert parse_bytes(1024) == 1024
+    assert parse_bytes('512M') == 512 * 2**20
+    assert parse_bytes('1.5GiB') == 3 * 2**29
+    assert parse_bytes(' 2gib ') == 2**31
+    assert parse_bytes('100B') == 100
+
+def test_budget_precedence(budget, monkeypatch):
+    monkeypatch.setenv('QHAM_MEMORY_BUDGET', '2K')
+    assert get_memory_budget() == 2048
+    budget('1M')
+    assert get_memory_budget() == 2**20
+
+def test_construction_is_deferred(budget):
+    budget('1G')
+    model = HubbardModel(num_sites=9, t=1.0, U=2.0)
+    assert model.estimate_memory('dense') > 4**18 * 8
+    with pytest.raises(MemoryBudgetError, match='dense Hubbard'):
+        model.H
+
+def test_hubbard_estimates_bound_the_sparse_matrix():
+    for kwargs in ({}, {'n_up': 2, 'n_down': 1}):
+        model = HubbardModel(num_sites=4, t=1.0, U=2.0, **kwargs)
+        assert model.nnz() >= model.create_sparse_hamiltonian().nnz
+        assert model.estimate_memory('dense') > model.create_hamiltonian().nbytes
+
+def test_hubbard_dense_estimate_bounds_the_build():
+    model = HubbardModel(num_sites=5, t=1.0, U=2.0)
+    tracemalloc.start()
+    try:
+        model.create_hamiltonian()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    # The templates and the CSR matrix are counted alongside the dense matrix
+    assert peak <= 1.01 * model.estimate_memory('dense')
+
+def test_heisenberg_dense_estimate_bounds_the_build():
+    model = HeisenbergModel(10, 1.0)
+    model.matvec_engine()
+    tracemalloc.start()
+    try:
+        H = model.build_hamiltonian()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    assert H.dtype == torch.complex64
+    # Only small index arrays of the sparse assembly are not counted
+    assert peak <= 1.01 * model.estimate_memory('dense')
+
+def test_auto_falls_back_to_leaner_representations(budget):
+    model = HeisenbergModel(10, 1.0)
+    budget(model.estimate_memory('dense'))
+    assert isinstance(model.operator(), torch.Tensor)
+    budget(model.estimate_memory('sparse'))
+    assert sp.issparse(model.operator())
+    budget(model.estimate_memory('matrix-free'))
+    operator = model.operator()
+    assert isinstance(operator, LinearOperator)
+    psi = np.random.default_rng(0).standard_normal(2**10)
+    np.testing.assert_allclose(operator @ psi, model.matvec_engine().apply(psi))
+    with pytest.raises(MemoryBudgetError):
+        model.operator('sparse')
+    budget(16)
+    with pytest.raises(MemoryBudgetError, match='matrix-free'):
+        select_representation(model)
+
+def test_hubbard_falls_back_to_sparse(budget):
+    model = HubbardModel(num_sites=3, t=1.0, U=2.0)
+    budget(model.estimate_memory('dense') - 1)
+    H = model.operator()
+    assert sp.issparse(H)
+    budget(None)
+    np.testing.assert_allclose(H.toarray(), model.H)
+
+def test_oscillator_estimates(budget):
+    qho = QuantumHarmonicOscillator(n=100, omega=1.0)
+    assert qho.estimate_memory('dense') == qho.hamiltonian.element_size() * qho.hamiltonian.numel()
+    budget(qho.estimate_memory('sparse'))
+    H = qho.operator()
+    assert sp.issparse(H)
+    np.testing.assert_allclose(H.diagonal(), np.arange(100) + 0.5)
+    with pytest.raises(ValueError):
+        qho.estimate_memory('banded')
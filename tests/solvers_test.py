@@ -0,0 +1,21 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from qham.solvers import linear_operator, lowest_eigenpairs
+
+def test_lowest_eigenpairs_of_sparse_matrix():
+    H = sp.diags([np.arange(50.0)[::-1]], [0]) + sp.diags([np.full(49, 0.1), np.full(49, 0.1)], [-1, 1])
+    eigenvalues, eigenvectors = lowest_eigenpairs(H, k=3)
+    expected = np.linalg.eigvalsh(H.toarray())[:3]
+    assert np.allclose(eigenvalues, expected)
+    assert np.all(np.diff(eigenvalues) >= 0)
+
+def test_lowest_eigenpairs_of_linear_operator():
+    diagonal = np.array([3.0, -1.0, 2.0, 0.5])
+    operator = linear_operator(lambda v: diagonal * v, 4)
+    eigenvalues, _ = lowest_eigenpairs(operator, k=4)
+    assert np.allclose(eigenvalues, np.sort(diagonal))
+
+def test_lowest_eigenpairs_rejects_too_many_eigenpairs():
+    with pytest.raises(ValueError):
+        lowest_eigenpairs(np.eye(3), k=4)
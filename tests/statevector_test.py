@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from qiskit.circuit import Parameter, QuantumCircuit
+from qiskit.quantum_info import Statevector, random_statevector
+from qham.statevector import StatevectorSimulator, simulate, zero_state
+from qham.HBM.hmbq import create_heisenberg_circuit
+from qham.HBM.hmbslq import SquareLattice, create_heisenberg_lattice_circuit
+from qham.TFIM.tfimq import create_tfim_circuit, tfim_circuit_template
+
+def random_circuit(num_qubits, num_gates, seed):
+    rng = np.random.default_rng(seed)
+    qc = QuantumCircuit(num_qubits)
+    for _ in range(num_gates):
+        name = rng.choice(['rx', 'rz', 'rxx', 'ryy', 'rzz', 'cx'])
+        first, second = (int(q) for q in rng.choice(num_qubits, 2, replace=False))
+        angle = rng.uniform(-np.pi, np.pi)
+        if name in ('rx', 'rz'):
+            getattr(qc, name)(angle, first)
+        elif name == 'cx':
+            qc.cx(first, second)
+        else:
+            getattr(qc, name)(angle, first, second)
+    return qc
+
+def test_zero_state():
+    assert np.array_equal(zero_state(2), [1, 0, 0, 0])
+    assert zero_state(3, batch=4).shape == (4, 8)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_gates_match_qiskit(seed):
+    qc = random_circuit(4, 40, seed)
+    psi = random_statevector(16, seed=seed)
+    assert np.allclose(simulate(qc, state=psi.data), psi.evolve(qc).data)
+
+def test_heisenberg_lattice_circuit_matches_qiskit():
+    t = Parameter('t')
+    qc = create_heisenberg_lattice_circuit(SquareLattice(2, 3), t)
+    psi = random_statevector(64, seed=3)
+    expected = psi.evolve(qc.assign_parameters({t: 0.3})).data
+    assert np.allclose(simulate(qc, {t: 0.3}, psi.data), expected)
+
+def test_parameter_batch():
+    qc = create_heisenberg_circuit(4, trotter_steps=2)
+    values = np.linspace(0, 1, 5)
+    states = simulate(qc, {'t': values})
+    assert states.shape == (5, 16)
+    for value, state in zip(values, states):
+        expected = Statevector.from_label('0000').evolve(qc.assign_parameters({qc.parameters[0]: value})).data
+        assert np.allclose(state, expected)
+
+def test_tfim_template_batch():
+    template = tfim_circuit_template(5, True, 2)
+    theta_z, theta_x = np.array([0.1, 0.4]), np.array([0.7, -0.2])
+    states = simulate(template, {'theta_z': theta_z, 'theta_x': theta_x})
+    for z, x, state in zip(theta_z, theta_x, states):
+        expected = Statevector.from_label('00000').evolve(create_tfim_circuit(5, z, x, True, trotter_steps=2)).data
+        assert np.allclose(state, expected)
+
+def test_invalid_circuits():
+    qc = QuantumCircuit(2)
+    qc.h(0)
+    with pytest.raises(ValueError):
+        simulate(qc)
+    qc = QuantumCircuit(2)
+    qc.rx(Parameter('a'), 0)
+    with pytest.raises(ValueError):
+        simulate(qc)
+    with pytest.raises(ValueError):
+        StatevectorSimulator(3).run(qc, {'a': 0.1})
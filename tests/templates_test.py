@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from qham.templates import OperatorTemplate
+from qham.solvers import sweep_eigenpairs
+
+def make_template():
+    A = sp.diags([np.arange(6.0)], [0])
+    B = sp.diags([np.ones(5), np.ones(5)], [-1, 1])
+    return A, B, OperatorTemplate({'diagonal': A, 'offdiagonal': B})
+
+def test_assemble_matches_linear_combination():
+    A, B, template = make_template()
+    H = template.assemble(diagonal=2.0, offdiagonal=-0.5)
+    assert np.allclose(H.toarray(), (2.0 * A - 0.5 * B).toarray())
+    assert H.nnz == template.nnz
+
+def test_assemble_dense_stack():
+    A, B, template = make_template()
+    stack = template.assemble_dense([{'diagonal': 1.0}, {'offdiagonal': 3.0}])
+    assert np.allclose(stack[0], A.toarray())
+    assert np.allclose(stack[1], 3.0 * B.toarray())
+
+def test_unknown_term_is_rejected():
+    _, _, template = make_template()
+    with pytest.raises(ValueError):
+        template.assemble(kinetic=1.0)
+
+def test_sweep_dense_and_iterative_paths_agree():
+    _, _, template = make_template()
+    coefficients = [{'diagonal': 1.0, 'offdiagonal': g} for g in np.linspace(0, 2, 5)]
+    dense = sweep_eigenpairs(template, coefficients, k=2, dense=True)
+    iterative = sweep_eigenpairs(template, coefficients, k=2, dense=False)
+    assert dense.shape == (5, 2)
+    assert np.allclose(dense, iterative)
+
+def test_sweep_rejects_too_many_energy_levels():
+    _, _, template = make_template()
+    for dense in (True, False):
+        with pytest.raises(ValueError):
+            sweep_eigenpairs(template, [{'diagonal': 1.0}], k=7, dense=dense)
+    assert sweep_eigenpairs(template, [{'diagonal': 1.0}], k=6, dense=True).shape == (1, 6)